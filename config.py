@@ -1,6 +1,7 @@
 """Configuration management for Asymptote API."""
 
 from pathlib import Path
+from typing import ClassVar, Set
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,6 +13,22 @@ class Settings(BaseSettings):
 
     # Embedding configuration
     embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_backend: str = "torch"  # "torch" or "onnx" (needs optimum[onnxruntime])
+    embedding_quantize: bool = False  # int8-quantize the ONNX model
+    embedding_onnx_optimization: str = "O2"  # ONNX graph fusions: "none", "O1"-"O3" ("O4" fp16, GPU only)
+    embedding_dtype: str = "fp32"  # "fp32", "fp16" (CUDA only) or "bf16" (torch backend)
+    embed_batch_size: int = 64  # Chunks per embedding forward pass
+
+    # GPU acceleration (embeddings on CUDA, flat/IVF indexes on faiss-gpu when installed)
+    use_gpu: bool = True
+
+    # PyTorch threading (applies to all embedding calls)
+    torch_threads: int = 0  # Intra-op threads, 0 = one per CPU core
+    torch_interop_threads: int = 2
+
+    # Upload text extraction (0 = worker threads, >0 = that many worker processes)
+    extract_processes: int = 0
+    max_upload_bytes: int = 512 * 1024 * 1024  # Largest accepted file per upload, 0 = no limit
 
     # Text chunking configuration
     chunk_size: int = 600
@@ -20,17 +37,41 @@ class Settings(BaseSettings):
     # Search configuration
     default_top_k: int = 10
     max_top_k: int = 50
+    query_batch_size: int = 32  # Concurrent queries embedded in one forward pass
+    query_batch_wait_ms: float = 2.0  # Time a query waits for others to batch with
+    query_embedding_cache_size: int = 1024  # Recent query embeddings reused per model, 0 disables
+
+    # Vector index (exact flat search for small collections, ANN above the threshold)
+    hnsw_min_vectors: int = 5000  # Chunks before switching to an ANN index, 0 keeps flat search
+    index_type: str = "auto"  # "hnsw", "ivf" or "auto" (HNSW, then IVF past ivf_min_vectors)
+    ivf_min_vectors: int = 1_000_000  # Chunks before "auto" switches from HNSW to IVF
+    ivf_nprobe: int = 16  # IVF lists scanned per query (higher = better recall)
+    hnsw_m: int = 32  # Graph neighbors per node
+    hnsw_ef_construction: int = 200  # Build-time search depth (higher = better graph)
+    hnsw_ef_search: int = 64  # Query-time search depth (higher = better recall)
+    index_quantization: str = "none"  # "none", "sq8" or "pq" (compresses large indexes only)
+    rescore_oversample: int = 4  # Candidates per result rescored in FP32 for sq8/pq, 1 disables
+
+    # Semantic query cache (reuse results for near-duplicate queries)
+    semantic_cache_size: int = 1024  # Cached queries per collection, 0 disables
+    semantic_cache_threshold: float = 0.95  # Minimum cosine similarity for a hit
 
     # Metadata storage
     metadata_storage: str = "json"  # "json" or "sqlite"
+    flush_interval_s: float = 1.0  # Delay before persisting index changes (coalesces bursts)
+    flush_max_pending: int = 50  # Unsaved uploads/deletes that force an immediate save, 0 = no limit
 
     # Server configuration
     host: str = "0.0.0.0"
     port: int = 8000
+    document_accel_redirect: str = ""  # nginx internal location aliased to data_dir, "" = serve files directly
 
     # Multi-user mode (simple browser-based user isolation)
     enable_multi_user: bool = False  # Set to True for per-user data isolation
 
+    # Data directories already created in this process
+    _initialized_dirs: ClassVar[Set[Path]] = set()
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -39,10 +80,14 @@ class Settings(BaseSettings):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        # Ensure data directories exist
+        # Ensure data directories exist (once per data_dir per process)
+        if self.data_dir in Settings._initialized_dirs:
+            return
         self.data_dir.mkdir(parents=True, exist_ok=True)
         (self.data_dir / "documents").mkdir(exist_ok=True)
         (self.data_dir / "indexes").mkdir(exist_ok=True)
+        (self.data_dir / "uploads").mkdir(exist_ok=True)  # Staging area for uploads
+        Settings._initialized_dirs.add(self.data_dir)
 
 
 # Global settings instance
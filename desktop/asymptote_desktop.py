@@ -6,6 +6,7 @@ Can run in system tray mode.
 
 import sys
 import os
+import importlib.util
 import webbrowser
 import threading
 import time
@@ -35,6 +36,22 @@ except ImportError:
     print("Note: Install pystray for system tray support: pip install pystray pillow")
 
 
+# Seconds to wait for the server to accept connections before giving up
+SERVER_START_TIMEOUT = 30
+
+
+def server_implementations():
+    """
+    Pick the fastest available event loop and HTTP parser for uvicorn.
+
+    uvloop (libuv event loop) and httptools (C HTTP parser) ship with
+    uvicorn[standard] except on Windows, where uvloop is unavailable.
+    """
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return loop, http
+
+
 def find_free_port(start_port=8000, max_tries=10):
     """Find a free port starting from start_port."""
     for port in range(start_port, start_port + max_tries):
@@ -49,18 +66,27 @@ def find_free_port(start_port=8000, max_tries=10):
 
 def create_tray_icon():
     """Load the tray icon from file, or create a simple fallback."""
-    # Try to load icon.ico from the application directory
+    # Locate the desktop assets directory
     if getattr(sys, 'frozen', False):
         # Running as compiled executable
-        icon_path = Path(sys._MEIPASS) / 'desktop' / 'icon.ico'
-        if not icon_path.exists():
-            icon_path = Path(sys._MEIPASS) / 'icon.ico'
+        asset_dirs = [Path(sys._MEIPASS) / 'desktop', Path(sys._MEIPASS)]
     else:
         # Running as script
-        icon_path = Path(__file__).parent / 'icon.ico'
+        asset_dirs = [Path(__file__).parent]
+
+    # Prefer the pre-rendered RGB tray icon (see utils/create_tray_png.py)
+    for asset_dir in asset_dirs:
+        png_path = asset_dir / 'icon_tray_64.png'
+        if png_path.exists():
+            try:
+                return Image.open(png_path).copy()
+            except Exception as e:
+                print(f"Warning: Could not load icon from {png_path}: {e}")
+
+    icon_path = next((d / 'icon.ico' for d in asset_dirs if (d / 'icon.ico').exists()), None)
 
     try:
-        if icon_path.exists():
+        if icon_path is not None:
             # Load the actual icon file
             image = Image.open(icon_path)
             # Convert to RGB if needed (ICO might be RGBA)
@@ -106,11 +132,14 @@ class AsymptoteApp:
             # Running as compiled executable - change to app directory
             os.chdir(sys._MEIPASS)
 
+        loop, http = server_implementations()
         config = uvicorn.Config(
             "main:app",
             host="127.0.0.1",  # Only listen on localhost for desktop app
             port=self.port,
-            log_level="info",
+            loop=loop,
+            http=http,
+            log_level="warning",  # Server startup/shutdown chatter isn't useful on desktop
             access_log=False,
         )
         self.server = uvicorn.Server(config)
@@ -119,19 +148,19 @@ class AsymptoteApp:
 
     def open_browser(self):
         """Open the application in the default browser."""
-        # Wait for server to start
-        max_retries = 30
-        for i in range(max_retries):
+        # Wait for server to start. uvicorn only binds its socket after the
+        # app's startup hook finishes, so an accepted TCP connection means
+        # the API is ready to serve requests.
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while True:
             try:
-                import requests
-                response = requests.get(f"{self.base_url}/health", timeout=1)
-                if response.status_code == 200:
-                    break
-            except:
-                time.sleep(0.5)
-        else:
-            print("Warning: Server did not start in time")
-            return
+                socket.create_connection(("127.0.0.1", self.port), timeout=0.1).close()
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    print("Warning: Server did not start in time")
+                    return
+                time.sleep(0.05)
 
         print(f"Opening Asymptote at {self.base_url}")
         webbrowser.open(self.base_url)
@@ -142,10 +171,7 @@ class AsymptoteApp:
         self.server_thread = threading.Thread(target=self.start_server, daemon=True)
         self.server_thread.start()
 
-        # Wait a moment for server to initialize
-        time.sleep(1)
-
-        # Open browser
+        # Open browser once the server accepts connections
         self.open_browser()
 
         if use_tray and HAS_TRAY:
@@ -25,6 +25,7 @@ a = Analysis(
         (os.path.join(project_root, '.env.example'), '.'),
         # Include desktop icon for tray
         (os.path.join(spec_root, 'icon.ico'), 'desktop'),
+        (os.path.join(spec_root, 'icon_tray_64.png'), 'desktop'),
         # Include all Python source directories
         (os.path.join(project_root, 'services'), 'services'),
         (os.path.join(project_root, 'models'), 'models'),
@@ -49,9 +50,15 @@ a = Analysis(
         'uvicorn.logging',
         'uvicorn.loops',
         'uvicorn.loops.auto',
+        'uvicorn.loops.asyncio',
+        'uvicorn.loops.uvloop',
         'uvicorn.protocols',
         'uvicorn.protocols.http',
         'uvicorn.protocols.http.auto',
+        'uvicorn.protocols.http.h11_impl',
+        'uvicorn.protocols.http.httptools_impl',
+        'uvloop',  # Not available on Windows; PyInstaller skips it there
+        'httptools',
         'uvicorn.protocols.websockets',
         'uvicorn.protocols.websockets.auto',
         'uvicorn.lifespan',
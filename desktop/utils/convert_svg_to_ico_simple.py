@@ -4,6 +4,8 @@ Simple SVG to ICO converter using svglib and reportlab.
 This approach doesn't require system Cairo libraries.
 """
 
+import copy
+from io import BytesIO
 from pathlib import Path
 from PIL import Image
 from svglib.svglib import svg2rlg
@@ -20,7 +22,7 @@ def svg_to_ico(svg_path: Path, ico_path: Path, sizes=[16, 32, 48, 64, 128, 256])
     """
     print(f"Converting {svg_path.name} to {ico_path.name}...")
 
-    # Load SVG
+    # Load SVG once; each size renders from a copy
     drawing = svg2rlg(svg_path)
 
     if drawing is None:
@@ -31,18 +33,12 @@ def svg_to_ico(svg_path: Path, ico_path: Path, sizes=[16, 32, 48, 64, 128, 256])
     for size in sizes:
         print(f"  Generating {size}x{size} image...")
 
-        # Render SVG to PNG bytes
-        png_data = renderPM.drawToString(drawing, fmt='PNG', dpi=72, bg=0xFFFFFF)
-
-        # Open with PIL and resize
-        img = Image.open(Path(__file__).parent / 'temp.png') if Path('temp.png').exists() else None
-
-        # Better approach: render at target size
+        # Render at target size from a copy of the parsed drawing
         scale_x = size / drawing.width
         scale_y = size / drawing.height
         scale = min(scale_x, scale_y)
 
-        drawing_copy = svg2rlg(svg_path)
+        drawing_copy = copy.deepcopy(drawing)
         drawing_copy.width = size
         drawing_copy.height = size
         drawing_copy.scale(scale, scale)
@@ -51,7 +47,6 @@ def svg_to_ico(svg_path: Path, ico_path: Path, sizes=[16, 32, 48, 64, 128, 256])
         png_bytes = renderPM.drawToString(drawing_copy, fmt='PNG')
 
         # Convert to PIL Image
-        from io import BytesIO
         img = Image.open(BytesIO(png_bytes))
 
         # Ensure RGBA mode
@@ -0,0 +1,28 @@
+"""
+Pre-render the system tray icon from icon.ico.
+
+The tray needs an RGB image; compositing the RGBA icon onto a white
+background at build time keeps that work out of every app launch.
+"""
+
+from pathlib import Path
+from PIL import Image
+
+TRAY_ICON_SIZE = 64
+
+
+def create_tray_png(ico_path: Path, png_path: Path, size: int = TRAY_ICON_SIZE):
+    """Composite icon.ico onto white and save it as an RGB PNG."""
+    print(f"Creating {png_path.name} from {ico_path.name}...")
+
+    image = Image.open(ico_path).convert('RGBA')
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.split()[3])  # Use alpha channel as mask
+
+    background.resize((size, size), Image.LANCZOS).save(png_path, optimize=True)
+    print(f"✓ Successfully created {png_path}")
+
+
+if __name__ == "__main__":
+    desktop_dir = Path(__file__).parent.parent
+    create_tray_png(desktop_dir / 'icon.ico', desktop_dir / 'icon_tray_64.png')
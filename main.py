@@ -5,36 +5,49 @@ Main application entry point.
 Supports PDF, TXT, DOCX, and CSV files.
 """
 
+import asyncio
+import hashlib
 import logging
-import json
+import multiprocessing
+import os
+import threading
+import uuid
+from time import perf_counter_ns
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from typing import List
+from datetime import datetime
+from typing import Dict, List, Optional
 from pathlib import Path
-import shutil
+from urllib.parse import quote
 
-from fastapi import FastAPI, Depends, Header, HTTPException, UploadFile, File, status, Request
+import aiofiles
+import orjson
+from fastapi import BackgroundTasks, FastAPI, Depends, Header, HTTPException, UploadFile, File, status, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from pydantic import TypeAdapter
 
 from config import settings
-from services.document_extractor import DocumentExtractor
+from services.document_extractor import DocumentExtractor, extract_document
 from services.chunker import TextChunker
-from services.embedder import EmbeddingService
-from services.vector_store import VectorStore
-from services.vector_store_v2 import VectorStoreV2
 from services.indexing import DocumentIndexer
-from services.ai_service import AIService, create_provider, detect_ollama
+from services.app_database import app_db
+from services.ai_service import AIService, get_provider, detect_ollama
 from services.config_manager import config_manager
 from services.reindex_service import reindex_service
 from services.collection_service import collection_service
 from services.indexer_manager import indexer_manager
+from services.query_batcher import get_query_batcher, close_query_batchers
+from services import index_factory
 from models.schemas import (
     UploadResponse,
     SearchRequest,
     SearchResponse,
+    SearchResult,
     DocumentListResponse,
     DocumentMetadata,
+    result_url_context,
 )
 
 # Configure logging
@@ -48,6 +61,70 @@ logger = logging.getLogger(__name__)
 # Global services flag
 _initialized = False
 
+# Buffer size used when streaming uploads to disk (1 MiB)
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Prepared documents that may wait for the embedding stage during an upload
+UPLOAD_PIPELINE_DEPTH = 2
+
+# Upload extensions, as a tuple for a single str.endswith() check per file
+SUPPORTED_SUFFIXES = tuple(sorted(DocumentExtractor.SUPPORTED_EXTENSIONS))
+
+# PDF header signature; readers accept it anywhere in the first 1 KiB
+PDF_MAGIC = b"%PDF-"
+PDF_MAGIC_WINDOW = 1024
+
+# Content types for document downloads (anything else is sent as octet-stream)
+DOCUMENT_MEDIA_TYPES = {
+    '.pdf': 'application/pdf',
+    '.txt': 'text/plain',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.csv': 'text/csv',
+}
+
+# Documents encoded per chunk of the NDJSON document stream
+DOCUMENT_STREAM_BATCH = 500
+
+# Browser caching for downloaded documents (revalidated with the ETag after an hour)
+DOCUMENT_CACHE_CONTROL = "private, max-age=3600"
+
+# Worker threads for CPU-bound indexing (extraction, chunking, embedding).
+# Threads rather than processes: workers share the loaded embedding model
+# and write into the collection's in-memory FAISS index.
+index_executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="indexer")
+
+# Optional worker processes for text extraction, which is pure Python and
+# holds the GIL. Spawned (not forked) so workers don't inherit the loaded
+# model or torch's thread pools.
+extract_executor = (
+    ProcessPoolExecutor(
+        max_workers=settings.extract_processes,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    if settings.extract_processes > 0
+    else None
+)
+
+
+# Cached /documents responses per collection. The catalog only changes on
+# upload, delete and reindex, so polling clients are served from memory.
+_doc_list_cache: Dict[str, DocumentListResponse] = {}
+_doc_list_lock = asyncio.Lock()
+
+# Cached /health collection stats, dropped together with the document list
+_collection_stats_cache: Dict[str, dict] = {}
+
+# Bumped on every invalidation. Listings are built on a worker thread, so one
+# that raced an upload or delete is returned but not cached.
+_doc_list_generation: Dict[str, int] = {}
+
+
+def invalidate_document_list(collection_id: str = "default"):
+    """Drop the cached document list and stats for a collection after it changes."""
+    _doc_list_generation[collection_id] = _doc_list_generation.get(collection_id, 0) + 1
+    _doc_list_cache.pop(collection_id, None)
+    _collection_stats_cache.pop(collection_id, None)
+
 
 def get_indexer(collection_id: str = "default") -> DocumentIndexer:
     """Get indexer for a collection."""
@@ -59,6 +136,111 @@ def get_indexer(collection_id: str = "default") -> DocumentIndexer:
     return indexer_manager.get_indexer(collection_id)
 
 
+def indexer_dep(collection_id: str = "default") -> DocumentIndexer:
+    """
+    Resolve the indexer for the request's collection_id query parameter.
+
+    Used as a FastAPI dependency so unknown collections are answered with a
+    404 before the handler runs.
+    """
+    try:
+        return get_indexer(collection_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+
+
+def _copy_and_hash(src, file_path: Path) -> str:
+    """
+    Copy a file object to file_path in one buffered pass, hashing as it goes.
+
+    Returns:
+        SHA-256 hex digest of the copied content
+    """
+    hasher = hashlib.sha256()
+    src.seek(0)
+    with open(file_path, "wb") as dst:
+        while chunk := src.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+            dst.write(chunk)
+    return hasher.hexdigest()
+
+
+def _reserve_document_path(document_dir: Path, filename: str, document_id: str) -> Path:
+    """
+    Claim a path in the collection's document directory for a new upload.
+
+    The original filename is used when it is free. If another document
+    already owns it, the document ID is appended to the stem instead, so
+    different content uploaded under the same name never overwrites an
+    indexed file. The claim is an atomic O_EXCL create, so concurrent
+    uploads can't pick the same name either.
+
+    Returns:
+        Path of the empty placeholder file that now holds the name
+    """
+    file_path = document_dir / filename
+    try:
+        os.close(os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+        return file_path
+    except FileExistsError:
+        pass
+    file_path = document_dir / f"{file_path.stem}-{document_id[:8]}{file_path.suffix}"
+    os.close(os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644))
+    return file_path
+
+
+async def _has_pdf_header(file: UploadFile) -> bool:
+    """Peek at the start of an upload for the PDF signature, then rewind."""
+    head = await file.read(PDF_MAGIC_WINDOW)
+    await file.seek(0)
+    return PDF_MAGIC in head
+
+
+async def save_upload(file: UploadFile, file_path: Path) -> str:
+    """
+    Stream an uploaded file to disk without blocking the event loop.
+
+    Args:
+        file: Uploaded file
+        file_path: Destination path
+
+    Returns:
+        SHA-256 hex digest of the file content
+    """
+    # Uploads larger than the multipart spool threshold (1 MiB) already sit
+    # in a real temp file; copy those on one worker thread instead of a
+    # thread hop per chunk. The content is read once, for hashing and writing.
+    if getattr(file.file, "_rolled", False):
+        return await asyncio.to_thread(_copy_and_hash, file.file, file_path)
+
+    hasher = hashlib.sha256()
+    async with aiofiles.open(file_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+            await f.write(chunk)
+    return hasher.hexdigest()
+
+
+def warm_embedding_model(model_name: str):
+    """Load an embedding model and run a throwaway batch through it."""
+    indexer_manager.get_embedding_service(model_name).warmup()
+
+
+def warm_collection(collection_id: str) -> int:
+    """
+    Load a collection's indexer and fault in its index.
+
+    Returns:
+        Number of indexed chunks in the collection
+    """
+    indexer = indexer_manager.get_indexer(collection_id)
+    indexer.warmup(warm_model=False)
+    return indexer.vector_store.get_total_chunks()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager - initialize and cleanup services."""
@@ -66,44 +248,79 @@ async def lifespan(app: FastAPI):
 
     logger.info("Initializing Asymptote API...")
 
-    # Initialize default collection's indexer to pre-load embedding model
-    logger.info("Loading default collection indexer...")
+    index_factory.log_simd_support()
+
+    # Load and warm every collection so no first request pays the cold start.
+    # Each embedding model is loaded once (collections share them), then the
+    # collections' indexes are loaded in parallel.
+    logger.info("Loading collection indexers...")
     try:
-        default_indexer = indexer_manager.get_indexer("default")
-        total_chunks = default_indexer.vector_store.get_total_chunks()
-        logger.info(f"Default collection indexed chunks: {total_chunks}")
+        collections = collection_service.get_all_collections()
     except Exception as e:
-        logger.warning(f"Could not load default indexer: {e}")
+        logger.warning("Could not list collections: %s", e)
+        collections = []
+
+    models = {c.get("embedding_model") or settings.embedding_model for c in collections}
+    model_results = await asyncio.gather(
+        *(asyncio.to_thread(warm_embedding_model, model) for model in models),
+        return_exceptions=True,
+    )
+    for model, result in zip(models, model_results):
+        if isinstance(result, Exception):
+            logger.warning("Could not load embedding model %s: %s", model, result)
+
+    collection_results = await asyncio.gather(
+        *(asyncio.to_thread(warm_collection, c["id"]) for c in collections),
+        return_exceptions=True,
+    )
+    total_chunks = 0
+    warmed = 0
+    for collection, result in zip(collections, collection_results):
+        if isinstance(result, Exception):
+            logger.warning("Could not load indexer for collection %s: %s", collection["id"], result)
+        else:
+            total_chunks += result
+            warmed += 1
+    logger.info(
+        "Warmed %d collection(s) using %d model(s), %d indexed chunks",
+        warmed, len(models), total_chunks,
+    )
 
     # Set up reload callback for re-indexing service (collection-aware)
     def reload_indexer(collection_id: str = "default"):
         """Reload an indexer's vector store from disk after re-indexing."""
         try:
             logger.info("=" * 60)
-            logger.info(f"RELOAD CALLBACK TRIGGERED for collection: {collection_id}")
+            logger.info("RELOAD CALLBACK TRIGGERED for collection: %s", collection_id)
             logger.info("=" * 60)
 
             indexer_manager.reload_indexer(collection_id)
+            invalidate_document_list(collection_id)
 
             stats = indexer_manager.get_collection_stats(collection_id)
-            logger.info(f"Reload complete. Collection {collection_id} indexed chunks: {stats['total_chunks']}")
+            logger.info("Reload complete. Collection %s indexed chunks: %s", collection_id, stats['total_chunks'])
             logger.info("=" * 60)
 
         except Exception as e:
-            logger.error(f"RELOAD FAILED for collection {collection_id}: {e}", exc_info=True)
+            logger.error("RELOAD FAILED for collection %s: %s", collection_id, e, exc_info=True)
 
     reindex_service.reload_callback = reload_indexer
 
     _initialized = True
 
     logger.info("Asymptote API ready")
-    logger.info(f"Data directory: {settings.data_dir}")
-    logger.info(f"Metadata storage: {settings.metadata_storage}")
+    logger.info("Data directory: %s", settings.data_dir)
+    logger.info("Metadata storage: %s", settings.metadata_storage)
 
     yield
 
     # Cleanup on shutdown
     logger.info("Shutting down Asymptote API...")
+    await close_query_batchers()
+    index_executor.shutdown(wait=True)
+    if extract_executor is not None:
+        extract_executor.shutdown(wait=True)
+    # Force-save every index, including changes still waiting for a flush
     indexer_manager.save_all()
     logger.info("Shutdown complete")
 
@@ -114,6 +331,7 @@ app = FastAPI(
     description="Self-hosted semantic search for documents (PDF, TXT, DOCX, CSV)",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -129,20 +347,22 @@ app.add_middleware(
 static_dir = Path(__file__).parent / "static"
 static_dir.mkdir(exist_ok=True)
 
+# The built web interface only changes on a frontend rebuild, so read it once
+try:
+    index_html = (static_dir / "index.html").read_bytes()
+except FileNotFoundError:
+    index_html = (
+        b"<h1>Asymptote API</h1><p>Web interface not found. "
+        b"Visit <a href='/docs'>/docs</a> for API documentation.</p>"
+    )
+
 
 # Web Interface
 
 @app.get("/", response_class=HTMLResponse, tags=["ui"])
 async def web_interface():
     """Serve the web interface."""
-    index_path = static_dir / "index.html"
-    if index_path.exists():
-        return HTMLResponse(content=index_path.read_text(encoding="utf-8"), status_code=200)
-    else:
-        return HTMLResponse(
-            content="<h1>Asymptote API</h1><p>Web interface not found. Visit <a href='/docs'>/docs</a> for API documentation.</p>",
-            status_code=200
-        )
+    return HTMLResponse(content=index_html, status_code=200)
 
 
 # API Endpoints
@@ -161,7 +381,19 @@ async def api_root():
 async def health(collection_id: str = "default"):
     """Health check endpoint."""
     try:
-        stats = indexer_manager.get_collection_stats(collection_id)
+        stats = _collection_stats_cache.get(collection_id)
+        if stats is None:
+            generation = _doc_list_generation.get(collection_id, 0)
+            # Listing takes the indexer lock; keep it off the event loop
+            stats = await asyncio.to_thread(
+                indexer_manager.get_collection_stats, collection_id
+            )
+            # Unknown collections report zeros; only cache real contents
+            if (
+                (stats["total_chunks"] or stats["total_documents"])
+                and _doc_list_generation.get(collection_id, 0) == generation
+            ):
+                _collection_stats_cache[collection_id] = stats
         return {
             "status": "healthy",
             "collection_id": collection_id,
@@ -187,6 +419,7 @@ async def health(collection_id: str = "default"):
 async def upload_documents(
     files: List[UploadFile] = File(...),
     collection_id: str = "default",
+    indexer: DocumentIndexer = Depends(indexer_dep),
 ) -> UploadResponse:
     """
     Upload one or more documents and automatically index their contents.
@@ -205,72 +438,206 @@ async def upload_documents(
             detail="No files provided",
         )
 
-    # Get indexer for the collection
-    try:
-        indexer = get_indexer(collection_id)
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e),
-        )
-
     # Get document directory for this collection
     document_dir = indexer_manager.get_documents_path(collection_id)
 
-    # Validate all files have supported extensions
-    SUPPORTED_EXTENSIONS = {'.pdf', '.txt', '.docx', '.csv', '.md', '.json'}
+    # Validate all files (type, size, duplicates, PDF signature) before any disk I/O.
+    # Unsupported types are reported together so they can be fixed in one go.
+    unsupported = [file.filename for file in files if not file.filename.lower().endswith(SUPPORTED_SUFFIXES)]
+    if unsupported:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported file type: {', '.join(unsupported)}. Supported types: PDF, TXT, DOCX, CSV, MD, JSON",
+        )
+
+    seen_filenames = set()
     for file in files:
-        file_ext = Path(file.filename).suffix.lower()
-        if file_ext not in SUPPORTED_EXTENSIONS:
+        filename_lower = file.filename.lower()
+        # The multipart parser has already spooled the body, so its size is known
+        if settings.max_upload_bytes and (file.size or 0) > settings.max_upload_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File {file.filename} exceeds the {settings.max_upload_bytes} byte upload limit",
+            )
+        # Files are saved concurrently, so two uploads must not share a path
+        safe_filename = Path(file.filename).name
+        if safe_filename in seen_filenames:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File {file.filename} has unsupported type. Supported types: PDF, TXT, DOCX, CSV, MD, JSON",
+                detail=f"File {file.filename} was provided more than once",
+            )
+        seen_filenames.add(safe_filename)
+        # Check the content signature before anything is written to disk
+        if filename_lower.endswith('.pdf') and not await _has_pdf_header(file):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File {file.filename} is not a valid PDF",
             )
 
-    indexed_docs = []
-    failed_docs = []
-    total_pages = 0
-    total_chunks = 0
+    loop = asyncio.get_running_loop()
+
+    # First file in this request with each content digest. Later copies are
+    # not processed and share the first copy's outcome once it is known.
+    first_copies: Dict[str, str] = {}
+    request_duplicates = set()
+
+    async def prepare_file(file: UploadFile):
+        """
+        Save a single uploaded file and extract its chunks.
+
+        Returns the document ID (and keeps nothing on disk) if identical
+        content is already indexed in the collection or appears earlier in
+        this request.
+        """
+        # Use only the basename to avoid directory traversal issues
+        safe_filename = Path(file.filename).name
+        file_path = None
+        # Stage the upload outside the collection until we know it is new, so a
+        # duplicate never overwrites or leaves behind a file
+        staging_path = settings.data_dir / "uploads" / f"{uuid.uuid4().hex}{Path(safe_filename).suffix}"
+        try:
+            digest = await save_upload(file, staging_path)
+
+            # Document IDs are derived from the content hash
+            document_id = digest[:16]
+            if document_id in first_copies:
+                logger.info("Skipping %s: same content as %s in this upload", safe_filename, first_copies[document_id])
+                request_duplicates.add(file.filename)
+                return document_id
+            first_copies[document_id] = file.filename
+            # The lookup may hit SQLite, so keep it off the event loop
+            if await asyncio.to_thread(indexer.has_document, document_id):
+                logger.info("Skipping %s: identical content already indexed as %s", safe_filename, document_id)
+                return document_id
+
+            # The stored name is recorded in the chunk metadata, so settle it first
+            file_path = _reserve_document_path(document_dir, safe_filename, document_id)
+            if file_path.name != safe_filename:
+                logger.info("%s already exists in collection %s, storing as %s", safe_filename, collection_id, file_path.name)
+                safe_filename = file_path.name
+
+            if extract_executor is not None:
+                # Extract in a worker process from the staged copy, then chunk
+                page_texts = await loop.run_in_executor(
+                    extract_executor, extract_document, staging_path, safe_filename
+                )
+                prepared_doc = await loop.run_in_executor(
+                    index_executor, indexer.prepare_pages, page_texts, safe_filename, document_id
+                )
+            else:
+                # Extract and chunk on a worker thread, reading the upload body itself
+                # (still in memory for small files) rather than the copy just written
+                file.file.seek(0)
+                prepared_doc = await loop.run_in_executor(
+                    index_executor, indexer.prepare_document_stream, file.file, safe_filename, document_id
+                )
+
+            os.replace(staging_path, file_path)
+            logger.info("Saved uploaded file: %s to collection %s", safe_filename, collection_id)
+            return prepared_doc
 
-    for file in files:
+        except Exception as e:
+            logger.error("Failed to index %s: %s", file.filename, e)
+            if file_path is not None:
+                # Release the reserved name
+                file_path.unlink(missing_ok=True)
+            raise
+        finally:
+            staging_path.unlink(missing_ok=True)
+
+    def cleanup_upload(file_path: Path):
+        """Remove a saved file whose indexing failed."""
         try:
-            # Save uploaded file to collection's document directory
-            # Use only the basename to avoid directory traversal issues
-            safe_filename = Path(file.filename).name
-            file_path = document_dir / safe_filename
-            with open(file_path, "wb") as f:
-                shutil.copyfileobj(file.file, f)
+            file_path.unlink(missing_ok=True)
+        except Exception:
+            pass
 
-            logger.info(f"Saved uploaded file: {safe_filename} to collection {collection_id}")
+    failed_docs = []
+    indexed_metadata = []
+
+    # Prepared documents flow from extraction to embedding through a bounded
+    # queue, so embedding starts while later files are still being extracted
+    # and at most a few documents' chunks wait in memory
+    prepared_queue: asyncio.Queue = asyncio.Queue(maxsize=UPLOAD_PIPELINE_DEPTH)
+
+    async def extract_file(file: UploadFile):
+        """Prepare a file and hand it to the embedding stage."""
+        result = await prepare_file(file)
+        if isinstance(result, tuple):
+            await prepared_queue.put(result)
+        return result
+
+    async def extract_all():
+        """Extract all files concurrently; failures are reported per file."""
+        try:
+            return await asyncio.gather(
+                *(extract_file(file) for file in files),
+                return_exceptions=True,
+            )
+        finally:
+            await prepared_queue.put(None)
+
+    async def embed_prepared():
+        """Embed whatever has been prepared so far in one batched pass, until done."""
+        done = False
+        while not done:
+            batch = [await prepared_queue.get()]
+            while not prepared_queue.empty():
+                batch.append(prepared_queue.get_nowait())
+            if None in batch:
+                done = True
+                batch = [item for item in batch if item is not None]
+            if not batch:
+                continue
 
-            # Index the document
-            doc_metadata = indexer.index_document(file_path, safe_filename)
+            try:
+                indexed_metadata.extend(await loop.run_in_executor(
+                    index_executor, indexer.add_prepared_documents, batch
+                ))
+            except Exception as e:
+                logger.error("Failed to embed uploaded documents: %s", e)
+                for metadata, _ in batch:
+                    cleanup_upload(document_dir / metadata.filename)
+                    failed_docs.append({"filename": metadata.filename, "error": str(e)})
 
-            # Register document with collection
-            collection_service.add_document(collection_id, doc_metadata.document_id)
+    results, _ = await asyncio.gather(extract_all(), embed_prepared())
 
-            indexed_docs.append(doc_metadata.document_id)
-            total_pages += doc_metadata.total_pages
-            total_chunks += doc_metadata.total_chunks
+    indexed_docs = [doc_metadata.document_id for doc_metadata in indexed_metadata]
 
-        except Exception as e:
-            logger.error(f"Failed to index {file.filename}: {e}")
-            failed_docs.append({"filename": file.filename, "error": str(e)})
-            # Clean up the saved file if indexing failed
-            try:
-                cleanup_path = document_dir / Path(file.filename).name
-                if cleanup_path.exists():
-                    cleanup_path.unlink()
-            except Exception:
-                pass
-            # Continue processing remaining files
+    # Copies repeated within the request succeed only if the first copy was
+    # indexed now or earlier
+    already_indexed = {
+        result for file, result in zip(files, results)
+        if isinstance(result, str) and file.filename not in request_duplicates
+    }
+    available = already_indexed.union(indexed_docs)
+
+    duplicate_docs = []
+    for file, result in zip(files, results):
+        if isinstance(result, Exception):
+            failed_docs.append({"filename": file.filename, "error": str(result)})
+        elif isinstance(result, str):
+            if result in available:
+                duplicate_docs.append(result)
+            else:
+                failed_docs.append({
+                    "filename": file.filename,
+                    "error": f"same content as {first_copies[result]}, which failed to index",
+                })
+    total_pages = sum(doc_metadata.total_pages for doc_metadata in indexed_metadata)
+    total_chunks = sum(doc_metadata.total_chunks for doc_metadata in indexed_metadata)
+
+    # Register documents with the collection (one SQLite transaction) off the event loop
+    if indexed_docs:
+        await asyncio.to_thread(collection_service.add_documents, collection_id, indexed_docs)
 
-    # Persist the index if any documents were successfully indexed
+    # Schedule the index to be persisted if any documents were indexed
     if indexed_docs:
-        indexer.save_index()
+        invalidate_document_list(collection_id)
+        indexer.mark_dirty()
 
     # Build response message
-    if failed_docs and not indexed_docs:
+    if failed_docs and not indexed_docs and not duplicate_docs:
         # All files failed
         error_details = "; ".join([f"{f['filename']}: {f['error']}" for f in failed_docs])
         raise HTTPException(
@@ -286,15 +653,47 @@ async def upload_documents(
         # Full success
         message = f"Successfully indexed {len(indexed_docs)} document(s) to collection '{collection_id}'"
 
+    if duplicate_docs:
+        message += f". Skipped {len(duplicate_docs)} already indexed"
+
     return UploadResponse(
         message=message,
         documents_processed=len(indexed_docs),
         total_pages=total_pages,
         total_chunks=total_chunks,
-        document_ids=indexed_docs,
+        # Each ID once, even if several files had the same content
+        document_ids=list(dict.fromkeys(indexed_docs + duplicate_docs)),
     )
 
 
+# Serializes a result list to JSON in one pass inside pydantic-core
+search_results_adapter = TypeAdapter(List[SearchResult])
+
+
+def record_search_history(
+    query: str,
+    top_k: int,
+    results: List[SearchResult],
+    ai_provider: Optional[str],
+    ai_used: bool,
+    execution_time_ms: int,
+):
+    """Save a search and its results to the history (runs after the response is sent)."""
+    try:
+        results_json = search_results_adapter.dump_json(results).decode()
+        app_db.add_search_history(
+            query=query,
+            top_k=top_k,
+            results_count=len(results),
+            ai_provider=ai_provider,
+            ai_used=ai_used,
+            results_json=results_json,
+            execution_time_ms=execution_time_ms
+        )
+    except Exception as e:
+        logger.warning("Failed to save search history: %s", e)
+
+
 @app.post(
     "/search",
     response_model=SearchResponse,
@@ -304,7 +703,9 @@ async def upload_documents(
 async def search_documents(
     search_request: SearchRequest,
     request: Request,
+    background_tasks: BackgroundTasks,
     collection_id: str = "default",
+    indexer: DocumentIndexer = Depends(indexer_dep),
     x_ai_key: str = Header(None),
     x_ollama_model: str = Header(None),
 ) -> SearchResponse:
@@ -328,17 +729,7 @@ async def search_documents(
     - No API key required
     """
     try:
-        import time
-        start_time = time.time()
-
-        # Get indexer for the collection
-        try:
-            indexer = get_indexer(collection_id)
-        except ValueError as e:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=str(e),
-            )
+        start_time = perf_counter_ns()
 
         # Build AI service if AI options requested
         ai_service = None
@@ -350,62 +741,61 @@ async def search_documents(
                 if ai_options.provider == "ollama":
                     # Ollama doesn't need API key
                     model = x_ollama_model or "llama3.2"
-                    provider = create_provider("ollama", model=model)
+                    provider = get_provider("ollama", model=model)
                     ai_service = AIService(provider=provider)
                     ai_provider_used = "ollama"
                 else:
                     # Cloud providers need API key
                     if not x_ai_key:
-                        logger.warning(f"AI key required for provider: {ai_options.provider}")
+                        logger.warning("AI key required for provider: %s", ai_options.provider)
                     else:
-                        provider = create_provider(ai_options.provider, x_ai_key)
+                        provider = get_provider(ai_options.provider, x_ai_key)
                         ai_service = AIService(provider=provider)
                         ai_provider_used = ai_options.provider
             except Exception as e:
-                logger.warning(f"Failed to create AI service: {e}")
+                logger.warning("Failed to create AI service: %s", e)
 
-        search_result = indexer.search(
-            query=search_request.query,
-            top_k=search_request.top_k,
-            ai_service=ai_service,
-            ai_options=ai_options,
-        )
+        # Exact repeats of a recent plain search skip embedding entirely
+        search_result = None
+        if ai_service is None:
+            search_result = indexer.get_cached_results(search_request.query, search_request.top_k)
+
+        if search_result is None:
+            # Embed off the event loop, batched with concurrent searches
+            query_embedding = await get_query_batcher(indexer.embedding_service).embed(
+                search_request.query
+            )
+
+            # Vector search and any AI rerank/synthesis calls block, so run them
+            # on a worker thread to keep other requests moving
+            search_result = await asyncio.to_thread(
+                indexer.search,
+                query=search_request.query,
+                top_k=search_request.top_k,
+                ai_service=ai_service,
+                ai_options=ai_options,
+                query_embedding=query_embedding,
+            )
 
         results = search_result["results"]
 
-        # Add URLs to each result (include collection_id for proper routing)
+        # Result URLs are computed during serialization from the request's base URL
+        # (include collection_id for proper routing)
         base_url = str(request.base_url).rstrip('/')
-        for result in results:
-            result.pdf_url = f"{base_url}/documents/{result.document_id}/pdf?collection_id={collection_id}"
-            result.page_url = f"{base_url}/documents/{result.document_id}/pdf?collection_id={collection_id}#page={result.page_number}"
+        result_url_context.set((f"{base_url}/documents/", f"/pdf?collection_id={collection_id}"))
 
-        execution_time_ms = int((time.time() - start_time) * 1000)
+        execution_time_ms = (perf_counter_ns() - start_time) // 1_000_000
 
-        # Save to search history
-        from services.app_database import app_db
-        try:
-            results_json = json.dumps([{
-                "document_id": r.document_id,
-                "filename": r.filename,
-                "page_number": r.page_number,
-                "chunk_index": r.chunk_index,
-                "text": r.text,
-                "similarity": r.similarity,
-                "pdf_url": r.pdf_url,
-                "page_url": r.page_url
-            } for r in results])
-
-            app_db.add_search_history(
-                query=search_request.query,
-                top_k=search_request.top_k,
-                results_count=len(results),
-                ai_provider=ai_provider_used,
-                ai_used=ai_service is not None,
-                results_json=results_json,
-                execution_time_ms=execution_time_ms
-            )
-        except Exception as e:
-            logger.warning(f"Failed to save search history: {e}")
+        # Save to search history once the response is on its way
+        background_tasks.add_task(
+            record_search_history,
+            query=search_request.query,
+            top_k=search_request.top_k,
+            results=results,
+            ai_provider=ai_provider_used,
+            ai_used=ai_service is not None,
+            execution_time_ms=execution_time_ms,
+        )
 
         return SearchResponse(
             query=search_request.query,
@@ -416,7 +806,7 @@ async def search_documents(
         )
 
     except Exception as e:
-        logger.error(f"Search failed: {e}")
+        logger.error("Search failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Search failed: {str(e)}",
@@ -449,18 +839,19 @@ async def validate_api_key(
         if x_ai_provider == "ollama":
             # Ollama doesn't need API key
             model = x_ollama_model or "llama3.2"
-            provider = create_provider("ollama", model=model)
+            provider = get_provider("ollama", model=model)
         else:
             # Cloud providers need API key
             if not x_ai_key:
                 return {"valid": False, "error": "API key is required for cloud providers"}
-            provider = create_provider(x_ai_provider, x_ai_key)
+            provider = get_provider(x_ai_provider, x_ai_key)
 
-        valid = provider.validate()
+        # Validation makes a blocking request to the provider
+        valid = await asyncio.to_thread(provider.validate)
         return {"valid": valid, "error": None}
     except Exception as e:
         error_str = str(e)
-        logger.error(f"API key validation error for {x_ai_provider}: {e}")
+        logger.error("API key validation error for %s: %s", x_ai_provider, e)
 
         # Provide more helpful error messages
         if "quota" in error_str.lower() or "insufficient_quota" in error_str.lower():
@@ -538,7 +929,7 @@ async def get_ollama_status():
         - models: List of available models with names and sizes
         - error: Error message if detection failed
     """
-    return detect_ollama()
+    return await asyncio.to_thread(detect_ollama)
 
 
 @app.post(
@@ -558,8 +949,8 @@ async def validate_ollama_model(model_name: str):
         - error: Error message if not available
     """
     try:
-        provider = create_provider("ollama", model=model_name)
-        valid = provider.validate()
+        provider = get_provider("ollama", model=model_name)
+        valid = await asyncio.to_thread(provider.validate)
         return {"valid": valid, "error": None if valid else f"Model '{model_name}' not found"}
     except Exception as e:
         return {"valid": False, "error": str(e)}
@@ -585,8 +976,8 @@ async def start_reindex():
         # Get current config (from database with .env fallback)
         current_config = config_manager.get_current_config()
 
-        # Get embedding dimensions
-        embedding_service = EmbeddingService(model_name=current_config["embedding_model"])
+        # Get embedding dimensions (reuses the model if it is already loaded)
+        embedding_service = indexer_manager.get_embedding_service(current_config["embedding_model"])
         embedding_dim = embedding_service.embedding_dim
 
         # Start re-indexing
@@ -611,7 +1002,7 @@ async def start_reindex():
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Failed to start re-indexing: {e}")
+        logger.error("Failed to start re-indexing: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to start re-indexing: {str(e)}"
@@ -654,8 +1045,8 @@ async def start_collection_reindex(collection_id: str):
         documents_dir = indexer_manager.get_documents_path(collection_id)
         indexes_dir = indexer_manager.get_indexes_path(collection_id)
 
-        # Get embedding dimensions for the collection's model
-        embedding_service = EmbeddingService(model_name=collection["embedding_model"])
+        # Get embedding dimensions for the collection's model (loaded once, shared)
+        embedding_service = indexer_manager.get_embedding_service(collection["embedding_model"])
         embedding_dim = embedding_service.embedding_dim
 
         # Start re-indexing
@@ -685,7 +1076,7 @@ async def start_collection_reindex(collection_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to start re-indexing for collection {collection_id}: {e}")
+        logger.error("Failed to start re-indexing for collection %s: %s", collection_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to start re-indexing: {str(e)}"
@@ -715,13 +1106,12 @@ async def get_reindex_status(job_id: int = None):
         - completed_at: Job completion timestamp (if finished)
         - error: Error message (if failed)
     """
-    from services.app_database import app_db
 
     if job_id:
-        job = reindex_service.get_job_status(job_id)
+        job = await asyncio.to_thread(reindex_service.get_job_status, job_id)
     else:
         # Get latest job (including completed ones), not just currently active
-        job = app_db.get_latest_reindex_job()
+        job = await asyncio.to_thread(app_db.get_latest_reindex_job)
 
     if not job:
         raise HTTPException(
@@ -729,16 +1119,12 @@ async def get_reindex_status(job_id: int = None):
             detail="No re-indexing job found"
         )
 
-    # Calculate progress percentage
-    if job["total_documents"] > 0:
-        progress = (job["processed_documents"] / job["total_documents"]) * 100
-    else:
-        progress = 0
-
-    return {
-        **job,
-        "progress_percent": round(progress, 1)
-    }
+    # Calculate progress percentage (job is a fresh dict from the database)
+    total = job["total_documents"]
+    job["progress_percent"] = (
+        round(job["processed_documents"] * 100 / total, 1) if total > 0 else 0
+    )
+    return job
 
 
 # AI Preferences endpoints
@@ -749,8 +1135,7 @@ async def get_reindex_status(job_id: int = None):
 )
 async def get_ai_preferences():
     """Get AI provider preferences."""
-    from services.app_database import app_db
-    prefs = app_db.get_ai_preferences()
+    prefs = await asyncio.to_thread(app_db.get_ai_preferences)
     if not prefs:
         # Return defaults
         return {
@@ -777,8 +1162,8 @@ async def set_ai_preferences(preferences: dict):
         synthesize_enabled: Boolean
         default_provider: Provider name
     """
-    from services.app_database import app_db
-    app_db.set_ai_preferences(
+    await asyncio.to_thread(
+        app_db.set_ai_preferences,
         selected_providers=preferences.get("selected_providers"),
         rerank_enabled=preferences.get("rerank_enabled"),
         synthesize_enabled=preferences.get("synthesize_enabled"),
@@ -795,8 +1180,8 @@ async def set_ai_preferences(preferences: dict):
 )
 async def get_search_history(limit: int = 50):
     """Get recent search history."""
-    from services.app_database import app_db
-    return {"history": app_db.get_search_history(limit=limit)}
+    history = await asyncio.to_thread(app_db.get_search_history, limit=limit)
+    return {"history": history}
 
 
 @app.get(
@@ -806,8 +1191,7 @@ async def get_search_history(limit: int = 50):
 )
 async def get_cached_search(search_id: int):
     """Get cached search results by ID."""
-    from services.app_database import app_db
-    search = app_db.get_search_by_id(search_id)
+    search = await asyncio.to_thread(app_db.get_search_by_id, search_id)
     if not search:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -823,8 +1207,7 @@ async def get_cached_search(search_id: int):
 )
 async def clear_old_history(days: int = 30):
     """Delete search history older than specified days."""
-    from services.app_database import app_db
-    deleted = app_db.delete_old_search_history(days=days)
+    deleted = await asyncio.to_thread(app_db.delete_old_search_history, days=days)
     return {"deleted": deleted, "message": f"Deleted {deleted} old searches"}
 
 
@@ -836,8 +1219,7 @@ async def clear_old_history(days: int = 30):
 )
 async def get_preferences():
     """Get all user preferences."""
-    from services.app_database import app_db
-    return app_db.get_all_user_preferences()
+    return await asyncio.to_thread(app_db.get_all_user_preferences)
 
 
 @app.get(
@@ -847,8 +1229,7 @@ async def get_preferences():
 )
 async def get_preference(key: str, default: str = None):
     """Get specific user preference."""
-    from services.app_database import app_db
-    value = app_db.get_user_preference(key, default)
+    value = await asyncio.to_thread(app_db.get_user_preference, key, default)
     return {"key": key, "value": value}
 
 
@@ -865,7 +1246,6 @@ async def set_preference(preference: dict):
         key: Preference key
         value: Preference value
     """
-    from services.app_database import app_db
     key = preference.get("key")
     value = preference.get("value")
 
@@ -875,7 +1255,7 @@ async def set_preference(preference: dict):
             detail="Key is required"
         )
 
-    app_db.set_user_preference(key, value)
+    await asyncio.to_thread(app_db.set_user_preference, key, value)
     return {"success": True, "key": key}
 
 
@@ -1003,6 +1383,7 @@ async def delete_collection(collection_id: str):
     try:
         # Remove cached indexer first (before files are deleted)
         indexer_manager.remove_indexer(collection_id)
+        invalidate_document_list(collection_id)
 
         success = collection_service.delete_collection(collection_id)
         if not success:
@@ -1015,13 +1396,66 @@ async def delete_collection(collection_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to delete collection '{collection_id}': {e}")
+        logger.error("Failed to delete collection '%s': %s", collection_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete collection: {str(e)}"
         )
 
 
+def document_metadata(doc: dict, document_dir: Path) -> DocumentMetadata:
+    """
+    Build response metadata for a document from the vector store.
+
+    Args:
+        doc: Document dict as returned by the vector store
+        document_dir: Documents directory of the document's collection
+
+    Returns:
+        DocumentMetadata for the document
+    """
+    # Documents indexed before timestamps were stored fall back to the file mtime
+    indexed_at = doc.get("indexed_at") or ""
+    if not indexed_at:
+        try:
+            mtime = (document_dir / doc["filename"]).stat().st_mtime
+            indexed_at = datetime.fromtimestamp(mtime).isoformat()
+        except FileNotFoundError:
+            pass
+
+    # Handle both field naming conventions (total_pages/num_pages, total_chunks/num_chunks)
+    # Rows come from our own vector store, so skip pydantic validation
+    return DocumentMetadata.model_construct(
+        document_id=doc["document_id"],
+        filename=doc["filename"],
+        total_pages=doc.get("total_pages") or doc.get("num_pages", 0),
+        total_chunks=doc.get("total_chunks") or doc.get("num_chunks", 0),
+        indexed_at=indexed_at,
+    )
+
+
+def build_document_list(indexer: DocumentIndexer, collection_id: str) -> DocumentListResponse:
+    """
+    Build the document list response for a collection.
+
+    Args:
+        indexer: Indexer for the collection
+        collection_id: Collection to list documents from
+
+    Returns:
+        DocumentListResponse with metadata for every indexed document
+    """
+    # Get document directory for this collection
+    document_dir = indexer_manager.get_documents_path(collection_id)
+
+    doc_metadata_list = [document_metadata(doc, document_dir) for doc in indexer.list_documents()]
+
+    return DocumentListResponse(
+        documents=doc_metadata_list,
+        total_documents=len(doc_metadata_list),
+    )
+
+
 @app.get(
     "/documents",
     response_model=DocumentListResponse,
@@ -1030,6 +1464,7 @@ async def delete_collection(collection_id: str):
 )
 async def list_documents(
     collection_id: str = "default",
+    indexer: DocumentIndexer = Depends(indexer_dep),
 ) -> DocumentListResponse:
     """
     List all indexed documents with their metadata.
@@ -1040,57 +1475,80 @@ async def list_documents(
     Returns filename, page count, and chunk count for each document.
     """
     try:
-        # Get indexer for the collection
-        try:
-            indexer = get_indexer(collection_id)
-        except ValueError as e:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=str(e),
+        async with _doc_list_lock:
+            cached = _doc_list_cache.get(collection_id)
+            if cached is not None:
+                return cached
+            generation = _doc_list_generation.get(collection_id, 0)
+            response = await asyncio.to_thread(
+                build_document_list, indexer, collection_id
             )
-
-        # Get document directory for this collection
-        document_dir = indexer_manager.get_documents_path(collection_id)
-
-        documents = indexer.list_documents()
-
-        # Convert to DocumentMetadata objects
-        doc_metadata_list = []
-        for doc in documents:
-            # Get timestamp from document file modification time
-            doc_path = document_dir / doc["filename"]
-            indexed_at = ""
-            if doc_path.exists():
-                from datetime import datetime
-                mtime = doc_path.stat().st_mtime
-                indexed_at = datetime.fromtimestamp(mtime).isoformat()
-
-            # Handle both field naming conventions (total_pages/num_pages, total_chunks/num_chunks)
-            total_pages = doc.get("total_pages") or doc.get("num_pages", 0)
-            total_chunks = doc.get("total_chunks") or doc.get("num_chunks", 0)
-
-            doc_metadata = DocumentMetadata(
-                document_id=doc["document_id"],
-                filename=doc["filename"],
-                total_pages=total_pages,
-                total_chunks=total_chunks,
-                indexed_at=indexed_at,
-            )
-            doc_metadata_list.append(doc_metadata)
-
-        return DocumentListResponse(
-            documents=doc_metadata_list,
-            total_documents=len(doc_metadata_list),
-        )
+            if _doc_list_generation.get(collection_id, 0) == generation:
+                _doc_list_cache[collection_id] = response
+            return response
 
     except Exception as e:
-        logger.error(f"Failed to list documents: {e}")
+        logger.error("Failed to list documents: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to list documents: {str(e)}",
         )
 
 
+@app.get(
+    "/documents/stream",
+    summary="Stream all indexed documents as NDJSON",
+    tags=["documents"],
+)
+async def stream_documents(
+    collection_id: str = "default",
+    indexer: DocumentIndexer = Depends(indexer_dep),
+):
+    """
+    List indexed documents as newline-delimited JSON, one document per line.
+
+    Args:
+        collection_id: Collection to list documents from (default: "default")
+
+    Each line has the same fields as an entry of GET /documents. Documents
+    are read from the vector store and encoded one batch at a time on a
+    worker thread, so the first lines go out before the rest of the catalog
+    is read and the whole collection is never held in memory.
+    """
+    document_dir = indexer_manager.get_documents_path(collection_id)
+    batches = indexer.iter_documents(DOCUMENT_STREAM_BATCH)
+    # The batch iterator is advanced from worker threads, one call at a time
+    batches_lock = threading.Lock()
+    loop = asyncio.get_running_loop()
+
+    def encode_next_batch() -> Optional[bytes]:
+        """Read and encode the next batch (including the file mtime fallback)."""
+        with batches_lock:
+            batch = next(batches, None)
+        if batch is None:
+            return None
+        return b"".join(
+            orjson.dumps(document_metadata(doc, document_dir).model_dump()) + b"\n"
+            for doc in batch
+        )
+
+    def close_batches():
+        """Release the store cursor once any in-flight read has finished."""
+        with batches_lock:
+            batches.close()
+
+    async def ndjson_lines():
+        try:
+            while (lines := await asyncio.to_thread(encode_next_batch)) is not None:
+                yield lines
+        finally:
+            # Not awaited: after a client disconnect this generator is being
+            # cancelled, and a read may still be running on its thread
+            loop.run_in_executor(None, close_batches)
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 @app.get(
     "/documents/{document_id}/pdf",
     summary="Download document file",
@@ -1100,6 +1558,8 @@ async def list_documents(
 async def get_pdf(
     document_id: str,
     collection_id: str = "default",
+    indexer: DocumentIndexer = Depends(indexer_dep),
+    if_none_match: str = Header(None),
 ):
     """
     Download the document file for a specific document.
@@ -1111,61 +1571,67 @@ async def get_pdf(
     For PDFs, the URL can include #page=N to open at a specific page in the browser.
     """
     try:
-        # Get indexer for the collection
-        try:
-            indexer = get_indexer(collection_id)
-        except ValueError as e:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=str(e),
-            )
-
         # Get document directory for this collection
         document_dir = indexer_manager.get_documents_path(collection_id)
 
-        # Get document metadata to find filename
-        documents = indexer.list_documents()
-        doc = next((d for d in documents if d["document_id"] == document_id), None)
-
-        if not doc:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Document {document_id} not found",
-            )
-
-        # Find the document file
+        def locate_document():
+            """Look up the document and stat its file (may hit SQLite and the disk)."""
+            doc = indexer.get_document(document_id)
+            if not doc:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Document {document_id} not found",
+                )
+            try:
+                return doc, (document_dir / doc["filename"]).stat()
+            except FileNotFoundError:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Document file not found: {doc['filename']}",
+                )
+
+        # The stat result is reused by FileResponse
+        doc, stat_result = await asyncio.to_thread(locate_document)
         doc_path = document_dir / doc["filename"]
 
-        if not doc_path.exists():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Document file not found: {doc['filename']}",
-            )
+        # Let browsers revalidate instead of re-downloading on every page jump
+        cache_headers = {
+            "ETag": f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"',
+            "Cache-Control": DOCUMENT_CACHE_CONTROL,
+        }
+        if if_none_match == cache_headers["ETag"]:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
 
         # Determine media type based on file extension
-        file_ext = Path(doc["filename"]).suffix.lower()
-        media_types = {
-            '.pdf': 'application/pdf',
-            '.txt': 'text/plain',
-            '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            '.csv': 'text/csv',
-        }
-        media_type = media_types.get(file_ext, 'application/octet-stream')
+        dot, _, ext = doc["filename"].rpartition('.')
+        file_ext = f".{ext.lower()}" if dot else ""
+        media_type = DOCUMENT_MEDIA_TYPES.get(file_ext, 'application/octet-stream')
 
         # Return file with inline display for PDFs, download for others
         disposition = 'inline' if file_ext == '.pdf' else 'attachment'
+        headers = {
+            "Content-Disposition": f'{disposition}; filename="{doc["filename"]}"',
+            **cache_headers,
+        }
+
+        if settings.document_accel_redirect:
+            # nginx streams the file from its internal location; nothing is copied here
+            relative_path = doc_path.relative_to(settings.data_dir).as_posix()
+            headers["X-Accel-Redirect"] = f"{settings.document_accel_redirect.rstrip('/')}/{quote(relative_path)}"
+            return Response(media_type=media_type, headers=headers)
+
+        # FileResponse serves Range requests and uses sendfile (ASGI pathsend) where the server supports it
         return FileResponse(
             path=doc_path,
             media_type=media_type,
-            headers={
-                "Content-Disposition": f'{disposition}; filename="{doc["filename"]}"'
-            }
+            stat_result=stat_result,
+            headers=headers,
         )
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to retrieve PDF: {e}")
+        logger.error("Failed to retrieve PDF: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve PDF: {str(e)}",
@@ -1181,6 +1647,7 @@ async def get_pdf(
 async def delete_document(
     document_id: str,
     collection_id: str = "default",
+    indexer: DocumentIndexer = Depends(indexer_dep),
 ):
     """
     Remove a document and all its chunks from the index.
@@ -1195,42 +1662,40 @@ async def delete_document(
     - The document file from the collection's documents directory
     """
     try:
-        # Get indexer for the collection
-        try:
-            indexer = get_indexer(collection_id)
-        except ValueError as e:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=str(e),
-            )
-
         # Get document directory for this collection
         document_dir = indexer_manager.get_documents_path(collection_id)
 
-        # Get document metadata before deletion to find the PDF filename
-        documents = indexer.list_documents()
-        doc = next((d for d in documents if d["document_id"] == document_id), None)
+        def remove_document():
+            """Delete the chunks, collection entry and file (blocking index, SQLite and disk work)."""
+            # Get document metadata before deletion to find the PDF filename
+            doc = indexer.get_document(document_id)
+            if not doc:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Document {document_id} not found",
+                )
 
-        if not doc:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Document {document_id} not found",
-            )
+            # Delete from index
+            num_deleted = indexer.delete_document(document_id)
 
-        # Delete from index
-        num_deleted = indexer.delete_document(document_id)
+            # Remove document from collection tracking
+            collection_service.remove_document(collection_id, document_id)
 
-        # Remove document from collection tracking
-        collection_service.remove_document(collection_id, document_id)
+            # Delete document file from filesystem (one unlink, no existence check)
+            try:
+                (document_dir / doc["filename"]).unlink()
+                logger.info("Deleted document file: %s", doc['filename'])
+            except FileNotFoundError:
+                pass
 
-        # Delete document file from filesystem
-        doc_path = document_dir / doc["filename"]
-        if doc_path.exists():
-            doc_path.unlink()
-            logger.info(f"Deleted document file: {doc['filename']}")
+            return doc, num_deleted
+
+        # Keep the event loop serving other requests while the index is updated
+        doc, num_deleted = await asyncio.to_thread(remove_document)
+        invalidate_document_list(collection_id)
 
-        # Persist the changes
-        indexer.save_index()
+        # Schedule the changes to be persisted
+        indexer.mark_dirty()
 
         return {
             "message": f"Deleted document {document_id}",
@@ -1242,16 +1707,34 @@ async def delete_document(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to delete document: {e}")
+        logger.error("Failed to delete document: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete document: {str(e)}",
         )
 
 
-# Mount static files at root to serve /assets/* and other static content
-# This must be last so it doesn't override API routes
-app.mount("/", StaticFiles(directory=str(static_dir), html=True), name="static")
+# Serve the built frontend. Bundled JS/CSS live under /assets; the few
+# top-level files (icons, favicon) get explicit routes. Nothing is mounted at
+# "/", so unknown paths 404 from the router without probing the disk.
+def _static_file_route(file_path: Path):
+    """Create an endpoint serving one top-level static file."""
+    async def serve_static_file():
+        return FileResponse(file_path)
+    return serve_static_file
+
+
+for _static_file in static_dir.iterdir():
+    if _static_file.is_file() and _static_file.name != "index.html":
+        app.add_api_route(
+            f"/{_static_file.name}",
+            _static_file_route(_static_file),
+            methods=["GET"],
+            include_in_schema=False,
+        )
+
+if (static_dir / "assets").is_dir():
+    app.mount("/assets", StaticFiles(directory=str(static_dir / "assets")), name="assets")
 
 
 if __name__ == "__main__":
@@ -53,11 +53,11 @@ def migrate_to_collections():
                 dest = new_docs_dir / doc_file.name
                 if not dest.exists():
                     shutil.copy2(doc_file, dest)
-                    logger.info(f"  Copied: {doc_file.name}")
+                    logger.info("  Copied: %s", doc_file.name)
                     doc_count += 1
                 else:
-                    logger.info(f"  Skipped (already exists): {doc_file.name}")
-        logger.info(f"Migrated {doc_count} documents to default collection.")
+                    logger.info("  Skipped (already exists): %s", doc_file.name)
+        logger.info("Migrated %s documents to default collection.", doc_count)
 
     # Migrate indexes
     if legacy_indexes_dir.exists():
@@ -85,11 +85,11 @@ def migrate_to_collections():
                     dest = new_indexes_dir / index_file.name
                     if not dest.exists():
                         shutil.copy2(index_file, dest)
-                        logger.info(f"  Copied: {index_file.name}")
+                        logger.info("  Copied: %s", index_file.name)
                         file_count += 1
                     else:
-                        logger.info(f"  Skipped (already exists): {index_file.name}")
-            logger.info(f"Migrated {file_count} index files to default collection.")
+                        logger.info("  Skipped (already exists): %s", index_file.name)
+            logger.info("Migrated %s index files to default collection.", file_count)
         else:
             logger.info("No index files found to migrate.")
 
@@ -98,12 +98,12 @@ def migrate_to_collections():
     logger.info("Migration complete!")
     logger.info("")
     logger.info("Your data has been COPIED (not moved) to:")
-    logger.info(f"  Documents: {new_docs_dir}")
-    logger.info(f"  Indexes: {new_indexes_dir}")
+    logger.info("  Documents: %s", new_docs_dir)
+    logger.info("  Indexes: %s", new_indexes_dir)
     logger.info("")
     logger.info("The original data is still in:")
-    logger.info(f"  Documents: {legacy_docs_dir}")
-    logger.info(f"  Indexes: {legacy_indexes_dir}")
+    logger.info("  Documents: %s", legacy_docs_dir)
+    logger.info("  Indexes: %s", legacy_indexes_dir)
     logger.info("")
     logger.info("Once you've verified everything works, you can delete")
     logger.info("the legacy directories to free up space.")
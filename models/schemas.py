@@ -1,7 +1,13 @@
 """Pydantic schemas for API request/response models."""
 
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, Field, computed_field
+
+# (URL prefix, URL suffix) around the document ID for the search being
+# answered, built once per request; SearchResult URLs are derived from it
+# when the response is serialized
+result_url_context: ContextVar[Optional[Tuple[str, str]]] = ContextVar("result_url_context", default=None)
 
 
 class ChunkMetadata(BaseModel):
@@ -34,8 +40,21 @@ class SearchResult(BaseModel):
     similarity_score: float = Field(..., description="Cosine similarity score (0-1)")
     document_id: str = Field(..., description="Document identifier")
     chunk_id: str = Field(..., description="Chunk identifier")
-    pdf_url: str = Field(..., description="URL to download the PDF")
-    page_url: str = Field(..., description="URL to view the specific page")
+
+    @computed_field(description="URL to download the PDF")
+    @property
+    def pdf_url(self) -> str:
+        context = result_url_context.get()
+        if context is None:
+            return ""
+        prefix, suffix = context
+        return prefix + self.document_id + suffix
+
+    @computed_field(description="URL to view the specific page")
+    @property
+    def page_url(self) -> str:
+        pdf_url = self.pdf_url
+        return f"{pdf_url}#page={self.page_number}" if pdf_url else ""
 
 
 class UploadResponse(BaseModel):
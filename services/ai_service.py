@@ -8,10 +8,13 @@ Users provide their own API keys for cloud providers (Anthropic, OpenAI).
 Ollama runs locally and requires no API key.
 """
 
+import hashlib
 import json
 import logging
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from typing import List, Optional, Dict
 
 logger = logging.getLogger(__name__)
@@ -113,10 +116,10 @@ class AnthropicProvider(AIProvider):
             return False
         except anthropic.RateLimitError as e:
             # Quota/billing issues mean the key is valid but account has no credits
-            logger.warning(f"Anthropic key valid but quota/rate limit: {e}")
+            logger.warning("Anthropic key valid but quota/rate limit: %s", e)
             return True  # Key is valid, just no credits or rate limited
         except Exception as e:
-            logger.error(f"Anthropic validation error: {e}")
+            logger.error("Anthropic validation error: %s", e)
             raise
 
 
@@ -162,13 +165,13 @@ class OpenAIProvider(AIProvider):
             # Check if it's a quota error vs rate limit
             error_message = str(e)
             if "quota" in error_message.lower() or "insufficient_quota" in error_message.lower():
-                logger.warning(f"OpenAI key valid but quota exceeded: {e}")
+                logger.warning("OpenAI key valid but quota exceeded: %s", e)
                 return True  # Key is valid, just no credits
             else:
-                logger.warning(f"OpenAI rate limit: {e}")
+                logger.warning("OpenAI rate limit: %s", e)
                 return True  # Key is valid, just rate limited
         except Exception as e:
-            logger.error(f"OpenAI validation error: {e}")
+            logger.error("OpenAI validation error: %s", e)
             raise
 
 
@@ -188,45 +191,51 @@ class OllamaProvider(AIProvider):
         # Users can override by specifying different models
         self.FAST_MODEL = model
         self.QUALITY_MODEL = model
+        self._client = None
+
+    @property
+    def client(self):
+        """HTTP client kept for the provider's lifetime (reuses connections)."""
+        if self._client is None:
+            import httpx
+            # Longer timeout for synthesis (5 minutes) - Ollama can be slow on CPU
+            self._client = httpx.Client(timeout=300.0)
+        return self._client
 
     def complete(self, prompt: str, max_tokens: int, model: str) -> dict:
         """Generate completion using Ollama API."""
-        import httpx
-
         try:
-            # Longer timeout for synthesis (5 minutes) - Ollama can be slow on CPU
-            with httpx.Client(timeout=300.0) as client:
-                response = client.post(
-                    f"{self.base_url}/api/generate",
-                    json={
-                        "model": model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "num_predict": max_tokens,
-                            "temperature": 0.7,
-                        }
+            response = self.client.post(
+                f"{self.base_url}/api/generate",
+                json={
+                    "model": model,
+                    "prompt": prompt,
+                    "stream": False,
+                    "options": {
+                        "num_predict": max_tokens,
+                        "temperature": 0.7,
                     }
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                # Ollama doesn't provide token counts in the same way
-                # Estimate based on response length
-                text = data.get("response", "").strip()
-                estimated_input_tokens = len(prompt) // 4
-                estimated_output_tokens = len(text) // 4
-
-                return {
-                    "text": text,
-                    "usage": {
-                        "input_tokens": estimated_input_tokens,
-                        "output_tokens": estimated_output_tokens,
-                        "model": model,
-                    },
                 }
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            # Ollama doesn't provide token counts in the same way
+            # Estimate based on response length
+            text = data.get("response", "").strip()
+            estimated_input_tokens = len(prompt) // 4
+            estimated_output_tokens = len(text) // 4
+
+            return {
+                "text": text,
+                "usage": {
+                    "input_tokens": estimated_input_tokens,
+                    "output_tokens": estimated_output_tokens,
+                    "model": model,
+                },
+            }
         except Exception as e:
-            logger.error(f"Ollama completion error: {e}")
+            logger.error("Ollama completion error: %s", e)
             raise
 
     def validate(self) -> bool:
@@ -234,34 +243,33 @@ class OllamaProvider(AIProvider):
         import httpx
 
         try:
-            with httpx.Client(timeout=5.0) as client:
-                # Check if Ollama is running
-                response = client.get(f"{self.base_url}/api/tags")
-                response.raise_for_status()
+            # Check if Ollama is running
+            response = self.client.get(f"{self.base_url}/api/tags", timeout=5.0)
+            response.raise_for_status()
 
-                # Check if the specified model is available
-                data = response.json()
-                models = [m.get("name", "") for m in data.get("models", [])]
+            # Check if the specified model is available
+            data = response.json()
+            models = [m.get("name", "") for m in data.get("models", [])]
 
-                # Ollama model names can have tags (e.g., "llama3.2:latest")
-                # Check if our model exists with or without tag
-                model_exists = any(
-                    self.model in model_name or model_name.startswith(f"{self.model}:")
-                    for model_name in models
-                )
+            # Ollama model names can have tags (e.g., "llama3.2:latest")
+            # Check if our model exists with or without tag
+            model_exists = any(
+                self.model in model_name or model_name.startswith(f"{self.model}:")
+                for model_name in models
+            )
 
-                if not model_exists:
-                    logger.warning(f"Ollama model '{self.model}' not found. Available models: {models}")
-                    return False
+            if not model_exists:
+                logger.warning("Ollama model '%s' not found. Available models: %s", self.model, models)
+                return False
 
-                logger.info(f"Ollama validation successful. Model '{self.model}' is available.")
-                return True
+            logger.info("Ollama validation successful. Model '%s' is available.", self.model)
+            return True
 
         except httpx.ConnectError:
-            logger.warning("Ollama is not running or not accessible at {self.base_url}")
+            logger.warning("Ollama is not running or not accessible at %s", self.base_url)
             return False
         except Exception as e:
-            logger.error(f"Ollama validation error: {e}")
+            logger.error("Ollama validation error: %s", e)
             return False
 
 
@@ -290,6 +298,43 @@ def create_provider(provider_name: str, api_key: str = None, **kwargs) -> AIProv
         raise ValueError(f"Unknown provider: {provider_name}")
 
 
+# Providers reused across requests, keyed by provider and a digest of the
+# API key (so plaintext keys are not kept as cache keys)
+PROVIDER_CACHE_SIZE = 64
+_providers: "OrderedDict[tuple, AIProvider]" = OrderedDict()
+_providers_lock = threading.Lock()
+
+
+def get_provider(provider_name: str, api_key: str = None, **kwargs) -> AIProvider:
+    """Get a cached AI provider instance, creating it on first use.
+
+    Provider clients hold HTTP connection pools, so reusing them skips client
+    construction and TLS handshakes on every request.
+
+    Args:
+        provider_name: Provider name (anthropic, openai, ollama)
+        api_key: API key for cloud providers (not needed for Ollama)
+        **kwargs: Additional provider-specific arguments (see create_provider)
+    """
+    key_digest = hashlib.blake2b(api_key.encode(), digest_size=16).digest() if api_key else None
+    cache_key = (provider_name, key_digest, tuple(sorted(kwargs.items())))
+
+    with _providers_lock:
+        provider = _providers.get(cache_key)
+        if provider is not None:
+            _providers.move_to_end(cache_key)
+            return provider
+
+    provider = create_provider(provider_name, api_key, **kwargs)
+
+    with _providers_lock:
+        provider = _providers.setdefault(cache_key, provider)
+        _providers.move_to_end(cache_key)
+        while len(_providers) > PROVIDER_CACHE_SIZE:
+            _providers.popitem(last=False)
+    return provider
+
+
 class AIService:
     """Provider-agnostic AI service for search enhancements."""
 
@@ -316,10 +361,10 @@ class AIService:
         if not results:
             return {"reranked_indices": [], "usage": None}
 
-        snippets = []
-        for r in results:
-            snippets.append(f"[{r['index']}] (file: {r['filename']}) {r['text_snippet'][:200]}")
-        snippet_text = "\n\n".join(snippets)
+        snippet_text = "\n\n".join(
+            f"[{r['index']}] (file: {r['filename']}) {r['text_snippet'][:200]}"
+            for r in results
+        )
 
         prompt = (
             "You are a search result reranking assistant. Given a query and numbered "
@@ -348,10 +393,10 @@ class AIService:
                 raise ValueError("Expected a JSON array")
             indices = [int(i) for i in indices]
         except (json.JSONDecodeError, ValueError) as e:
-            logger.warning(f"Failed to parse rerank response: {e}. Using original order.")
+            logger.warning("Failed to parse rerank response: %s. Using original order.", e)
             indices = [r["index"] for r in results[:top_k]]
 
-        logger.info(f"Reranked {len(results)} results in {elapsed:.2f}s -> top {len(indices)}")
+        logger.info("Reranked %s results in %.2fs -> top %s", len(results), elapsed, len(indices))
 
         return {
             "reranked_indices": indices,
@@ -367,13 +412,10 @@ class AIService:
         if not results:
             return {"synthesis": "", "usage": None}
 
-        context_parts = []
-        for i, r in enumerate(results):
-            context_parts.append(
-                f"[Source {i + 1}: {r['filename']}, page {r['page_number']}]\n"
-                f"{r['text_snippet']}"
-            )
-        context = "\n\n---\n\n".join(context_parts)
+        context = "\n\n---\n\n".join(
+            f"[Source {i}: {r['filename']}, page {r['page_number']}]\n{r['text_snippet']}"
+            for i, r in enumerate(results, start=1)
+        )
 
         prompt = (
             "You are a research assistant. Based on the search results below, "
@@ -393,7 +435,7 @@ class AIService:
         response = self.provider.complete(prompt, max_tokens=1024, model=self.quality_model)
         elapsed = time.time() - start
 
-        logger.info(f"Synthesized answer in {elapsed:.2f}s ({len(response['text'])} chars)")
+        logger.info("Synthesized answer in %.2fs (%s chars)", elapsed, len(response['text']))
 
         return {
             "synthesis": response["text"],
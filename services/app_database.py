@@ -29,9 +29,26 @@ class AppDatabase:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection tuned for many small transactions.
+
+        WAL (enabled once in _init_db) lets readers proceed while a write is
+        in progress; with it, synchronous=NORMAL only syncs at checkpoints
+        instead of on every commit.
+
+        Returns:
+            SQLite connection
+        """
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
     def _init_db(self):
         """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            # Persistent setting, stored in the database file
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS config (
                     key TEXT PRIMARY KEY,
@@ -146,7 +163,7 @@ class AppDatabase:
                 )
 
             conn.commit()
-            logger.info(f"Application database initialized at {self.db_path}")
+            logger.info("Application database initialized at %s", self.db_path)
 
     # Configuration methods
     def get_config(self, key: str, default: Any = None) -> Any:
@@ -159,7 +176,7 @@ class AppDatabase:
         Returns:
             Configuration value (parsed from JSON) or default
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 "SELECT value FROM config WHERE key = ?",
                 (key,)
@@ -182,7 +199,7 @@ class AppDatabase:
         value_str = json.dumps(value) if not isinstance(value, str) else value
         timestamp = datetime.utcnow().isoformat()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute(
                 """
                 INSERT INTO config (key, value, updated_at)
@@ -194,7 +211,7 @@ class AppDatabase:
                 (key, value_str, timestamp)
             )
             conn.commit()
-            logger.info(f"Config updated: {key} = {value}")
+            logger.info("Config updated: %s = %s", key, value)
 
     def get_all_config(self) -> Dict[str, Any]:
         """Get all configuration values.
@@ -202,7 +219,7 @@ class AppDatabase:
         Returns:
             Dictionary of all config key-value pairs
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("SELECT key, value FROM config")
             config = {}
             for key, value in cursor.fetchall():
@@ -218,7 +235,7 @@ class AppDatabase:
         Args:
             key: Configuration key to delete
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("DELETE FROM config WHERE key = ?", (key,))
             conn.commit()
 
@@ -235,7 +252,7 @@ class AppDatabase:
         timestamp = datetime.utcnow().isoformat()
         config_json = json.dumps(config_snapshot)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 """
                 INSERT INTO reindex_jobs
@@ -246,7 +263,7 @@ class AppDatabase:
             )
             conn.commit()
             job_id = cursor.lastrowid
-            logger.info(f"Created re-index job {job_id}")
+            logger.info("Created re-index job %s", job_id)
             return job_id
 
     def update_reindex_job(
@@ -301,7 +318,7 @@ class AppDatabase:
         params.append(job_id)
         query = f"UPDATE reindex_jobs SET {', '.join(updates)} WHERE id = ?"
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute(query, params)
             conn.commit()
 
@@ -314,7 +331,7 @@ class AppDatabase:
         Returns:
             Job details or None if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute(
                 """
@@ -337,7 +354,7 @@ class AppDatabase:
         Returns:
             Latest job details or None
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute(
                 """
@@ -360,7 +377,7 @@ class AppDatabase:
         Returns:
             Active job details or None
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute(
                 """
@@ -385,7 +402,7 @@ class AppDatabase:
         Returns:
             AI preferences dict or None
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute(
                 "SELECT * FROM ai_preferences WHERE id = 1"
@@ -419,7 +436,7 @@ class AppDatabase:
         """
         timestamp = datetime.utcnow().isoformat()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             # Get current preferences
             cursor = conn.execute("SELECT * FROM ai_preferences WHERE id = 1")
             row = cursor.fetchone()
@@ -496,7 +513,7 @@ class AppDatabase:
         """
         timestamp = datetime.utcnow().isoformat()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 """
                 INSERT INTO search_history
@@ -517,7 +534,7 @@ class AppDatabase:
         Returns:
             List of search history entries
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute(
                 """
@@ -539,7 +556,7 @@ class AppDatabase:
         Returns:
             Search entry with results_json or None
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute(
                 "SELECT * FROM search_history WHERE id = ?",
@@ -566,14 +583,14 @@ class AppDatabase:
         from datetime import timedelta
         cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 "DELETE FROM search_history WHERE timestamp < ?",
                 (cutoff,)
             )
             deleted = cursor.rowcount
             conn.commit()
-            logger.info(f"Deleted {deleted} old search history entries")
+            logger.info("Deleted %s old search history entries", deleted)
             return deleted
 
     # User Preferences methods
@@ -587,7 +604,7 @@ class AppDatabase:
         Returns:
             Preference value (parsed from JSON) or default
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 "SELECT value FROM user_preferences WHERE key = ?",
                 (key,)
@@ -610,7 +627,7 @@ class AppDatabase:
         value_str = json.dumps(value) if not isinstance(value, str) else value
         timestamp = datetime.utcnow().isoformat()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute(
                 """
                 INSERT INTO user_preferences (key, value, updated_at)
@@ -622,7 +639,7 @@ class AppDatabase:
                 (key, value_str, timestamp)
             )
             conn.commit()
-            logger.info(f"User preference updated: {key}")
+            logger.info("User preference updated: %s", key)
 
     def get_all_user_preferences(self) -> Dict[str, Any]:
         """Get all user preferences.
@@ -630,7 +647,7 @@ class AppDatabase:
         Returns:
             Dictionary of all preferences
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("SELECT key, value FROM user_preferences")
             prefs = {}
             for key, value in cursor.fetchall():
@@ -667,7 +684,7 @@ class AppDatabase:
         collection_id = str(uuid.uuid4())[:8]
         timestamp = datetime.utcnow().isoformat()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute(
                 """
                 INSERT INTO collections
@@ -677,7 +694,7 @@ class AppDatabase:
                 (collection_id, name, description, color, chunk_size, chunk_overlap, embedding_model, timestamp, timestamp)
             )
             conn.commit()
-            logger.info(f"Created collection: {name} ({collection_id})")
+            logger.info("Created collection: %s (%s)", name, collection_id)
             return collection_id
 
     def get_collection(self, collection_id: str) -> Optional[Dict[str, Any]]:
@@ -689,7 +706,7 @@ class AppDatabase:
         Returns:
             Collection details or None
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute(
                 "SELECT * FROM collections WHERE id = ?",
@@ -713,7 +730,7 @@ class AppDatabase:
         Returns:
             List of collection details
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute(
                 """
@@ -778,10 +795,10 @@ class AppDatabase:
 
         query = f"UPDATE collections SET {', '.join(updates)} WHERE id = ?"
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute(query, params)
             conn.commit()
-            logger.info(f"Updated collection: {collection_id}")
+            logger.info("Updated collection: %s", collection_id)
 
     def delete_collection(self, collection_id: str) -> bool:
         """Delete a collection.
@@ -796,7 +813,7 @@ class AppDatabase:
             logger.warning("Cannot delete default collection")
             return False
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 "DELETE FROM collections WHERE id = ?",
                 (collection_id,)
@@ -804,7 +821,7 @@ class AppDatabase:
             conn.commit()
             deleted = cursor.rowcount > 0
             if deleted:
-                logger.info(f"Deleted collection: {collection_id}")
+                logger.info("Deleted collection: %s", collection_id)
             return deleted
 
     def add_document_to_collection(self, collection_id: str, document_id: str):
@@ -816,7 +833,7 @@ class AppDatabase:
         """
         timestamp = datetime.utcnow().isoformat()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute(
                 """
                 INSERT OR REPLACE INTO collection_documents
@@ -827,6 +844,26 @@ class AppDatabase:
             )
             conn.commit()
 
+    def add_documents_to_collection(self, collection_id: str, document_ids: List[str]):
+        """Add several documents to a collection in one transaction.
+
+        Args:
+            collection_id: Collection ID
+            document_ids: Document IDs
+        """
+        timestamp = datetime.utcnow().isoformat()
+
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO collection_documents
+                (collection_id, document_id, added_at)
+                VALUES (?, ?, ?)
+                """,
+                [(collection_id, document_id, timestamp) for document_id in document_ids]
+            )
+            conn.commit()
+
     def remove_document_from_collection(self, collection_id: str, document_id: str):
         """Remove a document from a collection.
 
@@ -834,7 +871,7 @@ class AppDatabase:
             collection_id: Collection ID
             document_id: Document ID
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute(
                 "DELETE FROM collection_documents WHERE collection_id = ? AND document_id = ?",
                 (collection_id, document_id)
@@ -850,7 +887,7 @@ class AppDatabase:
         Returns:
             List of document IDs
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 "SELECT document_id FROM collection_documents WHERE collection_id = ?",
                 (collection_id,)
@@ -866,7 +903,7 @@ class AppDatabase:
         Returns:
             List of collection IDs
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 "SELECT collection_id FROM collection_documents WHERE document_id = ?",
                 (document_id,)
@@ -46,7 +46,7 @@ class TextChunker:
 
         for page_num, text in page_texts.items():
             if not text.strip():
-                logger.debug(f"Skipping empty page {page_num} in {filename}")
+                logger.debug("Skipping empty page %s in %s", page_num, filename)
                 continue
 
             page_chunks = self._chunk_text(text)
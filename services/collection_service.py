@@ -84,7 +84,7 @@ class CollectionService:
         # Create directories
         self._ensure_collection_dirs(collection_id)
 
-        logger.info(f"Created collection '{name}' with ID {collection_id}")
+        logger.info("Created collection '%s' with ID %s", name, collection_id)
 
         return app_db.get_collection(collection_id)
 
@@ -165,14 +165,14 @@ class CollectionService:
         if collection_dir.exists():
             try:
                 shutil.rmtree(collection_dir)
-                logger.info(f"Deleted collection directory: {collection_dir}")
+                logger.info("Deleted collection directory: %s", collection_dir)
             except PermissionError as e:
                 # On Windows, files may be locked by other processes
-                logger.warning(f"Could not delete collection directory (files may be locked): {e}")
+                logger.warning("Could not delete collection directory (files may be locked): %s", e)
                 # Still return True since the database entry was deleted
                 # The directory can be cleaned up manually or on restart
             except Exception as e:
-                logger.error(f"Error deleting collection directory: {e}")
+                logger.error("Error deleting collection directory: %s", e)
                 # Still return True since the database entry was deleted
 
         return True
@@ -210,6 +210,15 @@ class CollectionService:
         """
         app_db.add_document_to_collection(collection_id, document_id)
 
+    def add_documents(self, collection_id: str, document_ids: List[str]):
+        """Register several documents as belonging to a collection.
+
+        Args:
+            collection_id: Collection ID
+            document_ids: Document IDs
+        """
+        app_db.add_documents_to_collection(collection_id, document_ids)
+
     def remove_document(self, collection_id: str, document_id: str):
         """Remove a document from a collection.
 
@@ -240,7 +249,7 @@ class CollectionService:
         if indexes_dir.exists():
             shutil.rmtree(indexes_dir)
             indexes_dir.mkdir(parents=True, exist_ok=True)
-            logger.info(f"Cleared index for collection: {collection_id}")
+            logger.info("Cleared index for collection: %s", collection_id)
 
 
 # Global instance
@@ -4,6 +4,7 @@ Handles runtime configuration changes including:
 - Embedding model selection
 - Chunking parameters
 - Metadata storage type
+- Vector index compression (int8 scalar or product quantization)
 - Other indexing settings
 
 Configuration is stored in SQLite database for persistence across restarts.
@@ -18,6 +19,11 @@ from services.app_database import app_db
 
 logger = logging.getLogger(__name__)
 
+# Vector compression for ANN-sized indexes: none, int8 scalar (4x smaller
+# codes), or product quantization (32x smaller codes). Only the FAISS index
+# shrinks; the float32 embeddings are still kept for rescoring and rebuilds.
+QUANTIZATION_OPTIONS = ("none", "sq8", "pq")
+
 
 class ConfigManager:
     """Manages dynamic configuration updates with database persistence."""
@@ -37,6 +43,7 @@ class ConfigManager:
             "chunk_size": settings.chunk_size,
             "chunk_overlap": settings.chunk_overlap,
             "metadata_storage": settings.metadata_storage,
+            "index_quantization": settings.index_quantization,
             "default_top_k": settings.default_top_k,
             "max_top_k": settings.max_top_k,
             "data_dir": str(settings.data_dir),
@@ -77,12 +84,13 @@ class ConfigManager:
         # Fields that require restart
         restart_fields = {"embedding_model", "metadata_storage", "host", "port"}
         # Fields that require re-indexing
-        reindex_fields = {"embedding_model", "chunk_size", "chunk_overlap"}
+        # (existing indexes keep their vector encoding until they are rebuilt)
+        reindex_fields = {"embedding_model", "chunk_size", "chunk_overlap", "index_quantization"}
 
         # Validate updates
         valid_fields = {
             "embedding_model", "chunk_size", "chunk_overlap",
-            "metadata_storage", "default_top_k", "max_top_k"
+            "metadata_storage", "index_quantization", "default_top_k", "max_top_k"
         }
 
         for key in updates.keys():
@@ -90,6 +98,14 @@ class ConfigManager:
                 result["errors"].append(f"Invalid config field: {key}")
                 result["success"] = False
 
+        quantization = updates.get("index_quantization")
+        if quantization is not None and quantization not in QUANTIZATION_OPTIONS:
+            result["errors"].append(
+                f"Invalid index_quantization: {quantization} "
+                f"(expected one of: {', '.join(QUANTIZATION_OPTIONS)})"
+            )
+            result["success"] = False
+
         if not result["success"]:
             return result
 
@@ -107,7 +123,7 @@ class ConfigManager:
             self._update_env_file(updates)
         except Exception as e:
             # Non-fatal - database is source of truth
-            logger.warning(f"Failed to update .env file: {e}")
+            logger.warning("Failed to update .env file: %s", e)
 
         # Update runtime settings (for non-restart fields)
         for key, value in updates.items():
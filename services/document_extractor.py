@@ -1,7 +1,7 @@
 """Generic document text extraction service supporting multiple file formats."""
 
 from pathlib import Path
-from typing import Dict, List
+from typing import BinaryIO, Dict, List
 import logging
 
 # PDF extraction
@@ -14,7 +14,7 @@ logger = logging.getLogger(__name__)
 class DocumentExtractor:
     """Extracts text from various document formats (PDF, TXT, DOCX, CSV, MD, JSON)."""
 
-    SUPPORTED_EXTENSIONS = {'.pdf', '.txt', '.docx', '.csv', '.md', '.json'}
+    SUPPORTED_EXTENSIONS = frozenset({'.pdf', '.txt', '.docx', '.csv', '.md', '.json'})
 
     def extract_text(self, file_path: Path) -> Dict[int, str]:
         """
@@ -30,32 +30,66 @@ class DocumentExtractor:
             ValueError: If file type is not supported
             Exception: If text extraction fails
         """
-        file_ext = file_path.suffix.lower()
+        self._check_supported(file_path.suffix.lower())
 
-        if file_ext not in self.SUPPORTED_EXTENSIONS:
-            raise ValueError(
-                f"Unsupported file type: {file_ext}. "
-                f"Supported types: {', '.join(self.SUPPORTED_EXTENSIONS)}"
-            )
+        with open(file_path, 'rb') as f:
+            return self.extract_stream(f, file_path.name)
 
-        logger.info(f"Extracting text from {file_ext} file: {file_path.name}")
+    def extract_stream(self, stream: BinaryIO, filename: str) -> Dict[int, str]:
+        """
+        Extract text from an open binary stream (e.g. an upload still in memory).
+
+        Args:
+            stream: Seekable binary file object positioned at the start
+            filename: Original filename (selects the format by extension)
+
+        Returns:
+            Dictionary mapping page/section numbers (1-indexed) to extracted text
+
+        Raises:
+            ValueError: If file type is not supported
+            Exception: If text extraction fails
+        """
+        file_ext = Path(filename).suffix.lower()
+        self._check_supported(file_ext)
+
+        logger.info("Extracting text from %s file: %s", file_ext, filename)
 
         if file_ext == '.pdf':
-            return self._extract_pdf(file_path)
+            return self._extract_pdf(stream, filename)
         elif file_ext == '.txt':
-            return self._extract_txt(file_path)
+            return self._extract_txt(stream, filename)
         elif file_ext == '.docx':
-            return self._extract_docx(file_path)
+            return self._extract_docx(stream, filename)
         elif file_ext == '.csv':
-            return self._extract_csv(file_path)
+            return self._extract_csv(stream, filename)
         elif file_ext == '.md':
-            return self._extract_markdown(file_path)
+            return self._extract_markdown(stream, filename)
         elif file_ext == '.json':
-            return self._extract_json(file_path)
+            return self._extract_json(stream, filename)
         else:
             raise ValueError(f"Unsupported file extension: {file_ext}")
 
-    def _extract_pdf(self, pdf_path: Path) -> Dict[int, str]:
+    def _check_supported(self, file_ext: str):
+        """Raise ValueError for extensions without an extractor."""
+        if file_ext not in self.SUPPORTED_EXTENSIONS:
+            raise ValueError(
+                f"Unsupported file type: {file_ext}. "
+                f"Supported types: {', '.join(self.SUPPORTED_EXTENSIONS)}"
+            )
+
+    @staticmethod
+    def _decode(data: bytes, name: str) -> str:
+        """Decode text as UTF-8 with a latin-1 fallback, normalizing newlines."""
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            # Fallback to latin-1 for broader compatibility
+            logger.warning("UTF-8 decoding failed for %s, trying latin-1", name)
+            text = data.decode('latin-1')
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+    def _extract_pdf(self, stream: BinaryIO, name: str) -> Dict[int, str]:
         """
         Extract text from PDF file using pdfplumber with pypdf fallback.
 
@@ -64,59 +98,52 @@ class DocumentExtractor:
         """
         try:
             # Try pdfplumber first (better for complex layouts)
-            return self._extract_pdf_with_pdfplumber(pdf_path)
+            return self._extract_pdf_with_pdfplumber(stream)
         except Exception as e:
-            logger.warning(f"pdfplumber failed for {pdf_path.name}: {e}. Trying pypdf...")
+            logger.warning("pdfplumber failed for %s: %s. Trying pypdf...", name, e)
             try:
                 # Fallback to pypdf
-                return self._extract_pdf_with_pypdf(pdf_path)
+                stream.seek(0)
+                return self._extract_pdf_with_pypdf(stream)
             except Exception as e2:
-                logger.error(f"Both PDF extraction methods failed for {pdf_path.name}: {e2}")
-                raise Exception(f"Failed to extract text from PDF {pdf_path.name}: {e2}")
+                logger.error("Both PDF extraction methods failed for %s: %s", name, e2)
+                raise Exception(f"Failed to extract text from PDF {name}: {e2}")
 
-    def _extract_pdf_with_pdfplumber(self, pdf_path: Path) -> Dict[int, str]:
+    def _extract_pdf_with_pdfplumber(self, stream: BinaryIO) -> Dict[int, str]:
         """Extract text using pdfplumber (handles complex layouts better)."""
         page_texts = {}
 
-        with pdfplumber.open(pdf_path) as pdf:
+        with pdfplumber.open(stream) as pdf:
             for page_num, page in enumerate(pdf.pages, start=1):
                 text = page.extract_text() or ""
                 page_texts[page_num] = text.strip()
 
         return page_texts
 
-    def _extract_pdf_with_pypdf(self, pdf_path: Path) -> Dict[int, str]:
+    def _extract_pdf_with_pypdf(self, stream: BinaryIO) -> Dict[int, str]:
         """Extract text using pypdf (fallback method)."""
         page_texts = {}
 
-        reader = PdfReader(str(pdf_path))
+        reader = PdfReader(stream)
         for page_num, page in enumerate(reader.pages, start=1):
             text = page.extract_text() or ""
             page_texts[page_num] = text.strip()
 
         return page_texts
 
-    def _extract_txt(self, txt_path: Path) -> Dict[int, str]:
+    def _extract_txt(self, stream: BinaryIO, name: str) -> Dict[int, str]:
         """
         Extract text from plain text file.
 
         Returns:
             Dictionary with single entry (page 1) containing all text
         """
-        try:
-            # Try UTF-8 first
-            with open(txt_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-        except UnicodeDecodeError:
-            # Fallback to latin-1 for broader compatibility
-            logger.warning(f"UTF-8 decoding failed for {txt_path.name}, trying latin-1")
-            with open(txt_path, 'r', encoding='latin-1') as f:
-                text = f.read()
+        text = self._decode(stream.read(), name)
 
         # Return as single "page"
         return {1: text.strip()}
 
-    def _extract_docx(self, docx_path: Path) -> Dict[int, str]:
+    def _extract_docx(self, stream: BinaryIO, name: str) -> Dict[int, str]:
         """
         Extract text from DOCX file.
 
@@ -131,13 +158,13 @@ class DocumentExtractor:
                 "Install it with: pip install python-docx"
             )
 
-        doc = Document(str(docx_path))
+        doc = Document(stream)
 
         # Extract all paragraphs
         paragraphs = [para.text for para in doc.paragraphs if para.text.strip()]
 
         if not paragraphs:
-            logger.warning(f"No text found in {docx_path.name}")
+            logger.warning("No text found in %s", name)
             return {1: ""}
 
         # Group paragraphs into "pages" (every ~10 paragraphs = 1 page)
@@ -152,7 +179,7 @@ class DocumentExtractor:
 
         return page_texts
 
-    def _extract_csv(self, csv_path: Path) -> Dict[int, str]:
+    def _extract_csv(self, stream: BinaryIO, name: str) -> Dict[int, str]:
         """
         Extract text from CSV file.
 
@@ -169,13 +196,13 @@ class DocumentExtractor:
 
         # Read CSV
         try:
-            df = pd.read_csv(csv_path)
+            df = pd.read_csv(stream)
         except Exception as e:
-            logger.error(f"Failed to read CSV {csv_path.name}: {e}")
+            logger.error("Failed to read CSV %s: %s", name, e)
             raise Exception(f"Failed to read CSV file: {e}")
 
         if df.empty:
-            logger.warning(f"Empty CSV file: {csv_path.name}")
+            logger.warning("Empty CSV file: %s", name)
             return {1: ""}
 
         # Convert DataFrame to text representation
@@ -208,7 +235,7 @@ class DocumentExtractor:
 
         return page_texts
 
-    def _extract_markdown(self, md_path: Path) -> Dict[int, str]:
+    def _extract_markdown(self, stream: BinaryIO, name: str) -> Dict[int, str]:
         """
         Extract text from Markdown file, chunking by headers.
 
@@ -217,16 +244,10 @@ class DocumentExtractor:
         """
         import re
 
-        try:
-            with open(md_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            logger.warning(f"UTF-8 decoding failed for {md_path.name}, trying latin-1")
-            with open(md_path, 'r', encoding='latin-1') as f:
-                content = f.read()
+        content = self._decode(stream.read(), name)
 
         if not content.strip():
-            logger.warning(f"Empty markdown file: {md_path.name}")
+            logger.warning("Empty markdown file: %s", name)
             return {1: ""}
 
         # Split on h1 (# ) or h2 (## ) headers
@@ -246,7 +267,7 @@ class DocumentExtractor:
 
         return page_texts
 
-    def _extract_json(self, json_path: Path) -> Dict[int, str]:
+    def _extract_json(self, stream: BinaryIO, name: str) -> Dict[int, str]:
         """
         Extract text from JSON file.
 
@@ -256,14 +277,9 @@ class DocumentExtractor:
         import json
 
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except UnicodeDecodeError:
-            logger.warning(f"UTF-8 decoding failed for {json_path.name}, trying latin-1")
-            with open(json_path, 'r', encoding='latin-1') as f:
-                data = json.load(f)
+            data = json.loads(self._decode(stream.read(), name))
         except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in {json_path.name}: {e}")
+            logger.error("Invalid JSON in %s: %s", name, e)
             raise Exception(f"Failed to parse JSON file: {e}")
 
         page_texts = {}
@@ -316,5 +332,20 @@ class DocumentExtractor:
             page_texts = self.extract_text(file_path)
             return len(page_texts)
         except Exception as e:
-            logger.error(f"Failed to get page count for {file_path.name}: {e}")
+            logger.error("Failed to get page count for %s: %s", file_path.name, e)
             return 0
+
+
+def extract_document(file_path: Path, filename: str) -> Dict[int, str]:
+    """
+    Extract text from a file (module-level so it can run in a worker process).
+
+    Args:
+        file_path: Path to the document file
+        filename: Original filename (selects the format and names it in logs)
+
+    Returns:
+        Dictionary mapping page/section numbers (1-indexed) to extracted text
+    """
+    with open(file_path, 'rb') as f:
+        return DocumentExtractor().extract_stream(f, filename)
@@ -1,35 +1,230 @@
 """Embedding service using sentence-transformers."""
 
-from typing import List
+from pathlib import Path
+from typing import Callable, List, Optional
 import logging
+import os
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 
+from config import settings
+
 logger = logging.getLogger(__name__)
 
+# Dynamic int8 quantization config (VNNI dot products on modern x86 CPUs)
+ONNX_QUANTIZATION_CONFIG = "avx512_vnni"
+ONNX_QUANTIZED_FILE = f"onnx/model_qint8_{ONNX_QUANTIZATION_CONFIG}.onnx"
+
+TORCH_DTYPES = {
+    "fp16": torch.float16,
+    "bf16": torch.bfloat16,
+}
+
+_torch_configured = False
+
+
+def configure_torch_threads():
+    """
+    Apply the configured PyTorch thread pools (once per process).
+
+    The settings are process-wide, so they apply to every encode() call made
+    while indexing documents and answering searches.
+    """
+    global _torch_configured
+    if _torch_configured:
+        return
+    _torch_configured = True
+
+    num_threads = settings.torch_threads or os.cpu_count()
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(settings.torch_interop_threads)
+    except RuntimeError as e:
+        # Only allowed before any inter-op parallel work has started
+        logger.warning("Could not set torch inter-op threads: %s", e)
+    logger.info(
+        "Torch threads: %s intra-op, %s inter-op",
+        torch.get_num_threads(), torch.get_num_interop_threads(),
+    )
+
 
 class EmbeddingService:
     """Generates embeddings using sentence-transformers models."""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        backend: Optional[str] = None,
+        quantize: Optional[bool] = None,
+    ):
         """
         Initialize the embedding service.
 
         Args:
             model_name: Name of the sentence-transformers model to use
+            backend: "torch" or "onnx" (defaults to settings.embedding_backend)
+            quantize: Use a dynamically int8-quantized ONNX model
+                (defaults to settings.embedding_quantize, ONNX backend only)
         """
         self.model_name = model_name
-        logger.info(f"Loading embedding model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+        self.backend = (backend or settings.embedding_backend).lower()
+        self.quantize = settings.embedding_quantize if quantize is None else quantize
+        self.device = "cuda" if settings.use_gpu and torch.cuda.is_available() else "cpu"
+        configure_torch_threads()
+        logger.info("Loading embedding model: %s (backend: %s, device: %s)", model_name, self.backend, self.device)
+        self.model = self._load_model()
+        self._apply_dtype(settings.embedding_dtype.lower())
         self.embedding_dim = self.model.get_sentence_embedding_dimension()
-        logger.info(f"Model loaded. Embedding dimension: {self.embedding_dim}")
+        logger.info("Model loaded. Embedding dimension: %s", self.embedding_dim)
+
+    def _load_model(self) -> SentenceTransformer:
+        """
+        Load the model with the configured backend, falling back to PyTorch.
+
+        Returns:
+            SentenceTransformer instance
+        """
+        if self.backend != "onnx":
+            return SentenceTransformer(self.model_name, device=self.device)
+
+        try:
+            model = self._load_onnx_model()
+        except Exception as e:
+            # ONNX support needs the optional optimum[onnxruntime] dependency
+            logger.warning("ONNX backend unavailable for %s, using torch: %s", self.model_name, e)
+            self.backend = "torch"
+            return SentenceTransformer(self.model_name, device=self.device)
+
+        providers = getattr(model[0].auto_model, "providers", None)
+        logger.info("ONNX Runtime execution providers: %s", providers)
+        return model
+
+    def _load_onnx_model(self) -> SentenceTransformer:
+        """
+        Load the ONNX model variant selected by the settings.
+
+        int8 quantization takes precedence over graph optimization; if the
+        optimized export fails the unmodified ONNX model is used.
+
+        Returns:
+            SentenceTransformer instance using ONNX Runtime
+        """
+        from sentence_transformers import (
+            export_dynamic_quantized_onnx_model,
+            export_optimized_onnx_model,
+        )
+
+        if self.quantize:
+            return self._load_exported_onnx_model(
+                ONNX_QUANTIZED_FILE,
+                lambda model, path: export_dynamic_quantized_onnx_model(model, ONNX_QUANTIZATION_CONFIG, path),
+            )
+
+        level = settings.embedding_onnx_optimization.upper()
+        if level != "NONE":
+            try:
+                return self._load_exported_onnx_model(
+                    f"onnx/model_{level}.onnx",
+                    lambda model, path: export_optimized_onnx_model(model, level, path),
+                )
+            except Exception as e:
+                logger.warning("Could not optimize ONNX model (%s), using unoptimized graph: %s", level, e)
+
+        return SentenceTransformer(
+            self.model_name, backend="onnx", model_kwargs=self._onnx_model_kwargs()
+        )
+
+    def _load_exported_onnx_model(
+        self, file_name: str, export: Callable[[SentenceTransformer, str], None]
+    ) -> SentenceTransformer:
+        """
+        Load an ONNX model variant from the data directory, exporting it on first use.
+
+        Args:
+            file_name: ONNX file inside the export directory
+            export: Function writing the variant for a loaded model into a directory
+
+        Returns:
+            SentenceTransformer instance using the exported ONNX model
+        """
+        export_dir = settings.data_dir / "models" / f"{Path(self.model_name).name}-onnx"
+        if not (export_dir / file_name).exists():
+            logger.info("Exporting %s to %s", file_name, export_dir)
+            model = SentenceTransformer(self.model_name, backend="onnx")
+            model.save(str(export_dir))
+            export(model, str(export_dir))
+
+        return SentenceTransformer(
+            str(export_dir),
+            backend="onnx",
+            model_kwargs=self._onnx_model_kwargs(file_name),
+        )
+
+    @staticmethod
+    def _onnx_model_kwargs(file_name: Optional[str] = None) -> dict:
+        """
+        Build ONNX Runtime session arguments.
+
+        Uses the CUDA execution provider when enabled and onnxruntime-gpu can see a GPU,
+        full graph optimization, and the configured thread count.
+
+        Args:
+            file_name: ONNX file to load (None for the default model.onnx)
+
+        Returns:
+            model_kwargs for SentenceTransformer
+        """
+        import onnxruntime as ort
+
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session_options.intra_op_num_threads = settings.torch_threads or os.cpu_count()
+
+        if settings.use_gpu and "CUDAExecutionProvider" in ort.get_available_providers():
+            provider = "CUDAExecutionProvider"
+        else:
+            provider = "CPUExecutionProvider"
+
+        model_kwargs = {"provider": provider, "session_options": session_options}
+        if file_name:
+            model_kwargs["file_name"] = file_name
+        return model_kwargs
+
+    def _apply_dtype(self, dtype: str):
+        """
+        Cast the model weights to reduced precision if configured.
+
+        FP16 is only used on CUDA devices (CPU kernels are slow or missing);
+        BF16 works on both GPUs and CPUs with native BF16 support.
+
+        Args:
+            dtype: "fp32", "fp16" or "bf16"
+        """
+        if dtype == "fp32" or self.backend != "torch":
+            return
+        if dtype not in TORCH_DTYPES:
+            logger.warning("Unknown embedding dtype '%s', using fp32", dtype)
+            return
+        if dtype == "fp16" and self.model.device.type != "cuda":
+            logger.warning("fp16 embeddings require a CUDA device, using fp32")
+            return
+
+        self.model.to(TORCH_DTYPES[dtype])
+        logger.info("Embedding model weights cast to %s", dtype)
+
+    def warmup(self):
+        """Run a throwaway batch so kernel selection happens before the first request."""
+        self.embed_texts(["warmup"] * 8, batch_size=8)
+        logger.info("Embedding model %s warmed up", self.model_name)
 
-    def embed_texts(self, texts: List[str]) -> np.ndarray:
+    def embed_texts(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
         """
-        Generate embeddings for a list of texts.
+        Generate L2-normalized embeddings for a list of texts.
 
         Args:
             texts: List of text strings to embed
+            batch_size: Number of texts per forward pass (defaults to settings.embed_batch_size)
 
         Returns:
             NumPy array of shape (len(texts), embedding_dim)
@@ -37,11 +232,13 @@ class EmbeddingService:
         if not texts:
             return np.array([]).reshape(0, self.embedding_dim)
 
-        logger.debug(f"Generating embeddings for {len(texts)} texts")
+        logger.debug("Generating embeddings for %s texts", len(texts))
         embeddings = self.model.encode(
             texts,
+            batch_size=batch_size or settings.embed_batch_size,
             show_progress_bar=False,
             convert_to_numpy=True,
+            normalize_embeddings=True,
         )
 
         return embeddings
@@ -56,7 +253,7 @@ class EmbeddingService:
         Returns:
             NumPy array of shape (embedding_dim,)
         """
-        logger.debug(f"Generating embedding for query: {query[:50]}...")
+        logger.debug("Generating embedding for query: %s...", query[:50])
         embedding = self.model.encode(
             query,
             show_progress_bar=False,
@@ -0,0 +1,439 @@
+"""FAISS index construction shared by the vector stores.
+
+Small collections use an exact flat inner-product index. Once a collection
+reaches settings.hnsw_min_vectors it is rebuilt as an approximate index:
+an HNSW graph (roughly logarithmic query time) or, for very large
+collections, an inverted file (IVF) that only scans the settings.ivf_nprobe
+closest of ~sqrt(N) clusters per query. settings.index_type selects the
+family; "auto" uses HNSW up to settings.ivf_min_vectors and IVF beyond.
+
+Large indexes can optionally store compressed vectors
+(settings.index_quantization): "sq8" keeps one byte per dimension, "pq"
+stores product-quantized codes (one byte per 8 dimensions). Both need
+training data, so they are only used when building from existing
+embeddings. Searches over compressed indexes fetch extra candidates and
+rescore them against the full-precision embeddings the stores keep, so
+quantization shrinks the index but not the float32 copy held in memory
+and in embeddings.npy.
+
+Deleting a document does not rebuild the index. Flat and PQ indexes drop
+the vectors in place and renumber the rest. IVF indexes drop them but keep
+the remaining labels. HNSW graphs cannot drop vectors, so the deleted
+labels become tombstones that searches skip, and the graph is rebuilt once
+they pile up. The stores keep the sorted array of labels that are no
+longer live ("removed"), which maps index labels to row positions.
+"""
+
+from typing import Optional, Tuple
+import logging
+import math
+import platform
+import numpy as np
+import faiss
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on vectors used to train quantizers
+MAX_TRAINING_VECTORS = 10_000
+
+# Dimensions per product-quantizer sub-vector (one 8-bit code each)
+PQ_DIMS_PER_CODE = 8
+
+# FAISS recommends at least 39 training points per centroid (256 per 8-bit code)
+MIN_TRAINING_POINTS_PER_CENTROID = 39
+PQ_MIN_TRAINING_VECTORS = MIN_TRAINING_POINTS_PER_CENTROID * 256
+
+# Index families in upgrade order; collections only move to a later one
+INDEX_KINDS = ("flat", "hnsw", "ivf")
+
+# HNSW graphs are rebuilt once tombstones make up this fraction of their vectors
+TOMBSTONE_REBUILD_FRACTION = 0.2
+
+NO_REMOVED_IDS = np.empty(0, dtype=np.int64)
+
+
+def _faiss_classes(*names: str) -> tuple:
+    """FAISS classes that exist in the installed build (GPU classes are missing from faiss-cpu)."""
+    return tuple(getattr(faiss, name) for name in names if hasattr(faiss, name))
+
+
+GPU_INDEX_CLASSES = _faiss_classes("GpuIndex")
+GPU_FLAT_CLASSES = _faiss_classes("GpuIndexFlat")
+GPU_IVF_CLASSES = _faiss_classes("GpuIndexIVF")
+GPU_IVF_FLAT_CLASSES = _faiss_classes("GpuIndexIVFFlat")
+
+# Shared GPU memory/stream pool, created on first use
+_gpu_resources = None
+
+
+def log_simd_support():
+    """
+    Log which SIMD kernels the loaded FAISS build uses for distance computations.
+
+    Recent faiss-cpu wheels pick an AVX2/AVX-512 variant at import time. A
+    generic build on x86 falls back to SSE kernels, which makes flat and
+    HNSW search noticeably slower, so that case is logged as a warning.
+    """
+    options = faiss.get_compile_options().split()
+    logger.info("FAISS %s compile options: %s", faiss.__version__, " ".join(options) or "none")
+
+    is_x86 = platform.machine().lower() in ("x86_64", "amd64")
+    if is_x86 and not {"AVX2", "AVX512", "DD"} & set(options):
+        logger.warning(
+            "FAISS was built without AVX2/AVX-512 kernels; vector search will be slower. "
+            "Install a recent faiss-cpu wheel or an AVX2 build from conda."
+        )
+
+
+def _target_kind(num_vectors: int) -> str:
+    """Index family ("flat", "hnsw" or "ivf") for a collection of this size."""
+    if settings.hnsw_min_vectors <= 0 or num_vectors < settings.hnsw_min_vectors:
+        return "flat"
+
+    index_type = settings.index_type.lower()
+    if index_type == "auto":
+        return "ivf" if num_vectors >= settings.ivf_min_vectors else "hnsw"
+    return "ivf" if index_type == "ivf" else "hnsw"
+
+
+def _index_kind(index: faiss.Index) -> str:
+    """Index family of an existing index."""
+    if isinstance(index, (faiss.IndexFlat,) + GPU_FLAT_CLASSES):
+        return "flat"
+    if isinstance(index, (faiss.IndexIVF,) + GPU_IVF_CLASSES):
+        return "ivf"
+    return "hnsw"  # HNSW variants and the brute-force PQ index
+
+
+def _gpu_available() -> bool:
+    """Whether indexes should be moved to a GPU."""
+    return settings.use_gpu and bool(GPU_INDEX_CLASSES) and faiss.get_num_gpus() > 0
+
+
+def to_device(index: faiss.Index) -> faiss.Index:
+    """
+    Move an index to the GPU when settings.use_gpu is on and faiss-gpu sees a device.
+
+    Flat and IVF indexes have GPU implementations; HNSW and plain PQ
+    indexes stay on the CPU.
+
+    Args:
+        index: CPU index
+
+    Returns:
+        GPU copy of the index, or the index itself
+    """
+    global _gpu_resources
+    if not _gpu_available() or not isinstance(index, (faiss.IndexFlat, faiss.IndexIVF)):
+        return index
+
+    if _gpu_resources is None:
+        _gpu_resources = faiss.StandardGpuResources()
+    try:
+        return faiss.index_cpu_to_gpu(_gpu_resources, 0, index)
+    except RuntimeError as e:
+        logger.warning("Keeping %s on the CPU: %s", type(index).__name__, e)
+        return index
+
+
+def to_cpu(index: faiss.Index) -> faiss.Index:
+    """Return a CPU copy of a GPU index (needed for writing it to disk)."""
+    if GPU_INDEX_CLASSES and isinstance(index, GPU_INDEX_CLASSES):
+        return faiss.index_gpu_to_cpu(index)
+    return index
+
+
+def create_index(embedding_dim: int, num_vectors: int = 0) -> faiss.Index:
+    """
+    Create an empty index suited to a collection of the given size.
+
+    Vectors must be L2 normalized before adding, so inner product equals
+    cosine similarity for every index type. IVF indexes need training data,
+    so an HNSW index is returned where IVF would be chosen.
+
+    Args:
+        embedding_dim: Dimension of embedding vectors
+        num_vectors: Number of vectors the index will hold
+
+    Returns:
+        Empty FAISS index
+    """
+    if _target_kind(num_vectors) == "flat":
+        return to_device(faiss.IndexFlatIP(embedding_dim))
+
+    index = faiss.IndexHNSWFlat(embedding_dim, settings.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = settings.hnsw_ef_construction
+    index.hnsw.efSearch = settings.hnsw_ef_search
+    return index
+
+
+def _create_ivf_index(embedding_dim: int, num_vectors: int) -> faiss.Index:
+    """Create an untrained IVF index with ~sqrt(N) lists."""
+    nlist = max(1, int(math.sqrt(num_vectors)))
+    quantization = settings.index_quantization.lower()
+
+    if (quantization == "pq" and embedding_dim % PQ_DIMS_PER_CODE == 0
+            and num_vectors >= PQ_MIN_TRAINING_VECTORS):
+        encoding = f"PQ{embedding_dim // PQ_DIMS_PER_CODE}"
+    elif quantization in ("sq8", "pq"):
+        encoding = "SQ8"
+    else:
+        encoding = "Flat"
+
+    index = faiss.index_factory(embedding_dim, f"IVF{nlist},{encoding}", faiss.METRIC_INNER_PRODUCT)
+    faiss.extract_index_ivf(index).nprobe = settings.ivf_nprobe
+    return index
+
+
+def _create_quantized_index(embedding_dim: int, num_vectors: int) -> Optional[faiss.Index]:
+    """Create an untrained compressed index, or None if quantization is off."""
+    quantization = settings.index_quantization.lower()
+
+    if quantization == "pq":
+        if embedding_dim % PQ_DIMS_PER_CODE == 0 and num_vectors >= PQ_MIN_TRAINING_VECTORS:
+            return faiss.IndexPQ(
+                embedding_dim, embedding_dim // PQ_DIMS_PER_CODE, 8, faiss.METRIC_INNER_PRODUCT
+            )
+        # Too few vectors to train codebooks (or odd dimension): scalar quantize instead
+        logger.info("Using sq8 instead of pq for %s vectors of dimension %s", num_vectors, embedding_dim)
+
+    if quantization in ("sq8", "pq"):
+        index = faiss.IndexHNSWSQ(
+            embedding_dim, faiss.ScalarQuantizer.QT_8bit, settings.hnsw_m, faiss.METRIC_INNER_PRODUCT
+        )
+        index.hnsw.efConstruction = settings.hnsw_ef_construction
+        index.hnsw.efSearch = settings.hnsw_ef_search
+        return index
+
+    return None
+
+
+def build_index(embeddings: Optional[np.ndarray], embedding_dim: int) -> faiss.Index:
+    """
+    Build an index containing the given (normalized) embeddings.
+
+    Args:
+        embeddings: Array of shape (n, embedding_dim), or None for an empty index
+        embedding_dim: Dimension of embedding vectors
+
+    Returns:
+        Populated FAISS index
+    """
+    num_vectors = 0 if embeddings is None else len(embeddings)
+    kind = _target_kind(num_vectors)
+
+    if kind == "ivf":
+        index = _create_ivf_index(embedding_dim, num_vectors)
+    elif kind == "hnsw":
+        index = _create_quantized_index(embedding_dim, num_vectors)
+    else:
+        index = None
+
+    if index is not None:
+        # Train on an evenly spaced sample of the collection (IVF needs ~39 points per list)
+        nlist = index.nlist if isinstance(index, faiss.IndexIVF) else 0
+        sample_size = max(MAX_TRAINING_VECTORS, MIN_TRAINING_POINTS_PER_CENTROID * nlist)
+        step = max(1, num_vectors // sample_size)
+        index.train(embeddings[::step][:sample_size])
+    else:
+        index = create_index(embedding_dim, num_vectors)
+
+    if num_vectors > 0:
+        index.add(embeddings)
+    return to_device(index)
+
+
+def _is_compressed(index: faiss.Index) -> bool:
+    """Whether the index scores queries against quantized vectors."""
+    if isinstance(index, faiss.IndexHNSW):
+        return not isinstance(faiss.downcast_index(index.storage), faiss.IndexFlat)
+    if isinstance(index, (faiss.IndexIVF,) + GPU_IVF_CLASSES):
+        return not isinstance(index, (faiss.IndexIVFFlat,) + GPU_IVF_FLAT_CLASSES)
+    return not isinstance(index, (faiss.IndexFlat,) + GPU_FLAT_CLASSES)
+
+
+def search(
+    index: faiss.Index,
+    embeddings: Optional[np.ndarray],
+    query: np.ndarray,
+    top_k: int,
+    removed: np.ndarray = NO_REMOVED_IDS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Search an index, rescoring compressed-index candidates in FP32.
+
+    Quantized indexes rank by approximate scores, so they are asked for
+    settings.rescore_oversample times as many candidates, which are then
+    re-ranked by exact inner product with the stored embeddings.
+
+    Args:
+        index: Index to search
+        embeddings: Full-precision vectors in row order (None skips rescoring)
+        query: Normalized query of shape (1, embedding_dim)
+        top_k: Number of results to return
+        removed: Sorted labels deleted from the index since it was built
+
+    Returns:
+        Tuple of (similarities, row positions), each of shape (1, k)
+    """
+    num_live = live_count(index, removed)
+    k = min(top_k, num_live)
+    if k <= 0:
+        return np.empty((1, 0), dtype=np.float32), np.empty((1, 0), dtype=np.int64)
+
+    params = None
+    if len(removed) and isinstance(index, faiss.IndexHNSW):
+        # Skip tombstones inside the graph walk (the selectors must outlive the search)
+        removed_selector = faiss.IDSelectorBatch(removed)
+        live_selector = faiss.IDSelectorNot(removed_selector)
+        params = faiss.SearchParametersHNSW()
+        params.efSearch = index.hnsw.efSearch
+        params.sel = live_selector
+
+    oversample = settings.rescore_oversample
+    if (oversample <= 1 or embeddings is None or len(embeddings) != num_live
+            or not _is_compressed(index)):
+        similarities, labels = index.search(query, k, params=params)
+        return similarities, labels_to_positions(labels, removed)
+
+    _, labels = index.search(query, min(k * oversample, num_live), params=params)
+    candidates = labels_to_positions(labels, removed)[0]
+    candidates = candidates[candidates >= 0]
+    exact = embeddings[candidates] @ query[0]
+    order = np.argsort(-exact)[:k]
+    return exact[order][np.newaxis, :], candidates[order][np.newaxis, :]
+
+
+def live_count(index: faiss.Index, removed: np.ndarray = NO_REMOVED_IDS) -> int:
+    """Number of searchable vectors in an index (tombstones excluded)."""
+    if isinstance(index, faiss.IndexHNSW):
+        return index.ntotal - len(removed)
+    return index.ntotal
+
+
+def labels_to_positions(labels: np.ndarray, removed: np.ndarray) -> np.ndarray:
+    """Map index labels to row positions (every removed label below shifts a row down)."""
+    if not len(removed):
+        return labels
+    return np.where(labels >= 0, labels - np.searchsorted(removed, labels), labels)
+
+
+def positions_to_labels(positions: np.ndarray, removed: np.ndarray) -> np.ndarray:
+    """Map row positions to index labels (the inverse of labels_to_positions)."""
+    if not len(removed):
+        return positions
+    # removed[j] - j live labels precede the j-th removed label
+    return positions + np.searchsorted(removed - np.arange(len(removed)), positions, side="right")
+
+
+def add(index: faiss.Index, vectors: np.ndarray, removed: np.ndarray = NO_REMOVED_IDS):
+    """
+    Add normalized vectors, labelled after every label issued so far.
+
+    Args:
+        index: Index to add to
+        vectors: Array of shape (n, embedding_dim)
+        removed: Sorted labels deleted from the index since it was built
+    """
+    if len(removed) and isinstance(index, faiss.IndexIVF):
+        # IVF removals shrink ntotal without freeing their labels
+        start = index.ntotal + len(removed)
+        index.add_with_ids(vectors, np.arange(start, start + len(vectors), dtype=np.int64))
+    else:
+        index.add(vectors)
+
+
+def remove(
+    index: faiss.Index,
+    positions: np.ndarray,
+    removed: np.ndarray,
+    embeddings: Optional[np.ndarray],
+    embedding_dim: int,
+) -> Tuple[faiss.Index, np.ndarray]:
+    """
+    Delete vectors from an index without rebuilding it where possible.
+
+    Args:
+        index: Index to delete from
+        positions: Row positions of the vectors to delete
+        removed: Sorted labels deleted from the index since it was built
+        embeddings: Remaining vectors in row order (used by GPU indexes,
+            which are rebuilt instead)
+        embedding_dim: Dimension of embedding vectors
+
+    Returns:
+        Tuple of (index, removed labels) to use from now on
+    """
+    labels = positions_to_labels(np.asarray(positions, dtype=np.int64), removed)
+
+    if GPU_INDEX_CLASSES and isinstance(index, GPU_INDEX_CLASSES):
+        # GPU indexes support neither removal nor selectors; rebuilding them is fast
+        return build_index(embeddings, embedding_dim), NO_REMOVED_IDS
+
+    if isinstance(index, faiss.IndexFlatCodes):
+        # Flat and PQ storage is compacted, so labels stay equal to positions
+        index.remove_ids(faiss.IDSelectorBatch(labels))
+        return index, removed
+
+    if isinstance(index, faiss.IndexIVF):
+        index.remove_ids(faiss.IDSelectorBatch(labels))
+    # HNSW keeps the vectors; searches skip them until the next rebuild
+    return index, np.union1d(removed, labels)
+
+
+def needs_rebuild(index: faiss.Index, removed: np.ndarray) -> bool:
+    """Whether an HNSW graph carries enough tombstones to be worth rebuilding."""
+    return (
+        isinstance(index, faiss.IndexHNSW)
+        and len(removed) > 0
+        and len(removed) >= TOMBSTONE_REBUILD_FRACTION * index.ntotal
+    )
+
+
+def needs_upgrade(
+    index: faiss.Index,
+    embeddings: Optional[np.ndarray],
+    removed: np.ndarray = NO_REMOVED_IDS,
+) -> bool:
+    """Whether the collection has outgrown the index family (see maybe_upgrade)."""
+    if embeddings is None or len(embeddings) != live_count(index, removed):
+        return False
+    target = _target_kind(len(embeddings))
+    return INDEX_KINDS.index(target) > INDEX_KINDS.index(_index_kind(index))
+
+
+def prepare_loaded_index(index: faiss.Index) -> faiss.Index:
+    """Apply runtime search parameters to an index read from disk."""
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = settings.hnsw_ef_search
+    elif isinstance(index, faiss.IndexIVF):
+        index.nprobe = settings.ivf_nprobe
+    return to_device(index)
+
+
+def maybe_upgrade(
+    index: faiss.Index,
+    embeddings: Optional[np.ndarray],
+    embedding_dim: int,
+    removed: np.ndarray = NO_REMOVED_IDS,
+) -> faiss.Index:
+    """
+    Rebuild the index as a more scalable type once the collection crosses a threshold.
+
+    Args:
+        index: Current index
+        embeddings: All live vectors in row order
+        embedding_dim: Dimension of embedding vectors
+        removed: Sorted labels deleted from the index since it was built
+
+    Returns:
+        The original index, or a rebuilt HNSW/IVF index (with no removed labels)
+    """
+    if not needs_upgrade(index, embeddings, removed):
+        return index
+
+    target = _target_kind(len(embeddings))
+    logger.info("Collection reached %s vectors, rebuilding as a %s index", len(embeddings), target)
+    return build_index(embeddings, embedding_dim)
@@ -7,6 +7,7 @@ Each collection has its own:
 """
 
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, Optional
 
@@ -14,9 +15,8 @@ from services.collection_service import collection_service
 from services.document_extractor import DocumentExtractor
 from services.chunker import TextChunker
 from services.embedder import EmbeddingService
-from services.vector_store import VectorStore
-from services.vector_store_v2 import VectorStoreV2
 from services.indexing import DocumentIndexer
+from services.semantic_cache import SemanticCache
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -28,7 +28,14 @@ class IndexerManager:
     def __init__(self):
         """Initialize the indexer manager."""
         self._indexers: Dict[str, DocumentIndexer] = {}
+        # Guards _indexers. Each collection also gets its own creation lock, so
+        # concurrent first requests build a single indexer while other
+        # collections still load in parallel.
+        self._indexers_lock = threading.Lock()
+        self._creation_locks: Dict[str, threading.Lock] = {}
         self._embedding_services: Dict[str, EmbeddingService] = {}
+        # Guards _embedding_services; models are warmed from several threads
+        self._embedding_services_lock = threading.Lock()
         self._document_extractor = DocumentExtractor()
 
     def get_indexer(self, collection_id: str = "default") -> DocumentIndexer:
@@ -40,20 +47,58 @@ class IndexerManager:
         Returns:
             DocumentIndexer instance for the collection
         """
-        if collection_id in self._indexers:
-            return self._indexers[collection_id]
+        with self._indexers_lock:
+            indexer = self._indexers.get(collection_id)
+            if indexer is not None:
+                return indexer
+            creation_lock = self._creation_locks.setdefault(collection_id, threading.Lock())
+
+        with creation_lock:
+            # Another thread may have finished creating it while we waited
+            with self._indexers_lock:
+                indexer = self._indexers.get(collection_id)
+            if indexer is not None:
+                return indexer
 
-        # Get collection settings
-        collection = collection_service.get_collection(collection_id)
-        if not collection:
-            raise ValueError(f"Collection '{collection_id}' not found")
+            try:
+                # Get collection settings
+                collection = collection_service.get_collection(collection_id)
+                if not collection:
+                    raise ValueError(f"Collection '{collection_id}' not found")
+
+                # Create indexer for this collection
+                indexer = self._create_indexer(collection)
+                with self._indexers_lock:
+                    # Never replace one that requests may already be using
+                    indexer = self._indexers.setdefault(collection_id, indexer)
+            finally:
+                with self._indexers_lock:
+                    self._creation_locks.pop(collection_id, None)
+
+        logger.info("Created indexer for collection '%s'", collection_id)
+        return indexer
 
-        # Create indexer for this collection
-        indexer = self._create_indexer(collection)
-        self._indexers[collection_id] = indexer
+    def get_embedding_service(self, model_name: str) -> EmbeddingService:
+        """Get the shared embedding service for a model, loading it on first use.
 
-        logger.info(f"Created indexer for collection '{collection_id}'")
-        return indexer
+        Args:
+            model_name: Sentence-transformers model name
+
+        Returns:
+            EmbeddingService instance shared by every user of the model
+        """
+        with self._embedding_services_lock:
+            service = self._embedding_services.get(model_name)
+            if service is not None:
+                return service
+
+        # Load outside the lock so other models can load concurrently. If two
+        # threads race on the same model, the first one stored wins.
+        logger.info("Loading embedding model: %s", model_name)
+        service = EmbeddingService(model_name=model_name)
+
+        with self._embedding_services_lock:
+            return self._embedding_services.setdefault(model_name, service)
 
     def _create_indexer(self, collection: dict) -> DocumentIndexer:
         """Create a DocumentIndexer for a collection.
@@ -69,24 +114,20 @@ class IndexerManager:
         chunk_size = collection.get("chunk_size", settings.chunk_size)
         chunk_overlap = collection.get("chunk_overlap", settings.chunk_overlap)
 
-        # Get or create embedding service for this model
-        if embedding_model not in self._embedding_services:
-            logger.info(f"Loading embedding model: {embedding_model}")
-            self._embedding_services[embedding_model] = EmbeddingService(
-                model_name=embedding_model
-            )
-        embedding_service = self._embedding_services[embedding_model]
+        embedding_service = self.get_embedding_service(embedding_model)
 
         # Get paths for this collection
         indexes_dir = collection_service.get_indexes_path(collection_id)
 
-        # Create vector store
+        # Create vector store (only the configured backend is imported)
         if settings.metadata_storage.lower() == "sqlite":
+            from services.vector_store_v2 import VectorStoreV2
             vector_store = VectorStoreV2(
                 index_dir=indexes_dir,
                 embedding_dim=embedding_service.embedding_dim,
             )
         else:
+            from services.vector_store import VectorStore
             vector_store = VectorStore(
                 index_dir=indexes_dir,
                 embedding_dim=embedding_service.embedding_dim,
@@ -98,12 +139,24 @@ class IndexerManager:
             chunk_overlap=chunk_overlap,
         )
 
+        # Create semantic query cache (disabled when size is 0)
+        semantic_cache = None
+        if settings.semantic_cache_size > 0:
+            semantic_cache = SemanticCache(
+                embedding_dim=embedding_service.embedding_dim,
+                max_entries=settings.semantic_cache_size,
+                threshold=settings.semantic_cache_threshold,
+            )
+
         # Create indexer
         return DocumentIndexer(
             vector_store=vector_store,
             embedding_service=embedding_service,
             document_extractor=self._document_extractor,
             text_chunker=text_chunker,
+            semantic_cache=semantic_cache,
+            flush_interval=settings.flush_interval_s,
+            flush_max_pending=settings.flush_max_pending,
         )
 
     def reload_indexer(self, collection_id: str = "default"):
@@ -112,9 +165,11 @@ class IndexerManager:
         Args:
             collection_id: Collection ID
         """
-        if collection_id in self._indexers:
-            self._indexers[collection_id].vector_store.load()
-            logger.info(f"Reloaded indexer for collection '{collection_id}'")
+        with self._indexers_lock:
+            indexer = self._indexers.get(collection_id)
+        if indexer is not None:
+            indexer.reload_index()
+            logger.info("Reloaded indexer for collection '%s'", collection_id)
 
     def invalidate_indexer(self, collection_id: str):
         """Remove a cached indexer (e.g., after settings change).
@@ -122,11 +177,14 @@ class IndexerManager:
         Args:
             collection_id: Collection ID
         """
-        if collection_id in self._indexers:
-            # Save before removing
-            self._indexers[collection_id].save_index()
-            del self._indexers[collection_id]
-            logger.info(f"Invalidated indexer for collection '{collection_id}'")
+        with self._indexers_lock:
+            indexer = self._indexers.get(collection_id)
+        if indexer is not None:
+            # Save before removing, so a replacement loads the latest state
+            indexer.save_index()
+            with self._indexers_lock:
+                self._indexers.pop(collection_id, None)
+            logger.info("Invalidated indexer for collection '%s'", collection_id)
 
     def remove_indexer(self, collection_id: str):
         """Remove a cached indexer without saving (e.g., after collection deletion).
@@ -134,18 +192,24 @@ class IndexerManager:
         Args:
             collection_id: Collection ID
         """
-        if collection_id in self._indexers:
-            del self._indexers[collection_id]
-            logger.info(f"Removed indexer for deleted collection '{collection_id}'")
+        with self._indexers_lock:
+            indexer = self._indexers.pop(collection_id, None)
+        if indexer is not None:
+            indexer.discard_pending_flush()
+            logger.info("Removed indexer for deleted collection '%s'", collection_id)
 
     def save_all(self):
         """Save all indexers to disk."""
-        for collection_id, indexer in self._indexers.items():
+        with self._indexers_lock:
+            indexers = list(self._indexers.items())
+        for collection_id, indexer in indexers:
             try:
+                # The save below supersedes any scheduled write-behind flush
+                indexer.discard_pending_flush()
                 indexer.save_index()
-                logger.info(f"Saved index for collection '{collection_id}'")
+                logger.info("Saved index for collection '%s'", collection_id)
             except Exception as e:
-                logger.error(f"Failed to save index for '{collection_id}': {e}")
+                logger.error("Failed to save index for '%s': %s", collection_id, e)
 
     def get_documents_path(self, collection_id: str = "default") -> Path:
         """Get the documents directory for a collection.
@@ -190,7 +254,7 @@ class IndexerManager:
                 "total_pages": sum(d.get("total_pages", 0) or d.get("num_pages", 0) for d in documents),
             }
         except Exception as e:
-            logger.error(f"Failed to get stats for '{collection_id}': {e}")
+            logger.error("Failed to get stats for '%s': %s", collection_id, e)
             return {
                 "collection_id": collection_id,
                 "total_documents": 0,
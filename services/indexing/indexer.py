@@ -1,13 +1,17 @@
 """Document indexing orchestration service."""
 
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+import asyncio
 import hashlib
 import logging
+import threading
 from datetime import datetime
+import numpy as np
 
 from models.schemas import (
     DocumentMetadata,
+    ChunkMetadata,
     AIOptions,
     AIUsage,
     AIUsageDetail,
@@ -16,9 +20,13 @@ from services.document_extractor import DocumentExtractor
 from services.chunker import TextChunker
 from services.embedder import EmbeddingService
 from services.vector_store import VectorStore
+from services.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+# Attempts to swap in a rebuilt index before giving up until the next delete
+INDEX_REBUILD_ATTEMPTS = 3
+
 
 class DocumentIndexer:
     """Orchestrates the document indexing pipeline."""
@@ -29,6 +37,9 @@ class DocumentIndexer:
         embedding_service: EmbeddingService,
         document_extractor: DocumentExtractor,
         text_chunker: TextChunker,
+        semantic_cache: Optional[SemanticCache] = None,
+        flush_interval: float = 1.0,
+        flush_max_pending: int = 0,
     ):
         """
         Initialize the document indexer.
@@ -38,11 +49,32 @@ class DocumentIndexer:
             embedding_service: Embedding service instance
             document_extractor: Document extractor instance (supports PDF, TXT, DOCX, CSV)
             text_chunker: Text chunker instance
+            semantic_cache: Optional cache of recent query results
+            flush_interval: Seconds to wait before persisting after mark_dirty()
+            flush_max_pending: Unsaved changes that trigger a save without waiting (0 = no limit)
         """
         self.vector_store = vector_store
         self.embedding_service = embedding_service
         self.document_extractor = document_extractor
         self.text_chunker = text_chunker
+        self.semantic_cache = semantic_cache
+
+        self.flush_interval = flush_interval
+        self.flush_max_pending = flush_max_pending
+
+        # Serializes vector store access so documents can be indexed from worker threads
+        self._lock = threading.Lock()
+        # Held while an index is rebuilt outside _lock (one rebuild at a time)
+        self._rebuild_lock = threading.Lock()
+
+        # Write-behind persistence state (see mark_dirty)
+        self._dirty = False
+        self._pending_changes = 0
+        self._flush_now = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+
+        if self.vector_store.out_of_sync:
+            self._resync_index()
 
     def index_document(self, document_path: Path, filename: str) -> DocumentMetadata:
         """
@@ -55,22 +87,77 @@ class DocumentIndexer:
         Returns:
             DocumentMetadata object
         """
-        logger.info(f"Indexing document: {filename}")
+        return self.add_prepared_documents([self.prepare_document(document_path, filename)])[0]
+
+    def prepare_document(
+        self, document_path: Path, filename: str, document_id: Optional[str] = None
+    ) -> Tuple[DocumentMetadata, List[ChunkMetadata]]:
+        """
+        Extract and chunk a document without embedding it.
+
+        Args:
+            document_path: Path to the document file
+            filename: Original filename
+            document_id: Precomputed content-hash ID (computed from the file if omitted)
+
+        Returns:
+            Tuple of (DocumentMetadata, chunks) ready for add_prepared_documents
+        """
+        logger.info("Indexing document: %s", filename)
 
         # Generate document ID from file content hash
-        document_id = self._generate_document_id(document_path)
+        if document_id is None:
+            document_id = self._generate_document_id(document_path)
 
         # Extract text from document
-        logger.debug(f"Extracting text from {filename}")
+        logger.debug("Extracting text from %s", filename)
         page_texts = self.document_extractor.extract_text(document_path)
+        return self.prepare_pages(page_texts, filename, document_id)
+
+    def prepare_document_stream(
+        self, stream: BinaryIO, filename: str, document_id: str
+    ) -> Tuple[DocumentMetadata, List[ChunkMetadata]]:
+        """
+        Extract and chunk a document from an open binary stream without embedding it.
+
+        Lets uploads be extracted straight from the request body instead of
+        re-reading the copy written to disk.
+
+        Args:
+            stream: Seekable binary file object positioned at the start
+            filename: Original filename (selects the extractor)
+            document_id: Content-hash ID of the document
+
+        Returns:
+            Tuple of (DocumentMetadata, chunks) ready for add_prepared_documents
+        """
+        logger.info("Indexing document: %s", filename)
+
+        page_texts = self.document_extractor.extract_stream(stream, filename)
+        return self.prepare_pages(page_texts, filename, document_id)
+
+    def prepare_pages(
+        self, page_texts: Dict[int, str], filename: str, document_id: str
+    ) -> Tuple[DocumentMetadata, List[ChunkMetadata]]:
+        """
+        Chunk already extracted page texts and build the document metadata.
+
+        Args:
+            page_texts: Mapping of page numbers to text
+            filename: Original filename
+            document_id: Document ID
+
+        Returns:
+            Tuple of (DocumentMetadata, chunks)
+        """
         num_pages = len(page_texts)
 
         if num_pages == 0:
-            logger.warning(f"No pages extracted from {filename}")
+            logger.warning("No pages extracted from %s", filename)
             raise ValueError(f"Could not extract any pages from {filename}")
 
         # Chunk the text
-        logger.debug(f"Chunking text from {filename}")
+        logger.debug("Chunking text from %s", filename)
         chunks = self.text_chunker.chunk_document(
             page_texts=page_texts,
             document_id=document_id,
@@ -79,19 +166,9 @@ class DocumentIndexer:
 
         num_chunks = len(chunks)
         if num_chunks == 0:
-            logger.warning(f"No chunks created from {filename}")
+            logger.warning("No chunks created from %s", filename)
             raise ValueError(f"Could not create any chunks from {filename}")
 
-        # Generate embeddings
-        logger.debug(f"Generating embeddings for {num_chunks} chunks")
-        chunk_texts = [chunk.text for chunk in chunks]
-        embeddings = self.embedding_service.embed_texts(chunk_texts)
-
-        # Add to vector store
-        logger.debug(f"Adding {num_chunks} chunks to vector store")
-        self.vector_store.add_chunks(chunks, embeddings)
-
-        # Create metadata
         metadata = DocumentMetadata(
             document_id=document_id,
             filename=filename,
@@ -99,9 +176,48 @@ class DocumentIndexer:
             total_chunks=num_chunks,
             indexed_at=datetime.utcnow().isoformat(),
         )
+        return metadata, chunks
+
+    def add_prepared_documents(
+        self, prepared: List[Tuple[DocumentMetadata, List[ChunkMetadata]]]
+    ) -> List[DocumentMetadata]:
+        """
+        Embed and store documents produced by prepare_document.
 
-        logger.info(f"Successfully indexed {filename}: {num_pages} pages, {num_chunks} chunks")
-        return metadata
+        All chunks are embedded in one call so the model sees full batches
+        instead of one short, partially filled batch per document.
+
+        Args:
+            prepared: List of (DocumentMetadata, chunks) tuples
+
+        Returns:
+            List of DocumentMetadata objects, in input order
+        """
+        all_chunks = [chunk for _, chunks in prepared for chunk in chunks]
+        if not all_chunks:
+            return []
+
+        # Generate embeddings (sentence-transformers length-sorts within the call)
+        logger.debug("Generating embeddings for %s chunks from %s documents", len(all_chunks), len(prepared))
+        embeddings = self.embedding_service.embed_texts([chunk.text for chunk in all_chunks])
+
+        # Add to vector store
+        logger.debug("Adding %s chunks to vector store", len(all_chunks))
+        with self._lock:
+            self.vector_store.add_chunks(all_chunks, embeddings)
+            rebuild = self.vector_store.needs_rebuild()
+        self._invalidate_cache()
+
+        # Crossing an index type threshold rebuilds outside the lock
+        if rebuild:
+            self._rebuild_index()
+
+        for metadata, _ in prepared:
+            logger.info(
+                "Successfully indexed %s: %s pages, %s chunks",
+                metadata.filename, metadata.total_pages, metadata.total_chunks,
+            )
+        return [metadata for metadata, _ in prepared]
 
     def search(
         self,
@@ -109,6 +225,7 @@ class DocumentIndexer:
         top_k: int = 10,
         ai_service=None,
         ai_options: Optional[AIOptions] = None,
+        query_embedding: Optional[np.ndarray] = None,
     ) -> dict:
         """
         Search for documents matching the query, with optional AI enhancements.
@@ -118,22 +235,42 @@ class DocumentIndexer:
             top_k: Number of results to return
             ai_service: Optional AIService instance (created from user's API key)
             ai_options: Optional AI feature flags
+            query_embedding: Precomputed query embedding (e.g. from a batched encode)
 
         Returns:
             Dict with 'results', and optionally 'enhanced_query', 'synthesis', 'ai_usage'
         """
-        logger.info(f"Searching for: {query[:100]}")
+        logger.info("Searching for: %s", query[:100])
 
         ai_active = ai_service and ai_options
         ai_usage = AIUsage() if ai_active else None
         synthesis = None
 
+        # Plain searches repeating a recent query reuse its results
+        use_cache = self.semantic_cache is not None and not ai_active
+        if use_cache:
+            cached = self.get_cached_results(query, top_k)
+            if cached is not None:
+                return cached
+
         # Step 1: Generate query embedding and search
-        query_embedding = self.embedding_service.embed_query(query)
+        if query_embedding is None:
+            query_embedding = self.embedding_service.embed_query(query)
+
+        # ...or a paraphrase of one
+        if use_cache:
+            cached = self.semantic_cache.get(query_embedding, variant=top_k)
+            if cached is not None:
+                logger.info("Found %s results (cached)", len(cached))
+                return self._cached_response(cached)
 
         # Fetch extra results if reranking (so the LLM has a bigger pool)
         fetch_k = min(top_k * 5, 50) if (ai_active and ai_options.rerank) else top_k
-        results = self.vector_store.search(query_embedding, top_k=fetch_k)
+        with self._lock:
+            results = self.vector_store.search(query_embedding, top_k=fetch_k)
+            # Changes clear the cache after releasing the lock, so a generation
+            # read here is bumped by any change this search did not see
+            cache_generation = self.semantic_cache.generation if use_cache else None
 
         # Step 3: Optionally rerank results
         if ai_active and ai_options.rerank and len(results) > 0:
@@ -163,7 +300,7 @@ class DocumentIndexer:
                 ]
                 results = [results[i] for i in valid_indices] if valid_indices else results[:top_k]
             except Exception as e:
-                logger.warning(f"Reranking failed, using original order: {e}")
+                logger.warning("Reranking failed, using original order: %s", e)
                 results = results[:top_k]
         else:
             results = results[:top_k]
@@ -189,9 +326,18 @@ class DocumentIndexer:
                     ai_usage.total_input_tokens += usage["input_tokens"]
                     ai_usage.total_output_tokens += usage["output_tokens"]
             except Exception as e:
-                logger.warning(f"Synthesis failed: {e}")
+                logger.warning("Synthesis failed: %s", e)
+
+        logger.info("Found %s results", len(results))
 
-        logger.info(f"Found {len(results)} results")
+        if use_cache:
+            self.semantic_cache.put(
+                query_embedding,
+                [r.model_copy() for r in results],
+                variant=top_k,
+                text=query,
+                generation=cache_generation,
+            )
 
         return {
             "results": results,
@@ -199,6 +345,64 @@ class DocumentIndexer:
             "ai_usage": ai_usage,
         }
 
+    def get_cached_results(self, query: str, top_k: int = 10) -> Optional[dict]:
+        """
+        Return cached results for an exact repeat of a recent plain search.
+
+        Needs no query embedding, so callers can check it before embedding.
+
+        Args:
+            query: Search query text
+            top_k: Number of results requested
+
+        Returns:
+            Search response dict (as returned by search()), or None on a miss
+        """
+        if self.semantic_cache is None:
+            return None
+        cached = self.semantic_cache.get_text(query, variant=top_k)
+        if cached is None:
+            return None
+        logger.info("Found %s results (cached)", len(cached))
+        return self._cached_response(cached)
+
+    @staticmethod
+    def _cached_response(cached: list) -> dict:
+        """Build a search response from cached results (copied, callers may mutate them)."""
+        return {
+            "results": [r.model_copy() for r in cached],
+            "synthesis": None,
+            "ai_usage": None,
+        }
+
+    def warmup(self, warm_model: bool = True):
+        """
+        Pay one-time model and index startup costs before serving requests.
+
+        Args:
+            warm_model: Also warm the embedding model (skip if it is shared
+                with an indexer that was already warmed)
+        """
+        if warm_model:
+            self.embedding_service.warmup()
+        probe = np.zeros((1, self.embedding_service.embedding_dim), dtype=np.float32)
+        with self._lock:
+            # Faults in the index pages and initializes the FAISS search path
+            self.vector_store.index.search(probe, 1)
+
+    def has_document(self, document_id: str) -> bool:
+        """
+        Check whether a document is already indexed.
+
+        Args:
+            document_id: Document ID (content hash)
+
+        Returns:
+            True if the index contains chunks for the document
+        """
+        with self._lock:
+            return self.vector_store.has_document(document_id)
+
     def list_documents(self) -> List[dict]:
         """
         List all indexed documents.
@@ -206,7 +410,42 @@ class DocumentIndexer:
         Returns:
             List of document metadata dictionaries
         """
-        return self.vector_store.list_documents()
+        with self._lock:
+            return self.vector_store.list_documents()
+
+    def iter_documents(self, batch_size: int = 500) -> Iterator[List[dict]]:
+        """
+        Yield indexed documents in batches, holding the lock only per batch.
+
+        Args:
+            batch_size: Documents per batch
+
+        Yields:
+            Lists of document metadata dictionaries
+        """
+        batches = self.vector_store.iter_documents(batch_size)
+        try:
+            while True:
+                with self._lock:
+                    batch = next(batches, None)
+                if batch is None:
+                    return
+                yield batch
+        finally:
+            batches.close()
+
+    def get_document(self, document_id: str) -> Optional[dict]:
+        """
+        Look up a single indexed document.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            Document metadata dictionary, or None if not indexed
+        """
+        with self._lock:
+            return self.vector_store.get_document(document_id)
 
     def delete_document(self, document_id: str) -> int:
         """
@@ -218,14 +457,142 @@ class DocumentIndexer:
         Returns:
             Number of chunks deleted
         """
-        logger.info(f"Deleting document: {document_id}")
-        num_deleted = self.vector_store.delete_document(document_id)
-        logger.info(f"Deleted {num_deleted} chunks")
+        logger.info("Deleting document: %s", document_id)
+        with self._lock:
+            num_deleted = self.vector_store.delete_document(document_id)
+            rebuild = self.vector_store.needs_rebuild()
+        self._invalidate_cache()
+        logger.info("Deleted %s chunks", num_deleted)
+
+        if rebuild:
+            self._rebuild_index()
         return num_deleted
 
+    def _rebuild_index(self):
+        """
+        Rebuild the vector index to purge deleted vectors or upgrade its type.
+
+        The new index is built from a snapshot without holding the lock, so
+        searches and uploads keep using the current index meanwhile. It is
+        swapped in (with any chunks appended during the build) unless rows
+        were deleted or reloaded in the meantime.
+        """
+        if not self._rebuild_lock.acquire(blocking=False):
+            return  # Another thread is already rebuilding
+        try:
+            for _ in range(INDEX_REBUILD_ATTEMPTS):
+                with self._lock:
+                    if not self.vector_store.needs_rebuild():
+                        return
+                    snapshot = self.vector_store.embeddings
+                    layout_version = self.vector_store.layout_version
+
+                index = self.vector_store.build_index(snapshot)
+
+                with self._lock:
+                    if self.vector_store.swap_index(index, snapshot, layout_version):
+                        logger.info("Rebuilt vector index with %s vectors", index.ntotal)
+                        return
+            logger.info("Index kept changing during rebuild; retrying after the next change")
+        finally:
+            self._rebuild_lock.release()
+
+    def reload_index(self):
+        """Reload the vector store from disk (e.g. after re-indexing)."""
+        with self._lock:
+            self.vector_store.load()
+        # The in-memory state now matches disk
+        self._dirty = False
+        self._pending_changes = 0
+        if self.vector_store.out_of_sync:
+            self._resync_index()
+        self._invalidate_cache()
+
+        # A re-index writes a flat index; grow it into an ANN index if needed
+        with self._lock:
+            rebuild = self.vector_store.needs_rebuild()
+        if rebuild:
+            self._rebuild_index()
+
+    def _resync_index(self):
+        """
+        Re-embed every stored chunk after the saved index and metadata diverged.
+
+        Metadata can be committed before the write-behind flush persists the
+        index (e.g. a crash inside the flush window). The metadata is the
+        record of what is indexed, so the vectors are recomputed from its
+        chunk texts rather than serving positions that point at other chunks.
+        """
+        with self._lock:
+            texts = self.vector_store.get_chunk_texts()
+        logger.warning("Index does not match stored metadata; re-embedding %s chunks", len(texts))
+        embeddings = self.embedding_service.embed_texts(texts)
+        with self._lock:
+            self.vector_store.replace_embeddings(embeddings)
+            self.vector_store.save()
+        logger.info("Rebuilt vector index from stored metadata")
+
     def save_index(self):
         """Persist the vector store to disk."""
-        self.vector_store.save()
+        with self._lock:
+            self.vector_store.save()
+
+    def mark_dirty(self):
+        """
+        Schedule the vector store to be persisted shortly.
+
+        Changes made in quick succession are coalesced into a single save
+        after flush_interval seconds, or as soon as flush_max_pending changes
+        are waiting. Must be called from the event loop.
+        """
+        self._dirty = True
+        self._pending_changes += 1
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_now = asyncio.Event()
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_when_idle())
+        if 0 < self.flush_max_pending <= self._pending_changes:
+            self._flush_now.set()
+
+    def flush(self):
+        """Persist the vector store now if there are unsaved changes."""
+        if not self._dirty:
+            return
+        # Cleared before saving so changes made during the save re-mark the index
+        self._dirty = False
+        pending_changes, self._pending_changes = self._pending_changes, 0
+        try:
+            self.save_index()
+        except Exception:
+            self._dirty = True
+            self._pending_changes += pending_changes
+            raise
+
+    def discard_pending_flush(self):
+        """Cancel any scheduled save (e.g. when the collection is deleted)."""
+        self._dirty = False
+        self._pending_changes = 0
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+    async def _flush_when_idle(self):
+        """Save after flush_interval (or once enough changes pile up), repeating while changes keep arriving."""
+        while self._dirty:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error("Failed to persist index: %s", e)
+                return
+
+    def _invalidate_cache(self):
+        """Drop cached search results after the index changes."""
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
 
     def _generate_document_id(self, document_path: Path) -> str:
         """
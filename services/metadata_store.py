@@ -2,12 +2,25 @@
 
 import sqlite3
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Iterator, List, Optional, Dict
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Per-document statistics, most recently indexed first
+DOCUMENT_STATS_QUERY = """
+    SELECT
+        document_id,
+        filename,
+        COUNT(*) as num_chunks,
+        COUNT(DISTINCT page_number) as num_pages,
+        strftime('%Y-%m-%dT%H:%M:%S', MIN(created_at), 'localtime') as indexed_at
+    FROM chunks
+    GROUP BY document_id, filename
+    ORDER BY MAX(created_at) DESC
+"""
+
 
 class MetadataStore:
     """SQLite-based metadata storage for scalability."""
@@ -27,6 +40,9 @@ class MetadataStore:
     def _init_db(self):
         """Initialize database schema."""
         with sqlite3.connect(self.db_path) as conn:
+            # Persistent setting, stored in the database file. Lets a streamed
+            # document listing keep its read open without blocking uploads.
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS chunks (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -61,7 +77,7 @@ class MetadataStore:
             """)
 
             conn.commit()
-            logger.info(f"Initialized metadata database at {self.db_path}")
+            logger.info("Initialized metadata database at %s", self.db_path)
 
     def add_chunks(self, chunks: List[dict]):
         """
@@ -88,7 +104,7 @@ class MetadataStore:
             ])
             conn.commit()
 
-        logger.debug(f"Added {len(chunks)} chunks to metadata store")
+        logger.debug("Added %s chunks to metadata store", len(chunks))
 
     def get_chunk_by_index(self, index: int) -> Optional[dict]:
         """
@@ -160,7 +176,7 @@ class MetadataStore:
 
             conn.commit()
 
-        logger.info(f"Deleted {deleted} chunks for document {document_id}")
+        logger.info("Deleted %s chunks for document %s", deleted, document_id)
         return deleted
 
     def get_total_chunks(self) -> int:
@@ -176,6 +192,45 @@ class MetadataStore:
         Returns:
             List of document metadata dictionaries
         """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(DOCUMENT_STATS_QUERY)
+
+            return [dict(row) for row in cursor.fetchall()]
+
+    def iter_documents(self, batch_size: int = 500) -> Iterator[List[dict]]:
+        """
+        Yield document statistics in batches from a single cursor.
+
+        The connection may be used from a different thread for each batch
+        (never concurrently), so it is opened with check_same_thread=False.
+        It is closed when the generator finishes or is closed.
+
+        Args:
+            batch_size: Documents per batch
+
+        Yields:
+            Lists of document metadata dictionaries, in list_documents() order
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(DOCUMENT_STATS_QUERY)
+            while rows := cursor.fetchmany(batch_size):
+                yield [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def get_document(self, document_id: str) -> Optional[dict]:
+        """
+        Get statistics for a single document.
+
+        Args:
+            document_id: Document identifier
+
+        Returns:
+            Document metadata dictionary, or None if not found
+        """
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute("""
@@ -183,13 +238,15 @@ class MetadataStore:
                     document_id,
                     filename,
                     COUNT(*) as num_chunks,
-                    COUNT(DISTINCT page_number) as num_pages
+                    COUNT(DISTINCT page_number) as num_pages,
+                    strftime('%Y-%m-%dT%H:%M:%S', MIN(created_at), 'localtime') as indexed_at
                 FROM chunks
+                WHERE document_id = ?
                 GROUP BY document_id, filename
-                ORDER BY MAX(created_at) DESC
-            """)
+            """, (document_id,))
 
-            return [dict(row) for row in cursor.fetchall()]
+            row = cursor.fetchone()
+            return dict(row) if row else None
 
     def add_document(self, document_id: str, filename: str, num_pages: int,
                      num_chunks: int, upload_timestamp: str):
@@ -255,9 +312,12 @@ class MetadataStore:
             List of chunk indices (0-based, ordered by insertion)
         """
         with sqlite3.connect(self.db_path) as conn:
+            # Number the whole table before filtering, so positions match FAISS
             cursor = conn.execute("""
-                SELECT (ROW_NUMBER() OVER (ORDER BY id) - 1) as idx
-                FROM chunks
+                SELECT idx FROM (
+                    SELECT document_id, id, ROW_NUMBER() OVER (ORDER BY id) - 1 AS idx
+                    FROM chunks
+                )
                 WHERE document_id = ?
                 ORDER BY id
             """, (document_id,))
@@ -0,0 +1,180 @@
+"""Micro-batching of search query embeddings.
+
+Every /search request embeds exactly one query. Under concurrent load that
+means many tiny forward passes, each paying the full per-call overhead of
+the model. The batcher queues incoming queries, waits a few milliseconds
+for more to arrive, and embeds them in a single encode() call. Recently
+embedded queries are kept in a small LRU, so repeats (retries, polling, AI
+searches that bypass the result cache) skip the model entirely.
+"""
+
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+import asyncio
+import logging
+import weakref
+import numpy as np
+
+from config import settings
+from services.embedder import EmbeddingService
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBatcher:
+    """Coalesces concurrent query embeddings into batched encode() calls."""
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        cache_size: int = 1024,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            embedding_service: Service used to embed the batched queries
+            max_batch_size: Maximum number of queries per encode() call
+            max_wait_ms: How long the first query in a batch waits for company
+            cache_size: Recent query embeddings kept for reuse, 0 disables
+        """
+        self.embedding_service = embedding_service
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.cache_size = cache_size
+
+        # Query text -> embedding (read-only), most recently used last.
+        # Only touched from the event loop, so no lock is needed.
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def embed(self, query: str) -> np.ndarray:
+        """
+        Embed a query, batched with any other queries arriving concurrently.
+
+        Args:
+            query: Query text
+
+        Returns:
+            NumPy array of shape (embedding_dim,)
+        """
+        cached = self._cache.get(query)
+        if cached is not None:
+            self._cache.move_to_end(query)
+            return cached
+
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        await self._queue.put((query, future))
+        embedding = await future
+
+        if self.cache_size > 0:
+            # Shared between callers, so guard against in-place changes
+            embedding.setflags(write=False)
+            self._cache[query] = embedding
+            self._cache.move_to_end(query)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return embedding
+
+    async def close(self):
+        """Stop the worker task (queries still queued are cancelled)."""
+        if self._worker is None:
+            return
+        if self._loop is not asyncio.get_running_loop():
+            # Worker belongs to a loop that is already gone
+            self._worker = None
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+        self._worker = None
+
+    async def _collect_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        """Wait for a query, then gather more until the batch is full or the window closes."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        """Embed queued queries batch by batch and resolve their futures."""
+        while True:
+            batch = await self._collect_batch()
+            queries = [query for query, _ in batch]
+
+            try:
+                embeddings = await asyncio.to_thread(
+                    self.embedding_service.embed_texts, queries, len(queries)
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            if len(batch) > 1:
+                logger.debug("Embedded %s queries in one batch", len(batch))
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+
+# One batcher per loaded embedding model (collections share models)
+_batchers: "weakref.WeakKeyDictionary[EmbeddingService, QueryBatcher]" = weakref.WeakKeyDictionary()
+
+
+def get_query_batcher(embedding_service: EmbeddingService) -> QueryBatcher:
+    """
+    Get the query batcher for an embedding service, creating it on first use.
+
+    Args:
+        embedding_service: Embedding service of the collection being searched
+
+    Returns:
+        QueryBatcher instance shared by all collections using the model
+    """
+    batcher = _batchers.get(embedding_service)
+    if batcher is None:
+        batcher = QueryBatcher(
+            embedding_service,
+            max_batch_size=settings.query_batch_size,
+            max_wait_ms=settings.query_batch_wait_ms,
+            cache_size=settings.query_embedding_cache_size,
+        )
+        _batchers[embedding_service] = batcher
+    return batcher
+
+
+async def close_query_batchers():
+    """Stop all batcher worker tasks (call on application shutdown)."""
+    for batcher in list(_batchers.values()):
+        await batcher.close()
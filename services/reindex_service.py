@@ -13,9 +13,7 @@ from typing import Optional, List, Callable
 from services.app_database import app_db
 from services.document_extractor import DocumentExtractor
 from services.chunker import TextChunker
-from services.embedder import EmbeddingService
-from services.vector_store import VectorStore
-from services.vector_store_v2 import VectorStoreV2
+from services.indexer_manager import indexer_manager
 from models.schemas import ChunkMetadata
 
 logger = logging.getLogger(__name__)
@@ -144,7 +142,7 @@ class ReindexService:
                 return
 
             # Initialize services with new config
-            embedding_service = EmbeddingService(model_name=embedding_model)
+            embedding_service = indexer_manager.get_embedding_service(embedding_model)
             text_chunker = TextChunker(
                 chunk_size=chunk_size,
                 chunk_overlap=chunk_overlap
@@ -153,18 +151,20 @@ class ReindexService:
 
             # Create new vector store in collection's indexes directory
             if metadata_storage.lower() == "sqlite":
+                from services.vector_store_v2 import VectorStoreV2
                 vector_store = VectorStoreV2(
                     index_dir=indexes_dir,
                     embedding_dim=embedding_service.embedding_dim
                 )
             else:
+                from services.vector_store import VectorStore
                 vector_store = VectorStore(
                     index_dir=indexes_dir,
                     embedding_dim=embedding_service.embedding_dim
                 )
 
             # Clear existing index
-            logger.info(f"Clearing existing index for collection {collection_id} (job {job_id})")
+            logger.info("Clearing existing index for collection %s (job %s)", collection_id, job_id)
             vector_store.clear_index()
 
             # Process each document
@@ -177,12 +177,12 @@ class ReindexService:
                         processed_documents=idx - 1
                     )
 
-                    logger.info(f"Re-indexing ({idx}/{total_docs}): {doc_path.name}")
+                    logger.info("Re-indexing (%s/%s): %s", idx, total_docs, doc_path.name)
 
                     # Extract text
                     pages = document_extractor.extract_text(doc_path)
                     if not pages:
-                        logger.warning(f"No text extracted from {doc_path.name}")
+                        logger.warning("No text extracted from %s", doc_path.name)
                         continue
 
                     # Generate document ID from content
@@ -198,7 +198,7 @@ class ReindexService:
                     )
 
                     if not chunk_metadata_list:
-                        logger.warning(f"No chunks created from {doc_path.name}")
+                        logger.warning("No chunks created from %s", doc_path.name)
                         continue
 
                     # Generate embeddings
@@ -209,12 +209,12 @@ class ReindexService:
                     vector_store.add_chunks(chunk_metadata_list, embeddings)
 
                     logger.info(
-                        f"Indexed {doc_path.name}: "
-                        f"{len(pages)} pages, {len(chunk_metadata_list)} chunks"
+                        "Indexed %s: %s pages, %s chunks",
+                        doc_path.name, len(pages), len(chunk_metadata_list),
                     )
 
                 except Exception as e:
-                    logger.error(f"Failed to process {doc_path.name}: {e}")
+                    logger.error("Failed to process %s: %s", doc_path.name, e)
                     continue
 
                 # Yield control to allow other async operations (like status checks)
@@ -232,18 +232,18 @@ class ReindexService:
                 current_file=None
             )
 
-            logger.info(f"Re-indexing job {job_id} for collection {collection_id} completed successfully")
+            logger.info("Re-indexing job %s for collection %s completed successfully", job_id, collection_id)
 
             # Trigger reload callback to refresh the indexer for this collection
             if self.reload_callback:
                 try:
                     self.reload_callback(collection_id)
-                    logger.info(f"Collection {collection_id} indexer reloaded successfully")
+                    logger.info("Collection %s indexer reloaded successfully", collection_id)
                 except Exception as e:
-                    logger.error(f"Failed to reload indexer for collection {collection_id}: {e}")
+                    logger.error("Failed to reload indexer for collection %s: %s", collection_id, e)
 
         except Exception as e:
-            logger.error(f"Re-indexing job {job_id} failed: {e}")
+            logger.error("Re-indexing job %s failed: %s", job_id, e)
             app_db.update_reindex_job(
                 job_id,
                 status="failed",
@@ -357,7 +357,7 @@ class ReindexService:
                 return
 
             # Initialize services with new config
-            embedding_service = EmbeddingService(model_name=embedding_model)
+            embedding_service = indexer_manager.get_embedding_service(embedding_model)
             text_chunker = TextChunker(
                 chunk_size=chunk_size,
                 chunk_overlap=chunk_overlap
@@ -367,18 +367,20 @@ class ReindexService:
             # Create new vector store
             indexes_dir = documents_dir.parent / "indexes"
             if metadata_storage.lower() == "sqlite":
+                from services.vector_store_v2 import VectorStoreV2
                 vector_store = VectorStoreV2(
                     index_dir=indexes_dir,
                     embedding_dim=embedding_service.embedding_dim
                 )
             else:
+                from services.vector_store import VectorStore
                 vector_store = VectorStore(
                     index_dir=indexes_dir,
                     embedding_dim=embedding_service.embedding_dim
                 )
 
             # Clear existing index
-            logger.info(f"Clearing existing index for re-indexing job {job_id}")
+            logger.info("Clearing existing index for re-indexing job %s", job_id)
             vector_store.clear_index()
 
             # Process each document
@@ -391,12 +393,12 @@ class ReindexService:
                         processed_documents=idx - 1
                     )
 
-                    logger.info(f"Re-indexing ({idx}/{total_docs}): {doc_path.name}")
+                    logger.info("Re-indexing (%s/%s): %s", idx, total_docs, doc_path.name)
 
                     # Extract text
                     pages = document_extractor.extract_text(doc_path)
                     if not pages:
-                        logger.warning(f"No text extracted from {doc_path.name}")
+                        logger.warning("No text extracted from %s", doc_path.name)
                         continue
 
                     # Generate document ID from content
@@ -412,7 +414,7 @@ class ReindexService:
                     )
 
                     if not chunk_metadata_list:
-                        logger.warning(f"No chunks created from {doc_path.name}")
+                        logger.warning("No chunks created from %s", doc_path.name)
                         continue
 
                     # Generate embeddings
@@ -423,12 +425,12 @@ class ReindexService:
                     vector_store.add_chunks(chunk_metadata_list, embeddings)
 
                     logger.info(
-                        f"Indexed {doc_path.name}: "
-                        f"{len(pages)} pages, {len(chunk_metadata_list)} chunks"
+                        "Indexed %s: %s pages, %s chunks",
+                        doc_path.name, len(pages), len(chunk_metadata_list),
                     )
 
                 except Exception as e:
-                    logger.error(f"Failed to process {doc_path.name}: {e}")
+                    logger.error("Failed to process %s: %s", doc_path.name, e)
                     continue
 
                 # Yield control to allow other async operations (like status checks)
@@ -446,7 +448,7 @@ class ReindexService:
                 current_file=None
             )
 
-            logger.info(f"Re-indexing job {job_id} completed successfully")
+            logger.info("Re-indexing job %s completed successfully", job_id)
 
             # Trigger reload callback to refresh the main indexer
             if self.reload_callback:
@@ -454,10 +456,10 @@ class ReindexService:
                     self.reload_callback()
                     logger.info("Main indexer reloaded successfully")
                 except Exception as e:
-                    logger.error(f"Failed to reload main indexer: {e}")
+                    logger.error("Failed to reload main indexer: %s", e)
 
         except Exception as e:
-            logger.error(f"Re-indexing job {job_id} failed: {e}")
+            logger.error("Re-indexing job %s failed: %s", job_id, e)
             app_db.update_reindex_job(
                 job_id,
                 status="failed",
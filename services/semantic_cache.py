@@ -0,0 +1,180 @@
+"""Semantic cache for search results keyed by query embedding similarity."""
+
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import logging
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Caches search results for recent queries and serves them for paraphrases.
+
+    A lookup compares the query embedding against every cached embedding and
+    returns the stored payload when the cosine similarity reaches the
+    threshold. The cache holds at most a few thousand entries, so a brute
+    force matrix product is cheaper than maintaining an ANN index (which would
+    also not support evicting single entries).
+
+    Entries can also be stored under their query text, so a repeated query is
+    answered by a dict lookup before it is even embedded.
+
+    Every clear() bumps a generation counter. A search snapshots it together
+    with its index read and passes it to put(), which drops the entry if the
+    cache was cleared in between (the results may predate the change).
+    """
+
+    def __init__(self, embedding_dim: int, max_entries: int = 1024, threshold: float = 0.95):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            embedding_dim: Dimension of query embeddings
+            max_entries: Maximum number of cached queries (least recently used are evicted)
+            threshold: Minimum cosine similarity for a cached query to count as a hit
+        """
+        self.embedding_dim = embedding_dim
+        self.max_entries = max_entries
+        self.threshold = threshold
+
+        self._vectors = np.zeros((max_entries, embedding_dim), dtype=np.float32)
+        self._variants: List[Optional[Hashable]] = [None] * max_entries
+        self._payloads: List[Any] = [None] * max_entries
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._text_keys: List[Optional[Tuple[str, Hashable]]] = [None] * max_entries
+        self._slots_by_text: Dict[Tuple[str, Hashable], int] = {}
+        self._size = 0
+        self._clock = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Number of times the cache has been cleared."""
+        return self._generation
+
+    def get(self, embedding: np.ndarray, variant: Hashable = None) -> Optional[Any]:
+        """
+        Look up a payload for a query similar to the given embedding.
+
+        Args:
+            embedding: Query embedding of shape (embedding_dim,)
+            variant: Extra key that must match exactly (e.g. top_k)
+
+        Returns:
+            Cached payload, or None on a miss
+        """
+        query = self._normalize(embedding)
+        with self._lock:
+            if self._size == 0:
+                return None
+
+            similarities = self._vectors[:self._size] @ query
+            for slot in np.argsort(-similarities):
+                if similarities[slot] < self.threshold:
+                    break
+                if self._variants[slot] == variant:
+                    self._clock += 1
+                    self._last_used[slot] = self._clock
+                    logger.debug("Semantic cache hit (similarity %.4f)", similarities[slot])
+                    return self._payloads[slot]
+
+        return None
+
+    def get_text(self, text: str, variant: Hashable = None) -> Optional[Any]:
+        """
+        Look up a payload stored for exactly this query text.
+
+        Args:
+            text: Query text (whitespace and case are ignored)
+            variant: Extra key that must match exactly (e.g. top_k)
+
+        Returns:
+            Cached payload, or None on a miss
+        """
+        key = (self._normalize_text(text), variant)
+        with self._lock:
+            slot = self._slots_by_text.get(key)
+            if slot is None:
+                return None
+            self._clock += 1
+            self._last_used[slot] = self._clock
+            logger.debug("Semantic cache hit (exact text)")
+            return self._payloads[slot]
+
+    def put(
+        self,
+        embedding: np.ndarray,
+        payload: Any,
+        variant: Hashable = None,
+        text: Optional[str] = None,
+        generation: Optional[int] = None,
+    ) -> bool:
+        """
+        Store a payload for a query embedding.
+
+        Args:
+            embedding: Query embedding of shape (embedding_dim,)
+            payload: Value to return for similar queries
+            variant: Extra key that must match exactly on lookup
+            text: Query text, to also serve exact repeats via get_text()
+            generation: Generation read when the payload was computed; the
+                entry is discarded if clear() has run since
+
+        Returns:
+            True if the entry was stored
+        """
+        query = self._normalize(embedding)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                logger.debug("Semantic cache entry discarded (cache cleared since search)")
+                return False
+
+            if self._size < self.max_entries:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used))
+                evicted_key = self._text_keys[slot]
+                if evicted_key is not None and self._slots_by_text.get(evicted_key) == slot:
+                    del self._slots_by_text[evicted_key]
+
+            self._clock += 1
+            self._vectors[slot] = query
+            self._variants[slot] = variant
+            self._payloads[slot] = payload
+            self._last_used[slot] = self._clock
+
+            key = (self._normalize_text(text), variant) if text is not None else None
+            self._text_keys[slot] = key
+            if key is not None:
+                self._slots_by_text[key] = slot
+            return True
+
+    def clear(self):
+        """Drop all cached entries (call whenever the underlying index changes)."""
+        with self._lock:
+            self._generation += 1
+            self._variants = [None] * self.max_entries
+            self._payloads = [None] * self.max_entries
+            self._text_keys = [None] * self.max_entries
+            self._slots_by_text = {}
+            self._last_used[:] = 0
+            self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        """Canonical form of a query for exact-text lookups."""
+        return " ".join(text.split()).casefold()
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        """Return a float32 unit vector for cosine comparisons."""
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
@@ -1,13 +1,15 @@
 """FAISS-based vector store with persistence."""
 
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 import json
 import logging
 import numpy as np
 import faiss
 
 from models.schemas import ChunkMetadata, SearchResult
+from services import index_factory
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +33,7 @@ class VectorStore:
         self.index_path = self.index_dir / "faiss.index"
         self.metadata_path = self.index_dir / "metadata.json"
         self.embeddings_path = self.index_dir / "embeddings.npy"
+        self.removed_ids_path = self.index_dir / "removed_ids.npy"
 
         # FAISS index (using L2 distance, will convert to cosine similarity)
         self.index: Optional[faiss.Index] = None
@@ -41,40 +44,77 @@ class VectorStore:
         # Embeddings storage: NumPy array of embeddings
         self.embeddings: Optional[np.ndarray] = None
 
+        # Index labels deleted since the index was built (see index_factory)
+        self.removed_ids: np.ndarray = index_factory.NO_REMOVED_IDS
+
+        # Bumped whenever stored rows move or disappear (appends keep it), so
+        # a rebuilt index can tell whether its snapshot is still a prefix
+        self.layout_version = 0
+
         # Document tracking
         self.document_map: dict[str, List[int]] = {}  # doc_id -> list of chunk indices
 
+        # Set on load when the saved index and metadata disagree; the indexer
+        # then re-embeds the chunks (see replace_embeddings)
+        self.out_of_sync = False
+
         self._load_or_create_index()
 
     def _load_or_create_index(self):
         """Load existing index from disk or create a new one."""
+        self.layout_version += 1
         if self.index_path.exists() and self.metadata_path.exists():
             logger.info("Loading existing FAISS index")
-            self.index = faiss.read_index(str(self.index_path))
+            self.index = index_factory.prepare_loaded_index(faiss.read_index(str(self.index_path)))
             with open(self.metadata_path, "r", encoding="utf-8") as f:
                 self.metadata = json.load(f)
 
             # Load embeddings if they exist
             if self.embeddings_path.exists():
                 self.embeddings = np.load(str(self.embeddings_path))
-                logger.info(f"Loaded embeddings array with shape {self.embeddings.shape}")
+                logger.info("Loaded embeddings array with shape %s", self.embeddings.shape)
             else:
                 logger.warning("Embeddings file not found - deletion will not work properly")
                 self.embeddings = None
 
+            self.removed_ids = (
+                np.load(str(self.removed_ids_path))
+                if self.removed_ids_path.exists()
+                else index_factory.NO_REMOVED_IDS
+            )
+
             # Rebuild document map
             self._rebuild_document_map()
 
-            logger.info(f"Loaded index with {len(self.metadata)} chunks")
+            logger.info("Loaded index with %s chunks", len(self.metadata))
         else:
             logger.info("Creating new FAISS index")
-            # Use IndexFlatIP for cosine similarity (inner product)
-            # Vectors must be L2 normalized before adding
-            self.index = faiss.IndexFlatIP(self.embedding_dim)
+            # Inner product index for cosine similarity (vectors are L2 normalized)
+            self.index = index_factory.create_index(self.embedding_dim)
             self.metadata = []
             self.embeddings = None
+            self.removed_ids = index_factory.NO_REMOVED_IDS
             self.document_map = {}
 
+        self.out_of_sync = not self._matches_metadata()
+
+    def _matches_metadata(self) -> bool:
+        """
+        Check that the loaded index holds one vector per metadata entry.
+
+        The files are written one after another, so a crash during save() can
+        leave an index and metadata.json from different points in time.
+        """
+        indexed = index_factory.live_count(self.index, self.removed_ids)
+        embedded = len(self.metadata) if self.embeddings is None else len(self.embeddings)
+        if indexed == len(self.metadata) and embedded == len(self.metadata):
+            return True
+        logger.warning(
+            "Index has %s vectors (%s embeddings) but metadata has %s chunks",
+            indexed, embedded, len(self.metadata),
+        )
+        return False
+
     def _rebuild_document_map(self):
         """Rebuild the document map from metadata."""
         self.document_map = {}
@@ -88,7 +128,7 @@ class VectorStore:
         """Reload the index from disk (public method for external reload)."""
         logger.info("Reloading index from disk...")
         self._load_or_create_index()
-        logger.info(f"Reload complete. Total chunks: {len(self.metadata)}")
+        logger.info("Reload complete. Total chunks: %s", len(self.metadata))
 
     def add_chunks(self, chunks: List[ChunkMetadata], embeddings: np.ndarray):
         """
@@ -108,7 +148,7 @@ class VectorStore:
         embeddings_normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
 
         # Add to FAISS index
-        self.index.add(embeddings_normalized.astype(np.float32))
+        index_factory.add(self.index, embeddings_normalized.astype(np.float32), self.removed_ids)
 
         # Store embeddings
         if self.embeddings is None:
@@ -118,8 +158,10 @@ class VectorStore:
 
         # Add metadata
         start_idx = len(self.metadata)
+        indexed_at = datetime.now().isoformat()
         for idx, chunk in enumerate(chunks):
             chunk_dict = chunk.model_dump()
+            chunk_dict["indexed_at"] = indexed_at
             self.metadata.append(chunk_dict)
 
             # Update document map
@@ -128,7 +170,7 @@ class VectorStore:
                 self.document_map[doc_id] = []
             self.document_map[doc_id].append(start_idx + idx)
 
-        logger.info(f"Added {len(chunks)} chunks to index")
+        logger.info("Added %s chunks to index", len(chunks))
 
     def search(self, query_embedding: np.ndarray, top_k: int = 10) -> List[SearchResult]:
         """
@@ -150,8 +192,9 @@ class VectorStore:
         query_normalized = query_normalized.reshape(1, -1).astype(np.float32)
 
         # Search
-        k = min(top_k, self.index.ntotal)
-        similarities, indices = self.index.search(query_normalized, k)
+        similarities, indices = index_factory.search(
+            self.index, self.embeddings, query_normalized, top_k, self.removed_ids
+        )
 
         # Convert to SearchResult objects
         results = []
@@ -167,8 +210,6 @@ class VectorStore:
                 similarity_score=float(similarity),  # Already cosine similarity due to IP with normalized vectors
                 document_id=chunk["document_id"],
                 chunk_id=chunk["chunk_id"],
-                pdf_url="",  # Will be populated by the API endpoint
-                page_url="",  # Will be populated by the API endpoint
             )
             results.append(result)
 
@@ -178,7 +219,9 @@ class VectorStore:
         """
         Delete all chunks belonging to a document.
 
-        Note: FAISS doesn't support efficient deletion, so we rebuild the index.
+        The vectors are dropped from the index in place (see
+        index_factory.remove); HNSW graphs are rebuilt separately once
+        needs_rebuild() says so.
 
         Args:
             document_id: Document ID to delete
@@ -187,47 +230,110 @@ class VectorStore:
             Number of chunks deleted
         """
         if document_id not in self.document_map:
-            logger.warning(f"Document {document_id} not found in index")
+            logger.warning("Document %s not found in index", document_id)
             return 0
 
         # Get indices to delete
-        indices_to_delete = set(self.document_map[document_id])
+        positions = self.document_map[document_id]
+        indices_to_delete = set(positions)
         num_deleted = len(indices_to_delete)
 
-        logger.info(f"Deleting {num_deleted} chunks for document {document_id}")
+        logger.info("Deleting %s chunks for document %s", num_deleted, document_id)
 
-        # Create new metadata and embeddings without deleted chunks
-        new_metadata = []
-        new_embeddings = []
+        # Keep the remaining chunks (and their embeddings) in row order
+        self.metadata = [chunk for idx, chunk in enumerate(self.metadata) if idx not in indices_to_delete]
+        if self.embeddings is not None:
+            remaining = np.delete(self.embeddings, positions, axis=0)
+            self.embeddings = remaining if len(remaining) > 0 else None
 
-        for idx, chunk in enumerate(self.metadata):
-            if idx not in indices_to_delete:
-                new_metadata.append(chunk)
-                if self.embeddings is not None:
-                    new_embeddings.append(self.embeddings[idx])
-
-        # Rebuild index (FAISS doesn't support efficient deletion)
-        logger.info(f"Rebuilding index with {len(new_metadata)} remaining chunks")
-        self.metadata = new_metadata
-
-        # Rebuild FAISS index with remaining embeddings
-        self.index = faiss.IndexFlatIP(self.embedding_dim)
-
-        if len(new_embeddings) > 0:
-            self.embeddings = np.array(new_embeddings, dtype=np.float32)
-            self.index.add(self.embeddings)
-            logger.info(f"Re-added {len(new_embeddings)} vectors to index")
-        else:
-            self.embeddings = None
-            logger.info("Index is now empty")
+        self.index, self.removed_ids = index_factory.remove(
+            self.index, np.array(positions, dtype=np.int64), self.removed_ids,
+            self.embeddings, self.embedding_dim,
+        )
+        self.layout_version += 1
 
         # Rebuild document map
         self._rebuild_document_map()
 
-        logger.info(f"Successfully deleted document {document_id}")
+        logger.info("Successfully deleted document %s", document_id)
 
         return num_deleted
 
+    def get_chunk_texts(self) -> List[str]:
+        """Text of every chunk, in index position order."""
+        return [chunk["text"] for chunk in self.metadata]
+
+    def replace_embeddings(self, embeddings: np.ndarray):
+        """
+        Rebuild the index from freshly computed embeddings of every chunk.
+
+        Args:
+            embeddings: Array of shape (len(metadata), embedding_dim), in position order
+        """
+        if len(embeddings) != len(self.metadata):
+            raise ValueError("Number of embeddings must match number of stored chunks")
+
+        if len(embeddings) > 0:
+            embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+            self.embeddings = embeddings.astype(np.float32)
+        else:
+            self.embeddings = None
+        self.index = index_factory.build_index(self.embeddings, self.embedding_dim)
+        self.removed_ids = index_factory.NO_REMOVED_IDS
+        self.out_of_sync = False
+        self.layout_version += 1
+
+    def needs_rebuild(self) -> bool:
+        """Whether the index should be rebuilt to purge deleted vectors or to grow into an ANN index."""
+        return self.embeddings is not None and (
+            index_factory.needs_rebuild(self.index, self.removed_ids)
+            or index_factory.needs_upgrade(self.index, self.embeddings, self.removed_ids)
+        )
+
+    def build_index(self, embeddings: Optional[np.ndarray]) -> faiss.Index:
+        """
+        Build a fresh index from a snapshot of the embeddings.
+
+        Touches no store state, so it can run without holding the indexer lock.
+
+        Args:
+            embeddings: Value of self.embeddings when the rebuild started
+
+        Returns:
+            Index for swap_index
+        """
+        return index_factory.build_index(embeddings, self.embedding_dim)
+
+    def swap_index(
+        self, index: faiss.Index, embeddings: Optional[np.ndarray], layout_version: int
+    ) -> bool:
+        """
+        Replace the index with one built by build_index.
+
+        Chunks appended since the snapshot are added to the new index first.
+        A delete, reload or clear in the meantime rejects it.
+
+        Args:
+            index: Rebuilt index
+            embeddings: Snapshot the index was built from
+            layout_version: Value of layout_version when the snapshot was taken
+
+        Returns:
+            False (and nothing changes) if the snapshot is no longer a prefix of the store
+        """
+        if layout_version != self.layout_version:
+            return False
+        built = 0 if embeddings is None else len(embeddings)
+        if self.embeddings is not None and len(self.embeddings) > built:
+            index_factory.add(index, self.embeddings[built:], index_factory.NO_REMOVED_IDS)
+        self.index = index
+        self.removed_ids = index_factory.NO_REMOVED_IDS
+        return True
+
+    def has_document(self, document_id: str) -> bool:
+        """Check whether any chunks of a document are indexed."""
+        return document_id in self.document_map
+
     def list_documents(self) -> List[dict]:
         """
         List all indexed documents with their metadata.
@@ -243,6 +349,7 @@ class VectorStore:
                 doc_stats[doc_id] = {
                     "document_id": doc_id,
                     "filename": chunk["filename"],
+                    "indexed_at": chunk.get("indexed_at", ""),
                     "total_chunks": 0,
                     "pages": set(),
                 }
@@ -258,14 +365,70 @@ class VectorStore:
                 "filename": stats["filename"],
                 "total_pages": len(stats["pages"]),
                 "total_chunks": stats["total_chunks"],
+                "indexed_at": stats["indexed_at"],
             })
 
         return documents
 
+    def iter_documents(self, batch_size: int = 500) -> Iterator[List[dict]]:
+        """
+        Yield indexed documents in batches, in list_documents() order.
+
+        Only the document IDs are copied up front. Each batch is summarized
+        from the current chunks when it is requested, skipping documents
+        deleted in the meantime.
+
+        Args:
+            batch_size: Documents per batch
+
+        Yields:
+            Lists of document metadata dictionaries
+        """
+        document_ids = list(self.document_map)
+        for start in range(0, len(document_ids), batch_size):
+            batch = []
+            for doc_id in document_ids[start:start + batch_size]:
+                positions = self.document_map.get(doc_id)
+                if not positions:
+                    continue
+                first = self.metadata[positions[0]]
+                batch.append({
+                    "document_id": doc_id,
+                    "filename": first["filename"],
+                    "total_pages": len({self.metadata[i]["page_number"] for i in positions}),
+                    "total_chunks": len(positions),
+                    "indexed_at": first.get("indexed_at", ""),
+                })
+            if batch:
+                yield batch
+
+    def get_document(self, document_id: str) -> Optional[dict]:
+        """
+        Get metadata for a single indexed document.
+
+        Args:
+            document_id: Document identifier
+
+        Returns:
+            Document metadata dictionary, or None if not indexed
+        """
+        indices = self.document_map.get(document_id)
+        if not indices:
+            return None
+
+        first = self.metadata[indices[0]]
+        return {
+            "document_id": document_id,
+            "filename": first["filename"],
+            "total_pages": len({self.metadata[idx]["page_number"] for idx in indices}),
+            "total_chunks": len(indices),
+            "indexed_at": first.get("indexed_at", ""),
+        }
+
     def save(self):
         """Persist the index, embeddings, and metadata to disk."""
-        logger.info(f"Saving index with {len(self.metadata)} chunks")
-        faiss.write_index(self.index, str(self.index_path))
+        logger.info("Saving index with %s chunks", len(self.metadata))
+        faiss.write_index(index_factory.to_cpu(self.index), str(self.index_path))
 
         with open(self.metadata_path, "w", encoding="utf-8") as f:
             json.dump(self.metadata, f, indent=2)
@@ -273,7 +436,13 @@ class VectorStore:
         # Save embeddings
         if self.embeddings is not None:
             np.save(str(self.embeddings_path), self.embeddings)
-            logger.info(f"Saved embeddings array with shape {self.embeddings.shape}")
+            logger.info("Saved embeddings array with shape %s", self.embeddings.shape)
+
+        # Labels deleted from the saved index, needed to map its labels to rows
+        if len(self.removed_ids):
+            np.save(str(self.removed_ids_path), self.removed_ids)
+        else:
+            self.removed_ids_path.unlink(missing_ok=True)
 
         logger.info("Index saved successfully")
 
@@ -286,9 +455,11 @@ class VectorStore:
         logger.info("Clearing vector store index and metadata")
 
         # Create new empty FAISS index
-        self.index = faiss.IndexFlatIP(self.embedding_dim)
+        self.index = index_factory.create_index(self.embedding_dim)
+        self.layout_version += 1
         self.metadata = []
         self.embeddings = None
+        self.removed_ids = index_factory.NO_REMOVED_IDS
         self.document_map = {}
 
         # Save the empty index
@@ -1,12 +1,13 @@
 """FAISS-based vector store with SQLite metadata for scalability."""
 
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 import logging
 import numpy as np
 import faiss
 
 from models.schemas import ChunkMetadata, SearchResult
+from services import index_factory
 from services.metadata_store import MetadataStore
 
 logger = logging.getLogger(__name__)
@@ -38,6 +39,7 @@ class VectorStoreV2:
         self.index_path = self.index_dir / "faiss.index"
         self.metadata_db_path = self.index_dir / "metadata.db"
         self.embeddings_path = self.index_dir / "embeddings.npy"
+        self.removed_ids_path = self.index_dir / "removed_ids.npy"
 
         # FAISS index
         self.index: Optional[faiss.Index] = None
@@ -45,41 +47,80 @@ class VectorStoreV2:
         # Embeddings storage: NumPy array of embeddings
         self.embeddings: Optional[np.ndarray] = None
 
+        # Index labels deleted since the index was built (see index_factory)
+        self.removed_ids: np.ndarray = index_factory.NO_REMOVED_IDS
+
+        # Bumped whenever stored rows move or disappear (appends keep it), so
+        # a rebuilt index can tell whether its snapshot is still a prefix
+        self.layout_version = 0
+
         # SQLite metadata store
         self.metadata_store = MetadataStore(self.metadata_db_path)
 
+        # Set on load when the saved index does not cover exactly the chunks in
+        # SQLite; the indexer then re-embeds them (see replace_embeddings)
+        self.out_of_sync = False
+
         self._load_or_create_index()
 
     def _load_or_create_index(self):
         """Load existing index from disk or create a new one."""
+        self.layout_version += 1
         if self.index_path.exists():
             logger.info("Loading existing FAISS index")
-            self.index = faiss.read_index(str(self.index_path))
+            self.index = index_factory.prepare_loaded_index(faiss.read_index(str(self.index_path)))
 
             # Load embeddings if they exist
             if self.embeddings_path.exists():
                 self.embeddings = np.load(str(self.embeddings_path))
-                logger.info(f"Loaded embeddings array with shape {self.embeddings.shape}")
+                logger.info("Loaded embeddings array with shape %s", self.embeddings.shape)
             else:
                 logger.warning("Embeddings file not found - deletion will not work properly")
                 self.embeddings = None
 
+            self.removed_ids = (
+                np.load(str(self.removed_ids_path))
+                if self.removed_ids_path.exists()
+                else index_factory.NO_REMOVED_IDS
+            )
+
             total_chunks = self.metadata_store.get_total_chunks()
-            logger.info(f"Loaded index with {total_chunks} chunks")
+            logger.info("Loaded index with %s chunks", total_chunks)
         else:
             logger.info("Creating new FAISS index")
-            # Use IndexFlatIP for cosine similarity (inner product)
-            # Vectors must be L2 normalized before adding
-            self.index = faiss.IndexFlatIP(self.embedding_dim)
+            # Inner product index for cosine similarity (vectors are L2 normalized)
+            self.index = index_factory.create_index(self.embedding_dim)
             self.embeddings = None
+            self.removed_ids = index_factory.NO_REMOVED_IDS
             logger.info("Created new index")
 
+        self.out_of_sync = not self._matches_metadata()
+
+    def _matches_metadata(self) -> bool:
+        """
+        Check that the loaded index holds one vector per chunk row.
+
+        SQLite commits each change at once, while the index files are written
+        behind (DocumentIndexer.mark_dirty). A crash in between leaves them
+        apart, and search positions would then resolve to the wrong rows.
+        """
+        total_chunks = self.metadata_store.get_total_chunks()
+        indexed = index_factory.live_count(self.index, self.removed_ids)
+        embedded = total_chunks if self.embeddings is None else len(self.embeddings)
+        if indexed == total_chunks and embedded == total_chunks:
+            return True
+        logger.warning(
+            "Index has %s vectors (%s embeddings) but metadata has %s chunks",
+            indexed, embedded, total_chunks,
+        )
+        return False
+
     def load(self):
         """Reload the index from disk (public method for external reload)."""
         logger.info("Reloading index from disk...")
         self._load_or_create_index()
         total_chunks = self.metadata_store.get_total_chunks()
-        logger.info(f"Reload complete. Total chunks: {total_chunks}")
+        logger.info("Reload complete. Total chunks: %s", total_chunks)
 
     def add_chunks(self, chunks: List[ChunkMetadata], embeddings: np.ndarray):
         """
@@ -99,7 +140,7 @@ class VectorStoreV2:
         embeddings_normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
 
         # Add to FAISS index
-        self.index.add(embeddings_normalized.astype(np.float32))
+        index_factory.add(self.index, embeddings_normalized.astype(np.float32), self.removed_ids)
 
         # Store embeddings
         if self.embeddings is None:
@@ -111,7 +152,7 @@ class VectorStoreV2:
         chunk_dicts = [chunk.model_dump() for chunk in chunks]
         self.metadata_store.add_chunks(chunk_dicts)
 
-        logger.info(f"Added {len(chunks)} chunks to index")
+        logger.info("Added %s chunks to index", len(chunks))
 
     def search(self, query_embedding: np.ndarray, top_k: int = 10) -> List[SearchResult]:
         """
@@ -133,8 +174,9 @@ class VectorStoreV2:
         query_normalized = query_normalized.reshape(1, -1).astype(np.float32)
 
         # Search
-        k = min(top_k, self.index.ntotal)
-        similarities, indices = self.index.search(query_normalized, k)
+        similarities, indices = index_factory.search(
+            self.index, self.embeddings, query_normalized, top_k, self.removed_ids
+        )
 
         # Convert to SearchResult objects
         results = []
@@ -145,7 +187,7 @@ class VectorStoreV2:
             # Fetch metadata from SQLite by index
             chunk = self.metadata_store.get_chunk_by_index(int(idx))
             if not chunk:
-                logger.warning(f"No metadata found for index {idx}")
+                logger.warning("No metadata found for index %s", idx)
                 continue
 
             result = SearchResult(
@@ -155,8 +197,6 @@ class VectorStoreV2:
                 similarity_score=float(similarity),
                 document_id=chunk["document_id"],
                 chunk_id=chunk["chunk_id"],
-                pdf_url="",  # Will be populated by the API endpoint
-                page_url="",  # Will be populated by the API endpoint
             )
             results.append(result)
 
@@ -166,7 +206,9 @@ class VectorStoreV2:
         """
         Delete all chunks belonging to a document.
 
-        Note: FAISS doesn't support efficient deletion, so we rebuild the index.
+        The vectors are dropped from the index in place (see
+        index_factory.remove); HNSW graphs are rebuilt separately once
+        needs_rebuild() says so.
 
         Args:
             document_id: Document ID to delete
@@ -175,43 +217,109 @@ class VectorStoreV2:
             Number of chunks deleted
         """
         # Get indices to delete from metadata store
-        indices_to_delete = set(self.metadata_store.get_document_chunk_indices(document_id))
+        positions = self.metadata_store.get_document_chunk_indices(document_id)
 
-        if len(indices_to_delete) == 0:
-            logger.warning(f"Document {document_id} not found in index")
+        if len(positions) == 0:
+            logger.warning("Document %s not found in index", document_id)
             return 0
 
-        num_deleted = len(indices_to_delete)
-        logger.info(f"Deleting {num_deleted} chunks for document {document_id}")
+        num_deleted = len(positions)
+        logger.info("Deleting %s chunks for document %s", num_deleted, document_id)
 
         # Delete from metadata (SQLite)
         self.metadata_store.delete_document(document_id)
 
-        # Rebuild FAISS index with remaining embeddings
         if self.embeddings is not None:
-            new_embeddings = []
-            for idx in range(len(self.embeddings)):
-                if idx not in indices_to_delete:
-                    new_embeddings.append(self.embeddings[idx])
-
-            # Rebuild FAISS index
-            logger.info(f"Rebuilding index with {len(new_embeddings)} remaining chunks")
-            self.index = faiss.IndexFlatIP(self.embedding_dim)
-
-            if len(new_embeddings) > 0:
-                self.embeddings = np.array(new_embeddings, dtype=np.float32)
-                self.index.add(self.embeddings)
-                logger.info(f"Re-added {len(new_embeddings)} vectors to index")
-            else:
-                self.embeddings = None
-                logger.info("Index is now empty")
+            remaining = np.delete(self.embeddings, positions, axis=0)
+            self.embeddings = remaining if len(remaining) > 0 else None
         else:
-            logger.warning("No embeddings stored - cannot rebuild index properly")
+            logger.warning("No embeddings stored - rescoring and rebuilds are unavailable")
+
+        self.index, self.removed_ids = index_factory.remove(
+            self.index, np.array(positions, dtype=np.int64), self.removed_ids,
+            self.embeddings, self.embedding_dim,
+        )
+        self.layout_version += 1
 
-        logger.info(f"Successfully deleted document {document_id}")
+        logger.info("Successfully deleted document %s", document_id)
 
         return num_deleted
 
+    def get_chunk_texts(self) -> List[str]:
+        """Text of every chunk, in index position order."""
+        return [chunk["text"] for chunk in self.metadata_store.get_all_chunks_ordered()]
+
+    def replace_embeddings(self, embeddings: np.ndarray):
+        """
+        Rebuild the index from freshly computed embeddings of every chunk.
+
+        Args:
+            embeddings: Array of shape (total chunks, embedding_dim), in position order
+        """
+        if len(embeddings) != self.metadata_store.get_total_chunks():
+            raise ValueError("Number of embeddings must match number of stored chunks")
+
+        if len(embeddings) > 0:
+            embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+            self.embeddings = embeddings.astype(np.float32)
+        else:
+            self.embeddings = None
+        self.index = index_factory.build_index(self.embeddings, self.embedding_dim)
+        self.removed_ids = index_factory.NO_REMOVED_IDS
+        self.out_of_sync = False
+        self.layout_version += 1
+
+    def needs_rebuild(self) -> bool:
+        """Whether the index should be rebuilt to purge deleted vectors or to grow into an ANN index."""
+        return self.embeddings is not None and (
+            index_factory.needs_rebuild(self.index, self.removed_ids)
+            or index_factory.needs_upgrade(self.index, self.embeddings, self.removed_ids)
+        )
+
+    def build_index(self, embeddings: Optional[np.ndarray]) -> faiss.Index:
+        """
+        Build a fresh index from a snapshot of the embeddings.
+
+        Touches no store state, so it can run without holding the indexer lock.
+
+        Args:
+            embeddings: Value of self.embeddings when the rebuild started
+
+        Returns:
+            Index for swap_index
+        """
+        return index_factory.build_index(embeddings, self.embedding_dim)
+
+    def swap_index(
+        self, index: faiss.Index, embeddings: Optional[np.ndarray], layout_version: int
+    ) -> bool:
+        """
+        Replace the index with one built by build_index.
+
+        Chunks appended since the snapshot are added to the new index first.
+        A delete, reload or clear in the meantime rejects it.
+
+        Args:
+            index: Rebuilt index
+            embeddings: Snapshot the index was built from
+            layout_version: Value of layout_version when the snapshot was taken
+
+        Returns:
+            False (and nothing changes) if the snapshot is no longer a prefix of the store
+        """
+        if layout_version != self.layout_version:
+            return False
+        built = 0 if embeddings is None else len(embeddings)
+        if self.embeddings is not None and len(self.embeddings) > built:
+            index_factory.add(index, self.embeddings[built:], index_factory.NO_REMOVED_IDS)
+        self.index = index
+        self.removed_ids = index_factory.NO_REMOVED_IDS
+        return True
+
+    def has_document(self, document_id: str) -> bool:
+        """Check whether any chunks of a document are indexed."""
+        return self.metadata_store.document_exists(document_id)
+
     def list_documents(self) -> List[dict]:
         """
         List all indexed documents with their metadata.
@@ -221,15 +329,45 @@ class VectorStoreV2:
         """
         return self.metadata_store.list_documents()
 
+    def iter_documents(self, batch_size: int = 500) -> Iterator[List[dict]]:
+        """
+        Yield indexed documents in batches, streamed from SQLite.
+
+        Args:
+            batch_size: Documents per batch
+
+        Yields:
+            Lists of document metadata dictionaries
+        """
+        return self.metadata_store.iter_documents(batch_size)
+
+    def get_document(self, document_id: str) -> Optional[dict]:
+        """
+        Get metadata for a single indexed document.
+
+        Args:
+            document_id: Document identifier
+
+        Returns:
+            Document metadata dictionary, or None if not indexed
+        """
+        return self.metadata_store.get_document(document_id)
+
     def save(self):
         """Persist the FAISS index, embeddings, and metadata to disk."""
-        logger.info(f"Saving FAISS index with {self.index.ntotal} vectors")
-        faiss.write_index(self.index, str(self.index_path))
+        logger.info("Saving FAISS index with %s vectors", self.index.ntotal)
+        faiss.write_index(index_factory.to_cpu(self.index), str(self.index_path))
 
         # Save embeddings
         if self.embeddings is not None:
             np.save(str(self.embeddings_path), self.embeddings)
-            logger.info(f"Saved embeddings array with shape {self.embeddings.shape}")
+            logger.info("Saved embeddings array with shape %s", self.embeddings.shape)
+
+        # Labels deleted from the saved index, needed to map its labels to rows
+        if len(self.removed_ids):
+            np.save(str(self.removed_ids_path), self.removed_ids)
+        else:
+            self.removed_ids_path.unlink(missing_ok=True)
 
         # Metadata is already persisted in SQLite
         logger.info("Index saved successfully")
@@ -243,8 +381,10 @@ class VectorStoreV2:
         logger.info("Clearing vector store index and metadata")
 
         # Create new empty FAISS index
-        self.index = faiss.IndexFlatIP(self.embedding_dim)
+        self.index = index_factory.create_index(self.embedding_dim)
+        self.layout_version += 1
         self.embeddings = None
+        self.removed_ids = index_factory.NO_REMOVED_IDS
 
         # Clear all metadata from database
         self.metadata_store.clear_all()
@@ -0,0 +1,70 @@
+"""Shared fixtures: an API client backed by a throwaway data directory."""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Settings read DATA_DIR when config is first imported, so set it before any
+# test module pulls in the app
+_temporary_data_dir = None
+if "DATA_DIR" not in os.environ:
+    _temporary_data_dir = tempfile.mkdtemp(prefix="asymptote-tests-")
+    os.environ["DATA_DIR"] = _temporary_data_dir
+
+EMBEDDING_DIM = 16
+
+
+class FakeEmbeddingService:
+    """Deterministic bag-of-words embeddings, so no model is downloaded."""
+
+    def __init__(self, model_name: str = "fake", **kwargs):
+        self.model_name = model_name
+        self.embedding_dim = EMBEDDING_DIM
+
+    def warmup(self):
+        pass
+
+    def embed_texts(self, texts, batch_size=None) -> np.ndarray:
+        vectors = np.full((len(texts), EMBEDDING_DIM), 1e-3, dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, int(hashlib.md5(word.encode()).hexdigest(), 16) % EMBEDDING_DIM] += 1
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    def embed_query(self, query: str) -> np.ndarray:
+        return self.embed_texts([query])[0]
+
+
+def pytest_unconfigure(config):
+    if _temporary_data_dir is not None:
+        shutil.rmtree(_temporary_data_dir, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient for the app, with the lifespan run and fake embeddings."""
+    # main imports the real embedding stack (torch, sentence-transformers)
+    pytest.importorskip("sentence_transformers")
+    from fastapi.testclient import TestClient
+
+    with pytest.MonkeyPatch.context() as patch:
+        # Relative paths (such as the app database) land in the data directory too
+        patch.chdir(Path(os.environ["DATA_DIR"]))
+        patch.setattr("services.indexer_manager.EmbeddingService", FakeEmbeddingService)
+        import main
+
+        with TestClient(main.app) as test_client:
+            yield test_client
+
+
+@pytest.fixture
+def collection_id(client) -> str:
+    """A new, empty collection."""
+    response = client.post("/api/collections", json={"name": "tests"})
+    assert response.status_code == 201
+    return response.json()["id"]
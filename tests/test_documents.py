@@ -0,0 +1,28 @@
+"""Tests for serving stored document files."""
+
+
+def test_document_download_revalidates_with_etag(client, collection_id):
+    """A matching If-None-Match gets 304 without a body; a stale one gets the file."""
+    content = b"tidal energy along the estuary"
+    uploaded = client.post(
+        "/documents/upload",
+        params={"collection_id": collection_id},
+        files=[("files", ("tides.txt", content, "text/plain"))],
+    )
+    assert uploaded.status_code == 201
+    url = f"/documents/{uploaded.json()['document_ids'][0]}/pdf"
+    params = {"collection_id": collection_id}
+
+    first = client.get(url, params=params)
+    assert first.status_code == 200
+    assert first.content == content
+    etag = first.headers["ETag"]
+
+    revalidated = client.get(url, params=params, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == etag
+
+    stale = client.get(url, params=params, headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == content
@@ -0,0 +1,92 @@
+"""Tests for FAISS index selection and compressed-index rescoring."""
+
+import faiss
+import numpy as np
+import pytest
+
+from config import settings
+from services import index_factory
+
+DIM = 16
+
+
+@pytest.fixture(autouse=True)
+def small_thresholds(monkeypatch):
+    """Switch index types at test-sized collections, on the CPU."""
+    monkeypatch.setattr(settings, "use_gpu", False)
+    monkeypatch.setattr(settings, "hnsw_min_vectors", 100)
+    monkeypatch.setattr(settings, "ivf_min_vectors", 400)
+    monkeypatch.setattr(settings, "index_type", "auto")
+    monkeypatch.setattr(settings, "index_quantization", "none")
+    monkeypatch.setattr(settings, "rescore_oversample", 4)
+
+
+def embeddings(count: int, seed: int = 0) -> np.ndarray:
+    """Random L2-normalized vectors."""
+    vectors = np.random.default_rng(seed).standard_normal((count, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_small_collections_stay_flat():
+    """Below hnsw_min_vectors the index is exact and is not rebuilt."""
+    vectors = embeddings(99)
+    index = index_factory.build_index(vectors, DIM)
+
+    assert isinstance(index, faiss.IndexFlatIP)
+    assert index_factory.maybe_upgrade(index, vectors, DIM) is index
+
+
+def test_upgrades_flat_to_hnsw_to_ivf():
+    """Crossing each threshold rebuilds the index as the next family."""
+    vectors = embeddings(500)
+    index = index_factory.build_index(vectors[:99], DIM)
+
+    index.add(vectors[99:100])
+    index = index_factory.maybe_upgrade(index, vectors[:100], DIM)
+    assert isinstance(index, faiss.IndexHNSWFlat)
+    assert index.ntotal == 100
+
+    index.add(vectors[100:399])
+    assert index_factory.maybe_upgrade(index, vectors[:399], DIM) is index
+
+    index.add(vectors[399:400])
+    index = index_factory.maybe_upgrade(index, vectors[:400], DIM)
+    assert isinstance(index, faiss.IndexIVF)
+    assert index.ntotal == 400
+
+
+def test_index_type_forces_the_family(monkeypatch):
+    """index_type=ivf skips HNSW once the collection is ANN-sized."""
+    monkeypatch.setattr(settings, "index_type", "ivf")
+    index = index_factory.build_index(embeddings(100), DIM)
+
+    assert isinstance(index, faiss.IndexIVF)
+
+
+def test_compressed_index_results_are_rescored(monkeypatch):
+    """sq8 candidates are re-ranked by exact FP32 inner product."""
+    monkeypatch.setattr(settings, "index_quantization", "sq8")
+    vectors = embeddings(300)
+    index = index_factory.build_index(vectors, DIM)
+    assert isinstance(index, faiss.IndexHNSWSQ)
+
+    query = vectors[7:8]
+    similarities, positions = index_factory.search(index, vectors, query, top_k=5)
+
+    assert positions[0, 0] == 7
+    np.testing.assert_allclose(similarities[0], vectors[positions[0]] @ query[0], rtol=1e-6)
+    assert np.all(np.diff(similarities[0]) <= 0)
+
+
+def test_uncompressed_index_scores_are_not_rescored():
+    """Flat HNSW scores come straight from the index."""
+    vectors = embeddings(300)
+    index = index_factory.build_index(vectors, DIM)
+    assert isinstance(index, faiss.IndexHNSWFlat)
+
+    query = vectors[3:4]
+    similarities, positions = index_factory.search(index, vectors, query, top_k=5)
+    expected_similarities, expected_positions = index.search(query, 5)
+
+    np.testing.assert_array_equal(positions, expected_positions)
+    np.testing.assert_array_equal(similarities, expected_similarities)
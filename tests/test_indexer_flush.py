@@ -0,0 +1,94 @@
+"""Tests for the indexer's write-behind index persistence."""
+
+import asyncio
+
+import pytest
+
+# The indexer imports the embedding service (torch, sentence-transformers)
+pytest.importorskip("sentence_transformers")
+
+from services.indexing import DocumentIndexer
+
+
+class FakeVectorStore:
+    """Counts save() calls."""
+
+    out_of_sync = False
+
+    def __init__(self):
+        self.saves = 0
+
+    def save(self):
+        self.saves += 1
+
+
+def make_indexer(**flush_settings) -> DocumentIndexer:
+    """An indexer whose only collaborator is a FakeVectorStore."""
+    return DocumentIndexer(FakeVectorStore(), None, None, None, **flush_settings)
+
+
+async def wait_for_saves(indexer: DocumentIndexer, count: int, timeout: float = 1.0):
+    """Poll until the store has been saved count times."""
+    async def poll():
+        while indexer.vector_store.saves < count:
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+def test_changes_in_quick_succession_share_one_save():
+    """Several mark_dirty() calls within flush_interval are saved once."""
+    indexer = make_indexer(flush_interval=0.05)
+
+    async def run():
+        indexer.mark_dirty()
+        task = indexer._flush_task
+        indexer.mark_dirty()
+        indexer.mark_dirty()
+        assert indexer._flush_task is task
+        assert indexer._pending_changes == 3
+
+        await wait_for_saves(indexer, 1)
+        # Give a second (wrong) save the chance to happen
+        await asyncio.sleep(0.15)
+
+    asyncio.run(run())
+
+    assert indexer.vector_store.saves == 1
+    assert not indexer._dirty
+    assert indexer._pending_changes == 0
+
+
+def test_flush_max_pending_saves_without_waiting():
+    """Reaching flush_max_pending saves long before flush_interval elapses."""
+    indexer = make_indexer(flush_interval=30, flush_max_pending=3)
+
+    async def run():
+        indexer.mark_dirty()
+        indexer.mark_dirty()
+        await asyncio.sleep(0.1)
+        saves_below_limit = indexer.vector_store.saves
+
+        indexer.mark_dirty()
+        await wait_for_saves(indexer, 1)
+        indexer.discard_pending_flush()
+        return saves_below_limit
+
+    assert asyncio.run(run()) == 0
+    assert indexer.vector_store.saves == 1
+
+
+def test_discard_pending_flush_cancels_the_save():
+    """A discarded flush never reaches the store."""
+    indexer = make_indexer(flush_interval=0.05)
+
+    async def run():
+        indexer.mark_dirty()
+        indexer.discard_pending_flush()
+        await asyncio.sleep(0.15)
+
+    asyncio.run(run())
+
+    assert indexer.vector_store.saves == 0
+    assert not indexer._dirty
+    assert indexer._flush_task is None
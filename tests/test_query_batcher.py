@@ -0,0 +1,84 @@
+"""Tests for query embedding micro-batching."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+# The batcher module imports the embedding service (torch, sentence-transformers)
+pytest.importorskip("sentence_transformers")
+
+from services.query_batcher import QueryBatcher
+
+
+class FakeEmbeddingService:
+    """Records embed_texts() calls and returns one vector per text."""
+
+    def __init__(self, error: Exception = None):
+        self.calls = []
+        self.error = error
+
+    def embed_texts(self, texts, batch_size):
+        self.calls.append(list(texts))
+        if self.error is not None:
+            raise self.error
+        return np.array([[float(len(text)), 1.0] for text in texts], dtype=np.float32)
+
+
+def test_concurrent_queries_share_one_encode_call():
+    """Queries arriving within the wait window are embedded together."""
+    service = FakeEmbeddingService()
+    batcher = QueryBatcher(service, max_batch_size=8, max_wait_ms=50)
+
+    async def run():
+        try:
+            return await asyncio.gather(*(batcher.embed(q) for q in ("a", "bb", "ccc")))
+        finally:
+            await batcher.close()
+
+    embeddings = asyncio.run(run())
+
+    assert service.calls == [["a", "bb", "ccc"]]
+    assert [embedding[0] for embedding in embeddings] == [1.0, 2.0, 3.0]
+
+
+def test_repeated_query_is_served_from_cache():
+    """A query embedded before skips the model."""
+    service = FakeEmbeddingService()
+    batcher = QueryBatcher(service, max_wait_ms=0)
+
+    async def run():
+        try:
+            first = await batcher.embed("solar")
+            second = await batcher.embed("solar")
+            return first, second
+        finally:
+            await batcher.close()
+
+    first, second = asyncio.run(run())
+
+    assert len(service.calls) == 1
+    assert second is first
+
+
+def test_encode_errors_reach_every_waiting_query():
+    """A failed batch raises in each caller, and the batcher keeps serving."""
+    service = FakeEmbeddingService(error=RuntimeError("model failed"))
+    batcher = QueryBatcher(service, max_batch_size=8, max_wait_ms=50)
+
+    async def run():
+        try:
+            results = await asyncio.gather(
+                batcher.embed("a"), batcher.embed("b"), return_exceptions=True
+            )
+            service.error = None
+            recovered = await batcher.embed("c")
+            return results, recovered
+        finally:
+            await batcher.close()
+
+    results, recovered = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert service.calls[0] == ["a", "b"]
+    assert recovered[0] == 1.0
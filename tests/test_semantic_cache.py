@@ -0,0 +1,80 @@
+"""Tests for the semantic search result cache."""
+
+import numpy as np
+
+from services.semantic_cache import SemanticCache
+
+
+def unit(*values):
+    """Build a query embedding from the given components."""
+    return np.array(values, dtype=np.float32)
+
+
+def test_paraphrase_hit_requires_threshold_and_variant():
+    """Similar embeddings hit only above the threshold and for the same variant."""
+    cache = SemanticCache(embedding_dim=3, max_entries=4, threshold=0.95)
+    cache.put(unit(1, 0, 0), "results", variant=10)
+
+    assert cache.get(unit(1, 0.1, 0), variant=10) == "results"
+    assert cache.get(unit(1, 0.1, 0), variant=5) is None
+    assert cache.get(unit(0, 1, 0), variant=10) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    """A full cache replaces the entry that was used longest ago."""
+    cache = SemanticCache(embedding_dim=3, max_entries=2, threshold=0.99)
+    cache.put(unit(1, 0, 0), "a")
+    cache.put(unit(0, 1, 0), "b")
+
+    # Touch "a" so "b" becomes the eviction candidate
+    assert cache.get(unit(1, 0, 0)) == "a"
+    cache.put(unit(0, 0, 1), "c")
+
+    assert len(cache) == 2
+    assert cache.get(unit(1, 0, 0)) == "a"
+    assert cache.get(unit(0, 1, 0)) is None
+    assert cache.get(unit(0, 0, 1)) == "c"
+
+
+def test_exact_text_tier():
+    """Repeated query text is served without an embedding, ignoring case and spacing."""
+    cache = SemanticCache(embedding_dim=3, max_entries=2)
+    cache.put(unit(1, 0, 0), "a", variant=10, text="Solar  Panels")
+
+    assert cache.get_text("solar panels", variant=10) == "a"
+    assert cache.get_text("solar panels", variant=5) is None
+    assert cache.get_text("wind turbines", variant=10) is None
+
+
+def test_evicted_entry_leaves_text_tier():
+    """Evicting an entry also drops its exact-text key."""
+    cache = SemanticCache(embedding_dim=3, max_entries=1)
+    cache.put(unit(1, 0, 0), "a", text="first")
+    cache.put(unit(0, 1, 0), "b", text="second")
+
+    assert cache.get_text("first") is None
+    assert cache.get_text("second") == "b"
+
+
+def test_clear_drops_all_entries():
+    """clear() empties both tiers."""
+    cache = SemanticCache(embedding_dim=3, max_entries=4)
+    cache.put(unit(1, 0, 0), "a", text="query")
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get(unit(1, 0, 0)) is None
+    assert cache.get_text("query") is None
+
+
+def test_put_discards_results_from_before_clear():
+    """Results computed before a clear() are not stored."""
+    cache = SemanticCache(embedding_dim=3, max_entries=4)
+    generation = cache.generation
+    cache.clear()
+
+    assert not cache.put(unit(1, 0, 0), "stale", text="query", generation=generation)
+    assert cache.get_text("query") is None
+
+    assert cache.put(unit(1, 0, 0), "fresh", text="query", generation=cache.generation)
+    assert cache.get_text("query") == "fresh"
@@ -0,0 +1,94 @@
+"""Tests for content-hash deduplication and staging in the upload endpoint."""
+
+from config import settings
+
+
+def upload(client, collection_id, *files):
+    """POST (filename, content) pairs to the upload endpoint."""
+    return client.post(
+        "/documents/upload",
+        params={"collection_id": collection_id},
+        files=[("files", (name, content, "text/plain")) for name, content in files],
+    )
+
+
+def stored_files(collection_id):
+    """Names of the files kept in the collection's document directory."""
+    # Imported after the client fixture has moved into the data directory
+    from services.indexer_manager import indexer_manager
+
+    return sorted(path.name for path in indexer_manager.get_documents_path(collection_id).iterdir())
+
+
+def staged_files():
+    """Uploads still sitting in the staging directory."""
+    return list((settings.data_dir / "uploads").iterdir())
+
+
+def test_content_already_indexed_is_skipped(client, collection_id):
+    """Re-uploading indexed content under another name returns the existing ID."""
+    first = upload(client, collection_id, ("solar.txt", b"solar panels on the roof"))
+    assert first.status_code == 201
+    document_ids = first.json()["document_ids"]
+
+    second = upload(client, collection_id, ("copy.txt", b"solar panels on the roof"))
+    assert second.status_code == 201
+    body = second.json()
+    assert body["documents_processed"] == 0
+    assert body["document_ids"] == document_ids
+    assert "Skipped 1 already indexed" in body["message"]
+
+    assert stored_files(collection_id) == ["solar.txt"]
+    assert staged_files() == []
+
+
+def test_duplicate_in_request_is_indexed_once(client, collection_id):
+    """Two files with the same content in one request produce one document."""
+    response = upload(
+        client, collection_id,
+        ("wind.txt", b"wind turbines by the coast"),
+        ("wind-copy.txt", b"wind turbines by the coast"),
+    )
+    assert response.status_code == 201
+    body = response.json()
+    assert body["documents_processed"] == 1
+    assert len(body["document_ids"]) == 1
+
+    # Files are saved concurrently, so either copy may be the one kept
+    assert stored_files(collection_id) in (["wind.txt"], ["wind-copy.txt"])
+
+
+def test_duplicate_shares_first_copy_failure(client, collection_id):
+    """A copy of a file that failed to index is reported as failed too."""
+    # Whitespace only: extraction yields no text, so indexing fails
+    response = upload(
+        client, collection_id,
+        ("blank.txt", b"   \n\n   "),
+        ("blank-copy.txt", b"   \n\n   "),
+    )
+    assert response.status_code == 500
+    detail = response.json()["detail"]
+    assert detail.count("which failed to index") == 1
+    assert (
+        "blank-copy.txt: same content as blank.txt," in detail
+        or "blank.txt: same content as blank-copy.txt," in detail
+    )
+
+    assert stored_files(collection_id) == []
+    assert staged_files() == []
+
+
+def test_taken_filename_gets_document_id_suffix(client, collection_id):
+    """New content under an existing name is stored as <stem>-<id8>."""
+    first = upload(client, collection_id, ("report.txt", b"quarterly revenue grew"))
+    assert first.status_code == 201
+
+    second = upload(client, collection_id, ("report.txt", b"quarterly costs fell"))
+    assert second.status_code == 201
+    document_id = second.json()["document_ids"][0]
+
+    assert stored_files(collection_id) == sorted(["report.txt", f"report-{document_id[:8]}.txt"])
+
+    listed = client.get("/documents", params={"collection_id": collection_id}).json()
+    filenames = {doc["document_id"]: doc["filename"] for doc in listed["documents"]}
+    assert filenames[document_id] == f"report-{document_id[:8]}.txt"
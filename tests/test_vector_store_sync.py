@@ -0,0 +1,84 @@
+"""Tests for detecting a saved index that no longer matches the SQLite metadata."""
+
+import numpy as np
+import pytest
+
+from config import settings
+from models.schemas import ChunkMetadata
+from services.vector_store_v2 import VectorStoreV2
+
+DIM = 8
+
+
+@pytest.fixture(autouse=True)
+def cpu_only(monkeypatch):
+    monkeypatch.setattr(settings, "use_gpu", False)
+
+
+def chunks(document_id: str, count: int):
+    """Chunks whose text encodes their document and position."""
+    return [
+        ChunkMetadata(
+            chunk_id=f"{document_id}_p1_c{i}",
+            document_id=document_id,
+            filename=f"{document_id}.txt",
+            page_number=1,
+            chunk_index=i,
+            text=f"{document_id} {i}",
+        )
+        for i in range(count)
+    ]
+
+
+def vectors(seed: int, count: int) -> np.ndarray:
+    """Random unit vectors."""
+    values = np.random.default_rng(seed).standard_normal((count, DIM)).astype(np.float32)
+    return values / np.linalg.norm(values, axis=1, keepdims=True)
+
+
+def test_saved_store_is_in_sync(tmp_path):
+    """A store reloaded after save() matches its metadata."""
+    store = VectorStoreV2(tmp_path, embedding_dim=DIM)
+    store.add_chunks(chunks("a", 3), vectors(0, 3))
+    store.save()
+
+    assert not VectorStoreV2(tmp_path, embedding_dim=DIM).out_of_sync
+
+
+def test_unsaved_add_is_detected(tmp_path):
+    """Chunks committed to SQLite without a flush leave the index short."""
+    store = VectorStoreV2(tmp_path, embedding_dim=DIM)
+    store.add_chunks(chunks("a", 3), vectors(0, 3))
+
+    # Crash before the write-behind flush: no index file was ever written
+    assert VectorStoreV2(tmp_path, embedding_dim=DIM).out_of_sync
+
+
+def test_unsaved_delete_is_detected_and_rebuilt(tmp_path):
+    """After an unflushed delete, replace_embeddings restores correct positions."""
+    store = VectorStoreV2(tmp_path, embedding_dim=DIM)
+    embeddings_a, embeddings_b = vectors(0, 3), vectors(1, 2)
+    store.add_chunks(chunks("a", 3), embeddings_a)
+    store.add_chunks(chunks("b", 2), embeddings_b)
+    store.save()
+    store.delete_document("a")
+
+    # Crash before the flush: SQLite lost "a", the saved index did not
+    reloaded = VectorStoreV2(tmp_path, embedding_dim=DIM)
+    assert reloaded.out_of_sync
+    assert reloaded.get_chunk_texts() == ["b 0", "b 1"]
+
+    reloaded.replace_embeddings(embeddings_b)
+    assert not reloaded.out_of_sync
+
+    results = reloaded.search(embeddings_b[1], top_k=1)
+    assert results[0].chunk_id == "b_p1_c1"
+
+
+def test_replace_embeddings_requires_one_per_chunk(tmp_path):
+    """Embeddings that do not cover every chunk are rejected."""
+    store = VectorStoreV2(tmp_path, embedding_dim=DIM)
+    store.add_chunks(chunks("a", 3), vectors(0, 3))
+
+    with pytest.raises(ValueError):
+        store.replace_embeddings(vectors(0, 2))